@@ -1,73 +1,55 @@
 import streamlit as st
 from datetime import datetime, timedelta
-import calendar
-import json
-from typing import List, Dict, Any, Optional
-import pandas as pd
-
-# ----------------------------------------------------------------------
-# Constantes y funciones de ayuda (portadas de constants.ts)
-# ----------------------------------------------------------------------
-WEEKEND_HOLIDAY_RATE = 70000
-WEEKDAY_RATE = 56000
-CHILD_RATE = 40000
-
-def format_currency(value: int) -> str:
-    """Formatea un número como moneda COP sin decimales."""
-    return f"${value:,.0f}".replace(",", ".")
-
-def get_days_in_month(year: int, month: int) -> List[datetime.date]:
-    """Retorna una lista de objetos date para cada día del mes."""
-    first_day = datetime(year, month, 1)
-    if month == 12:
-        next_month = datetime(year+1, 1, 1)
-    else:
-        next_month = datetime(year, month+1, 1)
-    days = []
-    current = first_day
-    while current < next_month:
-        days.append(current.date())
-        current += timedelta(days=1)
-    return days
-
-def format_date_key(date: datetime.date) -> str:
-    """Convierte una fecha a string YYYY-MM-DD."""
-    return date.strftime("%Y-%m-%d")
-
-def calculate_hospedaje_price(num_people: int, num_children: int, date: datetime.date, is_holiday: bool = False) -> int:
-    """Calcula el precio de una noche de hospedaje."""
-    day = date.weekday()  # 0=lunes, 6=domingo
-    is_special_day = (day == 5 or day == 6) or is_holiday  # sábado(5) o domingo(6)
-    
-    effective_people = min(num_people, 6)
-    if effective_people <= 2:
-        base_price = 450000 if (day == 5 or is_holiday) else 380000
-    else:
-        prices_week = {3: 430000, 4: 500000, 5: 570000, 6: 640000}
-        prices_weekend = {3: 520000, 4: 590000, 5: 660000, 6: 730000}
-        base_price = prices_weekend[effective_people] if (day == 5 or is_holiday) else prices_week[effective_people]
-
-    extra_people = max(0, num_people - 6)
-    extra_rate = WEEKEND_HOLIDAY_RATE if is_special_day else WEEKDAY_RATE
-    return base_price + (extra_people * extra_rate) + (num_children * CHILD_RATE)
-
-def calculate_pasadia_price(num_people: int, num_children: int, date: datetime.date, is_holiday: bool = False) -> int:
-    """Calcula el precio de un pasadía."""
-    day = date.weekday()
-    is_weekend_or_holiday = (day == 5 or day == 6) or is_holiday
-    base_price = 400000 if is_weekend_or_holiday else 280000
-    extra_rate = WEEKEND_HOLIDAY_RATE if is_weekend_or_holiday else WEEKDAY_RATE
-    total = base_price
-    if num_people > 6:
-        total += (num_people - 6) * extra_rate
-    total += num_children * CHILD_RATE
-    return total
+import os
+from html import escape
+from typing import List, Optional
+
+from ohanna.aggregates import combine
+from ohanna.analytics import Analytics
+from ohanna.availability import BookingConflictError
+from ohanna.helpers import format_currency, format_date_key, get_days_in_month
+from ohanna.digest import arrival_messages, daily_digest, porter_list, render_digest, turnovers
+from ohanna.export import IcsFeed, csv_chunks, ics_chunks, iter_bookings, parquet_chunks, spool
+from ohanna.importer import import_bookings
+from ohanna.messages import admin_summary, booking_json, monica_message, portero_message
+from ohanna.models import HOSPEDAJE, Booking, Guest, Payment
+from ohanna.occupancy import build_occupancy_index
+from ohanna.pricing import calculate_pasadia_price
+from ohanna.profiling import NULL_PROFILER, RunProfiler
+from ohanna.properties import PartitionedStore, load_properties, open_partitions, partition_location
+from ohanna.quotes import quote_total
+from ohanna.render import CALENDAR_CSS, CALENDAR_JS, GRID_CSS, WEEKDAYS, MonthView, MonthViewCache, build_month_view
+from ohanna.shared import StaleBookingError
 
 # ----------------------------------------------------------------------
 # Inicialización de session_state
 # ----------------------------------------------------------------------
-if "bookings" not in st.session_state:
-    st.session_state.bookings = []  # lista de dicts con estructura Booking
+@st.cache_resource
+def open_partitioned_store(properties_path: Optional[str], rates_path: Optional[str], db_path: Optional[str],
+                           journal_dir: Optional[str]) -> PartitionedStore:
+    """Abre (una sola vez por proceso) las particiones por propiedad que comparten todas las sesiones."""
+    return open_partitions(load_properties(properties_path, rates_path), db_path, journal_dir)
+
+# OHANNA_DB=ruta/al/archivo.db persiste en SQLite; OHANNA_JOURNAL=carpeta usa diario + snapshot;
+# sin ninguna las reservas viven en memoria del proceso. OHANNA_PROPERTIES=propiedades.json
+# agrega más chalets, cada uno con sus tarifas y su partición (ver ohanna.properties);
+# OHANNA_RATES=tarifas.json cambia las tarifas por defecto y se recarga al editarlo (ver ohanna.rates)
+partitions = open_partitioned_store(
+    os.environ.get("OHANNA_PROPERTIES"), os.environ.get("OHANNA_RATES"),
+    os.environ.get("OHANNA_DB"), os.environ.get("OHANNA_JOURNAL"),
+)
+
+if "property_id" not in st.session_state:
+    st.session_state.property_id = partitions.primary.id
+current_property = partitions.get(st.session_state.property_id)
+current_rates = current_property.rates  # una sola lectura por ejecución: toda la página cotiza con la misma tabla
+
+if "store" not in st.session_state:
+    # solo se abre y se consulta la partición de la propiedad elegida
+    st.session_state.store = partitions.partition(current_property.id)
+
+if "seen_seq" not in st.session_state:
+    st.session_state.seen_seq = 0  # último cambio del store compartido que vio esta sesión
 
 if "current_date" not in st.session_state:
     st.session_state.current_date = datetime.now().replace(day=1)
@@ -76,105 +58,147 @@ if "modal_open" not in st.session_state:
     st.session_state.modal_open = False
 
 if "selected_booking" not in st.session_state:
-    st.session_state.selected_booking = None  # dict o None
+    st.session_state.selected_booking = None  # Booking o None
+
+if "selected_revision" not in st.session_state:
+    st.session_state.selected_revision = None  # revisión de la reserva al abrir el modal
 
 if "selected_date" not in st.session_state:
     st.session_state.selected_date = None  # string YYYY-MM-DD
 
+if "month_views" not in st.session_state:
+    st.session_state.month_views = {}  # propiedad -> (tarifas, MonthViewCache de vistas por (año, mes, versión de los datos))
+
+def count_widgets() -> int:
+    """Widgets registrados en lo que va de la ejecución (0 si Streamlit no lo expone)."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    ids = getattr(getattr(ctx, "shared", ctx), "widget_ids_this_run", None)
+    if ids is None:
+        return 0
+    return len(ids.snapshot() if hasattr(ids, "snapshot") else ids)
+
+# OHANNA_PROFILE=1 o ?profile=1 en la URL muestran el panel de tiempos por sección
+if os.environ.get("OHANNA_PROFILE") or st.query_params.get("profile") == "1":
+    if "profiler" not in st.session_state:
+        st.session_state.profiler = RunProfiler(widget_count=count_widgets)
+    profiler = st.session_state.profiler
+else:
+    profiler = NULL_PROFILER
+profiler.start()
+
 # ----------------------------------------------------------------------
 # Funciones auxiliares para manejo de bookings
 # ----------------------------------------------------------------------
-def save_booking(booking: Dict[str, Any]):
-    """Guarda una reserva (nueva o actualizada)."""
-    if st.session_state.selected_booking:
-        # actualizar existente
-        for i, b in enumerate(st.session_state.bookings):
-            if b["id"] == booking["id"]:
-                st.session_state.bookings[i] = booking
-                break
-    else:
-        # nueva reserva
-        st.session_state.bookings.append(booking)
+def save_booking(booking: Booking) -> bool:
+    """Guarda una reserva (nueva o actualizada). Retorna False si se cruza con otra o cambió."""
+    # upsert por id, solo si nadie la modificó desde que se abrió el modal
+    try:
+        st.session_state.store.save(booking, st.session_state.selected_revision)
+    except BookingConflictError as e:
+        st.error(f"No se guardó: las fechas se cruzan con {describe_conflicts(e.conflicts)}.")
+        return False
+    except StaleBookingError:
+        st.error("No se guardó: otra persona modificó esta reserva. Cierra el formulario y vuelve a abrirla.")
+        return False
     st.session_state.modal_open = False
     st.session_state.selected_booking = None
     st.session_state.selected_date = None
-
-def delete_booking(booking_id: str):
-    """Elimina una reserva por su id."""
-    st.session_state.bookings = [b for b in st.session_state.bookings if b["id"] != booking_id]
+    return True
+
+def describe_conflicts(booking_ids: List[str]) -> str:
+    """Texto corto con huésped y fechas de las reservas indicadas."""
+    parts = []
+    for booking_id in booking_ids:
+        b = st.session_state.store.get(booking_id)
+        if b:
+            parts.append(f"{b.guest_name or b.type} ({format_date_key(b.start_date)} a {format_date_key(b.end_date)})")
+    return ", ".join(parts)
+
+def delete_booking(booking_id: str) -> bool:
+    """Elimina una reserva por su id. Retorna False si otra persona la modificó."""
+    try:
+        st.session_state.store.delete(booking_id, st.session_state.selected_revision)
+    except StaleBookingError:
+        st.error("No se eliminó: otra persona modificó esta reserva. Cierra el formulario y vuelve a abrirla.")
+        return False
     st.session_state.modal_open = False
     st.session_state.selected_booking = None
     st.session_state.selected_date = None
+    return True
+
+def describe_guest(record) -> str:
+    """Nombre, documento e historial corto de un huésped del directorio."""
+    last = format_date_key(record.last_visit) if record.last_visit else "-"
+    return (f"{record.name or 'Sin nombre'} · {record.document or 'sin documento'} · "
+            f"{record.visits} estadía(s), última {last} · total {format_currency(record.total_spent)} · "
+            f"saldo {format_currency(record.balance)}")
+
+def get_bookings_for_month(year: int, month: int) -> List[Booking]:
+    """Reservas que ocurren en el mes indicado (inicio, fin o rango que lo cubre)."""
+    bookings = st.session_state.store.bookings_for_month(year, month)
+    profiler.count("reservas leídas", len(bookings))
+    return bookings
+
+def get_month_view(year: int, month: int) -> MonthView:
+    """Retorna la vista del mes (ocupación y HTML), construyéndola solo si ese mes cambió."""
+    rates, views = st.session_state.month_views.get(current_property.id, (None, None))
+    if rates is not current_rates:  # tarifas recargadas: los precios de las celdas cambiaron
+        views = MonthViewCache()
+        st.session_state.month_views[current_property.id] = (current_rates, views)
+    return views.get(
+        year, month, st.session_state.store.month_version(year, month),
+        lambda: build_month_view(year, month, build_occupancy_index(get_bookings_for_month(year, month)), current_rates),
+    )
+
+def switch_property():
+    """Al cambiar de propiedad se cierra el formulario y se pasa a la partición nueva."""
+    st.session_state.store = partitions.partition(st.session_state.property_id)
+    st.session_state.modal_open = False
+    st.session_state.selected_booking = None
+    st.session_state.selected_date = None
+    st.session_state.seen_seq = 0
 
-def get_bookings_for_month(year: int, month: int) -> List[Dict]:
-    """Filtra reservas que ocurren en el mes indicado (inicio o fin)."""
-    result = []
-    for b in st.session_state.bookings:
-        start = datetime.strptime(b["startDate"], "%Y-%m-%d").date()
-        end = datetime.strptime(b["endDate"], "%Y-%m-%d").date()
-        # si el mes está dentro del rango de la reserva
-        if (start.year == year and start.month == month) or (end.year == year and end.month == month):
-            result.append(b)
-        else:
-            # ver si el mes está entre start y end
-            first_of_month = datetime(year, month, 1).date()
-            last_of_month = (datetime(year, month, 1) + timedelta(days=calendar.monthrange(year, month)[1]-1)).date()
-            if start <= last_of_month and end >= first_of_month:
-                result.append(b)
-    return result
+@st.cache_resource
+def get_calendar_component():
+    """Registra (una vez por proceso) el componente del calendario; None si no hay components v2."""
+    try:
+        from streamlit.components.v2 import component
+    except ImportError:
+        return None
+    return component("ohanna_calendar", css=CALENDAR_CSS + GRID_CSS, js=CALENDAR_JS)
 
 # ----------------------------------------------------------------------
 # UI: encabezado y navegación de meses
 # ----------------------------------------------------------------------
-st.set_page_config(page_title="Chalet Ohanna Bay", layout="wide")
-st.markdown("""
+profiler.section("Encabezado")
+st.set_page_config(page_title=current_property.name, layout="wide")
+st.markdown(f"""
 <style>
-    .stButton > button {
+    .stButton > button {{
         width: 100%;
-    }
-    .calendar-cell {
-        border: 1px solid #e2e8f0;
-        border-radius: 0.5rem;
-        padding: 0.5rem;
-        min-height: 100px;
-        background-color: white;
-    }
-    .occupied {
-        background-color: #f1f5f9;
-    }
-    .weekend {
-        color: #4f46e5;
-        font-weight: bold;
-    }
-    .hospedaje-tag {
-        background-color: #d1fae5;
-        color: #065f46;
-        border: 1px solid #a7f3d0;
-        border-radius: 0.375rem;
-        padding: 0.125rem 0.375rem;
-        font-size: 0.7rem;
-        font-weight: 600;
-    }
-    .pasadia-tag {
-        background-color: #e0f2fe;
-        color: #075985;
-        border: 1px solid #bae6fd;
-        border-radius: 0.375rem;
-        padding: 0.125rem 0.375rem;
-        font-size: 0.7rem;
-        font-weight: 600;
-    }
+    }}
+    {CALENDAR_CSS}
 </style>
 """, unsafe_allow_html=True)
 
 header_col1, header_col2, header_col3 = st.columns([1, 2, 1])
 with header_col1:
     st.image("https://via.placeholder.com/150x50?text=Ohanna+Bay", width=150)  # placeholder, puedes poner tu logo
+    if len(partitions) > 1:
+        st.selectbox(
+            "Propiedad", list(partitions.properties), key="property_id", on_change=switch_property,
+            format_func=lambda property_id: partitions.get(property_id).name,
+        )
 with header_col2:
-    st.markdown("<h1 style='text-align: center;'>Chalet Ohanna Bay</h1>", unsafe_allow_html=True)
+    st.markdown(f"<h1 style='text-align: center;'>{escape(current_property.name)}</h1>", unsafe_allow_html=True)
     st.markdown("<p style='text-align: center; color: #64748b;'>Gestión de Reservas</p>", unsafe_allow_html=True)
 with header_col3:
-    st.link_button("🔗 Ver Calendario Público", "https://calendar.google.com/calendar/embed?src=7780f7085d435f8d62c0d6f0368a29965149fb2d9134768cdb15cf4eddce53fb%40group.calendar.google.com&ctz=America%2FBogota")
+    if current_property.calendar_url:
+        st.link_button("🔗 Ver Calendario Público", current_property.calendar_url)
+if current_property.rates_source.error:
+    st.warning(f"No se pudieron recargar las tarifas; se siguen usando las anteriores. {current_property.rates_source.error}")
 
 col_prev, col_month, col_next = st.columns([1, 2, 1])
 with col_prev:
@@ -191,13 +215,15 @@ with col_next:
 # ----------------------------------------------------------------------
 # Estadísticas rápidas
 # ----------------------------------------------------------------------
-bookings_month = get_bookings_for_month(st.session_state.current_date.year, st.session_state.current_date.month)
+profiler.section("Estadísticas")
+# agregados mantenidos por el store en cada save/delete: O(1) por mes
+month_stats = st.session_state.store.month_stats(st.session_state.current_date.year, st.session_state.current_date.month)
 
-total_reservas = len(bookings_month)
-hospedajes = sum(1 for b in bookings_month if b.get("type") == "Hospedaje")
-pasadias = sum(1 for b in bookings_month if b.get("type") == "Pasadía")
-saldos = sum(b.get("balance", 0) for b in bookings_month)
-aseo_pendiente = sum(b.get("cleaningBalance", 0) for b in bookings_month)
+total_reservas = month_stats.bookings
+hospedajes = month_stats.hospedajes
+pasadias = month_stats.pasadias
+saldos = month_stats.balance
+aseo_pendiente = month_stats.cleaning_balance
 
 stat1, stat2, stat3, stat4, stat5 = st.columns(5)
 with stat1:
@@ -212,107 +238,146 @@ with stat5:
     st.metric("Aseo Pendiente", format_currency(aseo_pendiente))
 
 # ----------------------------------------------------------------------
-# Calendario
+# Consolidado de todas las propiedades
 # ----------------------------------------------------------------------
-days = get_days_in_month(st.session_state.current_date.year, st.session_state.current_date.month)
-first_day_weekday = days[0].weekday()  # lunes=0, domingo=6
-# Ajustamos para que la semana empiece en lunes (como en el original) y la primera columna sea L
-padding = first_day_weekday  # número de celdas vacías antes del día 1
-
-weekdays = ["L", "M", "X", "J", "V", "S", "D"]
-
-# Mostrar cabecera de días
-cols = st.columns(7)
-for i, day in enumerate(weekdays):
-    cols[i].markdown(f"<div style='text-align: center; font-weight: bold; color: #94a3b8;'>{day}</div>", unsafe_allow_html=True)
-
-# Construir grid
-grid_cells = []
-grid_cells.extend([None] * padding)  # celdas vacías
-grid_cells.extend(days)
-
-# Rellenar hasta completar 42 celdas (6 semanas)
-while len(grid_cells) < 42:
-    grid_cells.append(None)
+if len(partitions) > 1:
+    profiler.section("Propiedades")
+    with st.expander("🏘️ Todas las propiedades"):
+        # abrir el consolidado abre las demás particiones y consulta cada mes (SQL o índices perezosos)
+        if st.toggle("Ver consolidado", key="show_rollup"):
+            rollup_year = st.session_state.current_date.year
+            rollup_periods = {
+                st.session_state.current_date.strftime("%B %Y").capitalize(): [(rollup_year, st.session_state.current_date.month)],
+                f"Año {rollup_year}": [(rollup_year, m) for m in range(1, 13)],
+            }
+            for period, months in rollup_periods.items():
+                available = sum(len(get_days_in_month(y, m)) for y, m in months)
+                rollup = partitions.rollup(months)
+                rows = [(p.name, rollup[p.id], available) for p in partitions]
+                rows.append(("Total", combine(rollup.values()), available * len(partitions)))
+                table = []
+                for name, s, days in rows:
+                    row = {"Propiedad": name, "Días ocupados": s.occupied_days, "Ocupación": f"{s.occupied_days / days:.1%}",
+                           "Ingresos": format_currency(s.revenue)}
+                    if len(months) == 1:  # reservas y saldos cuentan en cada mes que toca la reserva: solo por mes
+                        row.update({"Reservas": s.bookings, "Saldos": format_currency(s.balance),
+                                    "Aseo pendiente": format_currency(s.cleaning_balance)})
+                    table.append(row)
+                st.markdown(f"**{period}**")
+                st.dataframe(table, hide_index=True)
 
-# Crear filas
-for week in range(6):
+# ----------------------------------------------------------------------
+# Calendario
+# ----------------------------------------------------------------------
+profiler.section("Calendario")
+year, month = st.session_state.current_date.year, st.session_state.current_date.month
+# esta ejecución ya lee los datos vigentes; los cambios posteriores los avisa watch_changes
+st.session_state.seen_seq = st.session_state.store.changes_since(st.session_state.seen_seq)[0]
+
+def watch_changes():
+    """Recarga la página si otra sesión cambió el mes visible (no mientras se edita)."""
+    seq, months = st.session_state.store.changes_since(st.session_state.seen_seq)
+    if seq == st.session_state.seen_seq or st.session_state.modal_open:
+        return
+    st.session_state.seen_seq = seq
+    if months is None or (year, month) in months:
+        st.rerun()
+
+# st.fragment no existe en versiones viejas de Streamlit: ahí se ve al recargar
+if hasattr(st, "fragment"):
+    st.fragment(run_every=os.environ.get("OHANNA_POLL", "5s"))(watch_changes)()
+
+view = get_month_view(year, month)
+occupancy = view.occupancy
+
+def open_booking_modal(cell_date: datetime.date):
+    """Abre el modal para editar la reserva del día o crear una nueva."""
+    booking = occupancy.get(cell_date)
+    st.session_state.selected_booking = booking
+    st.session_state.selected_revision = st.session_state.store.revision(booking.id) if booking else None
+    st.session_state.selected_date = format_date_key(cell_date)
+    # copias de trabajo: el formulario no debe modificar la reserva guardada
+    st.session_state.draft_guests = list(booking.guests) if booking else [Guest()]
+    st.session_state.draft_payments = list(booking.payments) if booking else []
+    st.session_state.modal_open = True
+
+calendar_component = get_calendar_component()
+# OHANNA_CALENDAR=widgets fuerza la grilla clásica de 42 columnas con botones
+calendar_mode = os.environ.get("OHANNA_CALENDAR", "payload" if calendar_component else "widgets")
+
+if calendar_mode == "payload":
+    # Un solo bloque HTML para todo el mes; el clic vuelve por un único trigger
+    result = calendar_component(data=view.html, key="calendar", on_clicked_change=lambda: None)
+    if result.clicked:
+        # el modal se dibuja más abajo en esta misma ejecución, no hace falta st.rerun()
+        open_booking_modal(datetime.strptime(result.clicked, "%Y-%m-%d").date())
+else:
+    # Mostrar cabecera de días
     cols = st.columns(7)
-    for day_idx in range(7):
-        cell_date = grid_cells[week*7 + day_idx]
-        with cols[day_idx]:
-            if cell_date is None:
-                st.markdown("<div class='calendar-cell' style='background-color: #f8fafc;'></div>", unsafe_allow_html=True)
-                continue
-
-            date_str = format_date_key(cell_date)
-            is_weekend = cell_date.weekday() >= 5  # sábado o domingo
-            # Buscar reserva para esta fecha
-            booking = None
-            for b in bookings_month:
-                start = datetime.strptime(b["startDate"], "%Y-%m-%d").date()
-                end = datetime.strptime(b["endDate"], "%Y-%m-%d").date()
-                if b["type"] == "Pasadía":
-                    if start == cell_date:
-                        booking = b
-                        break
-                else:  # Hospedaje
-                    if start <= cell_date < end:
-                        booking = b
-                        break
-
-            # Crear celda
-            cell_content = f"<div class='calendar-cell {'occupied' if booking else ''}'>"
-            cell_content += f"<div style='display: flex; justify-content: space-between;'>"
-            cell_content += f"<span class='{'weekend' if is_weekend else ''}'>{cell_date.day}</span>"
-            if not booking:
-                # precio base del día (para 2 adultos, 0 niños)
-                base = calculate_hospedaje_price(2, 0, cell_date)
-                cell_content += f"<span style='font-size: 0.6rem; color: #94a3b8;'>{format_currency(base)}</span>"
-            cell_content += "</div>"
-
-            if booking:
-                tipo = booking["type"]
-                guest_name = booking.get("guests", [{}])[0].get("name", "Ocupado")
-                tag_class = "hospedaje-tag" if tipo == "Hospedaje" else "pasadia-tag"
-                cell_content += f"<div class='{tag_class}' style='margin-top: 4px;'>{tipo}</div>"
-                cell_content += f"<div style='font-size: 0.7rem; margin-top: 2px;'>{guest_name}</div>"
-            cell_content += "</div>"
-
-            st.markdown(cell_content, unsafe_allow_html=True)
-
-            # Botón invisible que cubre la celda para detectar clic
-            if st.button("📅", key=f"btn_{date_str}", help="Haz clic para agregar/editar"):
-                if booking:
-                    st.session_state.selected_booking = booking
-                    st.session_state.selected_date = date_str
-                else:
-                    st.session_state.selected_booking = None
-                    st.session_state.selected_date = date_str
-                st.session_state.modal_open = True
-                st.rerun()
+    for i, day in enumerate(WEEKDAYS):
+        cols[i].markdown(f"<div style='text-align: center; font-weight: bold; color: #94a3b8;'>{day}</div>", unsafe_allow_html=True)
+
+    # Crear filas
+    for week in range(6):
+        cols = st.columns(7)
+        for day_idx in range(7):
+            cell_date = view.cells[week*7 + day_idx]
+            with cols[day_idx]:
+                st.markdown(view.cell_htmls[week*7 + day_idx], unsafe_allow_html=True)
+                if cell_date is None:
+                    continue
+
+                # Botón invisible que cubre la celda para detectar clic
+                if st.button("📅", key=f"btn_{format_date_key(cell_date)}", help="Haz clic para agregar/editar"):
+                    open_booking_modal(cell_date)
+                    st.rerun()
 
 # ----------------------------------------------------------------------
 # Modal de reserva (se muestra como expander cuando modal_open es True)
 # ----------------------------------------------------------------------
+profiler.section("Modal")
 if st.session_state.modal_open:
     with st.expander("✏️ Detalles de la reserva", expanded=True):
         booking = st.session_state.selected_booking
         date = st.session_state.selected_date
 
         # Valores por defecto
-        default_type = "Hospedaje" if booking is None else booking.get("type", "Hospedaje")
-        default_start = date if booking is None else booking.get("startDate", date)
-        default_end = "" if booking is None else booking.get("endDate", "")
-        default_people = 2 if booking is None else booking.get("numPeople", 2)
-        default_children = 0 if booking is None else booking.get("numChildren", 0)
-        default_discount = 0 if booking is None else booking.get("discount", 0)
-        default_cleaning_total = 0 if booking is None else booking.get("cleaningTotal", 0)
-        default_cleaning_deposit = 0 if booking is None else booking.get("cleaningDeposit", 0)
-        default_is_holiday = False if booking is None else booking.get("isHoliday", False)
-        default_schedule = "9:00 AM - 5:30 PM" if booking is None else booking.get("schedule", "9:00 AM - 5:30 PM")
-        default_guests = [{"name": "", "document": ""}] if booking is None else booking.get("guests", [])
-        default_payments = [] if booking is None else booking.get("payments", [])
+        default_type = HOSPEDAJE if booking is None else booking.type
+        default_start = (datetime.strptime(date, "%Y-%m-%d").date() if date else None) if booking is None else booking.start_date
+        default_end = None if booking is None else booking.end_date
+        default_people = 2 if booking is None else booking.num_people
+        default_children = 0 if booking is None else booking.num_children
+        default_discount = 0 if booking is None else booking.discount
+        default_cleaning_total = 0 if booking is None else booking.cleaning_total
+        default_cleaning_deposit = 0 if booking is None else booking.cleaning_deposit
+        default_is_holiday = False if booking is None else bool(booking.is_holiday)
+        default_schedule = "9:00 AM - 5:30 PM" if booking is None or booking.schedule is None else booking.schedule
+        default_guests = st.session_state.draft_guests
+        default_payments = st.session_state.draft_payments
+
+        # Huéspedes frecuentes: se buscan en el directorio y se agregan sin volver a escribirlos
+        guest_query = st.text_input("🔎 Buscar huésped frecuente (nombre o documento)", key="guest_search")
+        if guest_query:
+            matches = st.session_state.store.search_guests(guest_query, limit=8)
+            if matches:
+                col1, col2 = st.columns([5, 1])
+                with col1:
+                    picked = st.selectbox("Coincidencias", range(len(matches)), format_func=lambda i: describe_guest(matches[i]), key="guest_pick")
+                with col2:
+                    if st.button("➕ Agregar", key="guest_add"):
+                        found = matches[picked].as_guest()
+                        # primer huésped vacío del formulario (con lo escrito hasta ahora) o uno nuevo
+                        empty = [
+                            i for i, g in enumerate(default_guests)
+                            if not st.session_state.get(f"guest_name_{i}", g.name) and not st.session_state.get(f"guest_doc_{i}", g.document)
+                        ]
+                        if empty:
+                            st.session_state[f"guest_name_{empty[0]}"] = found.name
+                            st.session_state[f"guest_doc_{empty[0]}"] = found.document
+                        else:
+                            default_guests.append(found)
+            else:
+                st.caption("Sin coincidencias en el directorio.")
 
         # Formulario
         with st.form("booking_form"):
@@ -325,16 +390,29 @@ if st.session_state.modal_open:
 
             col1, col2 = st.columns(2)
             with col1:
-                start_date = st.date_input("Ingreso", value=datetime.strptime(default_start, "%Y-%m-%d").date() if default_start else datetime.now().date())
+                start_date = st.date_input("Ingreso", value=default_start or datetime.now().date())
             with col2:
                 if tipo == "Hospedaje":
-                    end_date = st.date_input("Salida", value=datetime.strptime(default_end, "%Y-%m-%d").date() if default_end else start_date + timedelta(days=1), min_value=start_date + timedelta(days=1))
+                    end_date = st.date_input("Salida", value=default_end or start_date + timedelta(days=1), min_value=start_date + timedelta(days=1))
                 else:
                     end_date = start_date
                     st.markdown(f"*Salida: mismo día*")
 
+            # los festivos oficiales se aplican noche a noche; esto fuerza tarifa festiva en todo el rango
             is_holiday = st.checkbox("¿Es temporada festiva / Sábado?", value=default_is_holiday)
 
+            # Disponibilidad: se revisa antes de guardar y se sugieren fechas libres
+            occupied_end = end_date if tipo == HOSPEDAJE else start_date + timedelta(days=1)
+            editing_id = booking.id if booking else None
+            conflicts = st.session_state.store.conflicts(start_date, occupied_end, exclude_id=editing_id)
+            if conflicts:
+                nights = (occupied_end - start_date).days
+                options = st.session_state.store.next_free_ranges(start_date, nights, count=3, exclude_id=editing_id)
+                st.warning(
+                    f"⚠️ Estas fechas se cruzan con {describe_conflicts(conflicts)}. Próximas fechas libres: "
+                    + ", ".join(f"{format_date_key(a)} a {format_date_key(b)}" for a, b in options)
+                )
+
             if tipo == "Pasadía":
                 schedule = st.radio("Horario Pasadía", ["9:00 AM - 5:30 PM", "2:00 PM - 10:30 PM"], index=0 if default_schedule=="9:00 AM - 5:30 PM" else 1)
             else:
@@ -342,13 +420,9 @@ if st.session_state.modal_open:
 
             # Cálculo de precio total
             if tipo == "Hospedaje":
-                total_price = 0
-                current = start_date
-                while current < end_date:
-                    total_price += calculate_hospedaje_price(num_people, num_children, current, is_holiday)
-                    current += timedelta(days=1)
+                total_price = quote_total(num_people, num_children, start_date, end_date, is_holiday, current_rates)
             else:
-                total_price = calculate_pasadia_price(num_people, num_children, start_date, is_holiday)
+                total_price = calculate_pasadia_price(num_people, num_children, start_date, is_holiday, current_rates)
 
             st.markdown(f"**Precio total calculado:** {format_currency(total_price)}")
 
@@ -358,39 +432,39 @@ if st.session_state.modal_open:
             st.subheader("Huéspedes")
             guests = []
             if st.form_submit_button("➕ Añadir huésped", type="secondary"):
-                default_guests.append({"name": "", "document": ""})
+                default_guests.append(Guest())
             for i, guest in enumerate(default_guests):
                 col1, col2, col3 = st.columns([4, 3, 1])
                 with col1:
-                    name = st.text_input(f"Nombre {i+1}", value=guest.get("name", ""), key=f"guest_name_{i}")
+                    name = st.text_input(f"Nombre {i+1}", value=guest.name, key=f"guest_name_{i}")
                 with col2:
-                    doc = st.text_input(f"Documento {i+1}", value=guest.get("document", ""), key=f"guest_doc_{i}")
+                    doc = st.text_input(f"Documento {i+1}", value=guest.document, key=f"guest_doc_{i}")
                 with col3:
                     if st.form_submit_button("❌", key=f"remove_guest_{i}"):
                         default_guests.pop(i)
                         st.rerun()
-                guests.append({"name": name, "document": doc})
+                guests.append(Guest(name=name, document=doc))
 
             # Gestión de pagos
             st.subheader("Pagos")
             payments = []
             if st.form_submit_button("➕ Nuevo abono", type="secondary"):
-                default_payments.append({"id": str(datetime.now().timestamp()), "amount": 0, "method": "Efectivo", "date": format_date_key(datetime.now().date())})
+                default_payments.append(Payment(id=str(datetime.now().timestamp()), amount=0, method="Efectivo", date=datetime.now().date()))
             for i, p in enumerate(default_payments):
                 col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
                 with col1:
-                    amount = st.number_input("Monto", value=p.get("amount", 0), step=1000, key=f"pay_amount_{i}")
+                    amount = st.number_input("Monto", value=p.amount, step=1000, key=f"pay_amount_{i}")
                 with col2:
-                    method = st.selectbox("Método", ["Nequi Hernan", "Nequi Lady", "Davivienda", "DaviPlata", "Efectivo", "Otro"], index=["Nequi Hernan","Nequi Lady","Davivienda","DaviPlata","Efectivo","Otro"].index(p.get("method","Efectivo")), key=f"pay_method_{i}")
+                    method = st.selectbox("Método", ["Nequi Hernan", "Nequi Lady", "Davivienda", "DaviPlata", "Efectivo", "Otro"], index=["Nequi Hernan","Nequi Lady","Davivienda","DaviPlata","Efectivo","Otro"].index(p.method), key=f"pay_method_{i}")
                 with col3:
-                    pay_date = st.date_input("Fecha", value=datetime.strptime(p.get("date", format_date_key(datetime.now().date())), "%Y-%m-%d").date(), key=f"pay_date_{i}")
+                    pay_date = st.date_input("Fecha", value=p.date, key=f"pay_date_{i}")
                 with col4:
                     if st.form_submit_button("🗑️", key=f"remove_pay_{i}"):
                         default_payments.pop(i)
                         st.rerun()
-                payments.append({"id": p.get("id", str(datetime.now().timestamp())), "amount": amount, "method": method, "date": format_date_key(pay_date)})
+                payments.append(Payment(id=p.id, amount=amount, method=method, date=pay_date))
 
-            deposit = sum(p["amount"] for p in payments)
+            deposit = sum(p.amount for p in payments)
             balance = total_price - discount - deposit
 
             st.markdown(f"**Total abonado:** {format_currency(deposit)}")
@@ -407,12 +481,36 @@ if st.session_state.modal_open:
                 cleaning_balance = cleaning_total - cleaning_deposit
                 st.markdown(f"**Saldo pendiente:** {format_currency(cleaning_balance)}")
 
+            # la reserva tal como quedaría al guardar
+            draft = Booking(
+                id=booking.id if booking else str(datetime.now().timestamp()),
+                start_date=start_date,
+                end_date=end_date,
+                type=tipo,
+                num_people=num_people,
+                num_children=num_children,
+                guests=guests,
+                total_price=total_price,
+                discount=discount,
+                deposit=deposit,
+                balance=balance,
+                expenses=booking.expenses if booking else [],
+                payments=payments,
+                payment_method=payments[0].method if payments else "Efectivo",
+                schedule=schedule,
+                is_holiday=is_holiday,
+                cleaning_total=cleaning_total,
+                cleaning_deposit=cleaning_deposit,
+                cleaning_balance=cleaning_balance,
+                extra=booking.extra if booking else {},
+            )
+
             # Botones de acción
             col1, col2, col3 = st.columns(3)
             with col1:
                 if booking and st.form_submit_button("🗑️ Eliminar", type="primary"):
-                    delete_booking(booking["id"])
-                    st.rerun()
+                    if delete_booking(booking.id):
+                        st.rerun()
             with col2:
                 if st.form_submit_button("❌ Cancelar"):
                     st.session_state.modal_open = False
@@ -421,126 +519,38 @@ if st.session_state.modal_open:
                     st.rerun()
             with col3:
                 if st.form_submit_button("💾 Guardar"):
-                    new_booking = {
-                        "id": booking["id"] if booking else str(datetime.now().timestamp()),
-                        "startDate": format_date_key(start_date),
-                        "endDate": format_date_key(end_date),
-                        "type": tipo,
-                        "numPeople": num_people,
-                        "numChildren": num_children,
-                        "guests": guests,
-                        "totalPrice": total_price,
-                        "discount": discount,
-                        "deposit": deposit,
-                        "balance": balance,
-                        "expenses": booking.get("expenses", []) if booking else [],
-                        "payments": payments,
-                        "paymentMethod": payments[0]["method"] if payments else "Efectivo",
-                        "schedule": schedule,
-                        "isHoliday": is_holiday,
-                        "cleaningTotal": cleaning_total,
-                        "cleaningDeposit": cleaning_deposit,
-                        "cleaningBalance": cleaning_balance
-                    }
-                    save_booking(new_booking)
-                    st.rerun()
+                    if save_booking(draft):
+                        st.rerun()
 
         # Acciones de compartir (solo si estamos editando una reserva existente)
         if booking:
             st.divider()
             st.subheader("Compartir información")
-            # Generar mensajes (similares a ShareActions.tsx)
-            def generate_monica_message():
-                check_in = "3:00 PM" if tipo=="Hospedaje" else schedule.split('-')[0].strip()
-                check_out = "1:00 PM" if tipo=="Hospedaje" else schedule.split('-')[1].strip()
-                return f"""🏡 *RESERVA CHALET OHANNA BAY* 🏡
---------------------------------
-👤 *Monica:*
-📅 *Ingreso:* {start_date} ({check_in})
-📅 *Salida:* {end_date} ({check_out})
-🏨 *Tipo:* {tipo}
-👥 *Personas:* {num_people}
-💰 *Saldo Pendiente:* {format_currency(balance)}
---------------------------------"""
-
-            def generate_portero_message():
-                guest_list = "\n".join([f"• {g['name']} - {g['document']}" for g in guests if g['name']]) or "No registrados"
-                return f"""👮 *AUTORIZACIÓN PORTERÍA* 👮
---------------------------------
-📅 *Fecha:* {start_date} al {end_date}
-🏠 *Chalet Ohanna Bay*
-👥 *Huéspedes:*
-{guest_list}
---------------------------------"""
-
-            def generate_admin_summary():
-                total_guests = num_people + num_children
-                final_total = total_price - discount
-                days_count = (end_date - start_date).days if tipo=="Hospedaje" else 1
-                day_label = "Día Hospedaje" if tipo=="Hospedaje" and days_count==1 else "Días Hospedaje" if tipo=="Hospedaje" else "Día Pasadía" if days_count==1 else "Días Pasadía"
-                payment_lines = "\n".join([f"• {format_currency(p['amount'])} ({p['method']}) - {p['date']}" for p in payments]) if payments else f"• {format_currency(deposit)} ({payments[0]['method'] if payments else 'No especificado'})"
-                return f"""📝 *RESUMEN DE RESERVA (ADMIN)* 📝
---------------------------------
-👥 *Huéspedes totales:* {total_guests} ({num_people} adultos, {num_children} niños)
-📅 *Duración:* {days_count} {day_label}
-💰 *Desglose:* {format_currency(total_price)} (Tarifa base + adicionales)
-📉 *Descuento:* {format_currency(discount)}
-✅ *Total:* {format_currency(final_total)}
-💳 *Abonos:*
-{payment_lines}
-🧹 *Aseo:* {format_currency(cleaning_total)} (Abonado: {format_currency(cleaning_deposit)}, Saldo: {format_currency(cleaning_balance)})
---------------------------------"""
-
-            def generate_json():
-                data = {
-                    "cliente": guests[0]["name"] if guests else "No registrado",
-                    "tipo": tipo,
-                    "inicio": format_date_key(start_date),
-                    "fin": format_date_key(end_date),
-                    "huespedes": num_people + num_children,
-                    "total": total_price - discount,
-                    "abonos": payments,
-                    "aseo_total": cleaning_total,
-                    "aseo_abonado": cleaning_deposit
-                }
-                return json.dumps(data, indent=2, ensure_ascii=False)
-
+            # mensajes con los valores actuales del formulario (similares a ShareActions.tsx)
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 if st.button("📋 Mensaje Mónica"):
-                    st.code(generate_monica_message(), language="text")
+                    st.code(monica_message(draft, current_property.name), language="text")
             with col2:
                 if st.button("📋 Lista Portería"):
-                    st.code(generate_portero_message(), language="text")
+                    st.code(portero_message(draft, current_property.name), language="text")
             with col3:
                 if st.button("📋 Resumen Admin"):
-                    st.code(generate_admin_summary(), language="text")
+                    st.code(admin_summary(draft, current_property.name), language="text")
             with col4:
                 if st.button("📋 Exportar JSON"):
-                    st.code(generate_json(), language="json")
+                    st.code(booking_json(draft, current_property.name), language="json")
 
 # ----------------------------------------------------------------------
 # Resumen de recaudación por método de pago (mes actual)
+# Cuenta todo pago recibido en el mes, sin importar la fecha de la reserva.
 # ----------------------------------------------------------------------
+profiler.section("Recaudación")
 st.divider()
 st.subheader(f"Recaudación por método - {st.session_state.current_date.strftime('%B %Y').capitalize()}")
 
-method_totals = {}
-total_recaudado = 0
-for b in bookings_month:
-    if "payments" in b and b["payments"]:
-        for p in b["payments"]:
-            pay_date = datetime.strptime(p["date"], "%Y-%m-%d").date()
-            if pay_date.month == st.session_state.current_date.month and pay_date.year == st.session_state.current_date.year:
-                method_totals[p["method"]] = method_totals.get(p["method"], 0) + p["amount"]
-                total_recaudado += p["amount"]
-    elif b.get("deposit", 0) > 0:
-        # pago legacy asociado a la fecha de inicio
-        booking_date = datetime.strptime(b["startDate"], "%Y-%m-%d").date()
-        if booking_date.month == st.session_state.current_date.month and booking_date.year == st.session_state.current_date.year:
-            method = b.get("paymentMethod", "No especificado")
-            method_totals[method] = method_totals.get(method, 0) + b["deposit"]
-            total_recaudado += b["deposit"]
+method_totals = st.session_state.store.method_totals(st.session_state.current_date.year, st.session_state.current_date.month)
+total_recaudado = sum(method_totals.values())
 
 if method_totals:
     st.markdown(f"**Total recaudado en el mes:** {format_currency(total_recaudado)}")
@@ -550,3 +560,210 @@ if method_totals:
             st.metric(method, format_currency(amount), f"{amount/total_recaudado*100:.1f}%" if total_recaudado>0 else "0%")
 else:
     st.info("No hay pagos registrados en este mes.")
+
+with st.expander("📊 Reporte de caja"):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        report_start = st.date_input("Desde", value=st.session_state.current_date.date().replace(month=1), key="report_start")
+    with col2:
+        report_end = st.date_input("Hasta", value=st.session_state.current_date.date().replace(month=12, day=31), key="report_end")
+    with col3:
+        report_freq = st.radio("Agrupar por", ["Mes", "Año"], horizontal=True, key="report_freq")
+    report = st.session_state.store.payment_report(report_start, report_end, "M" if report_freq == "Mes" else "Y")
+    if report.empty:
+        st.info("No hay pagos en el rango seleccionado.")
+    else:
+        st.dataframe(report.rename(index=str).style.format(format_currency))
+
+# ----------------------------------------------------------------------
+# Operación diaria: mensajes de llegadas/salidas, portería y aseo por rango
+# ----------------------------------------------------------------------
+profiler.section("Operación")
+with st.expander("🗓️ Operación diaria"):
+    today = datetime.now().date()
+    col1, col2 = st.columns(2)
+    with col1:
+        ops_start = st.date_input("Desde", value=today, key="ops_start")
+    with col2:
+        ops_end = st.date_input("Hasta", value=today + timedelta(days=7), key="ops_end")
+    digest = daily_digest(st.session_state.store, ops_start, ops_end)
+    schedule = turnovers(st.session_state.store, ops_start, ops_end)
+    tab1, tab2, tab3 = st.tabs(["Llegadas y salidas", "Portería", "Aseo"])
+    with tab1:
+        if digest:
+            st.code("\n\n".join(arrival_messages(digest, current_property.name)), language="text")
+        else:
+            st.info("Sin llegadas ni salidas en el rango.")
+    with tab2:
+        st.code(porter_list(digest, ops_start, ops_end, current_property.name), language="text")
+    with tab3:
+        if schedule:
+            st.markdown(f"**Aseo pendiente:** {format_currency(sum(t.cleaning_balance for t in schedule))}")
+            st.dataframe([
+                {"Salida": format_date_key(t.day), "Sale": t.departing.guest_name or t.departing.type,
+                 "Próxima llegada": format_date_key(t.next_arrival.start_date) if t.next_arrival else "-",
+                 "Entra": (t.next_arrival.guest_name or t.next_arrival.type) if t.next_arrival else "-",
+                 "Mismo día": t.same_day, "Aseo total": format_currency(t.departing.cleaning_total),
+                 "Aseo pendiente": format_currency(t.cleaning_balance)}
+                for t in schedule
+            ], hide_index=True)
+        else:
+            st.info("Sin salidas en el rango.")
+    ops_store, ops_chalet = st.session_state.store, current_property.name  # la descarga corre en otro hilo, sin session_state
+    st.download_button(
+        "⬇️ Descargar resumen", data=lambda: render_digest(ops_store, ops_start, ops_end, ops_chalet),
+        file_name=f"operacion_{format_date_key(ops_start)}_{format_date_key(ops_end)}.txt", mime="text/plain",
+    )
+
+# ----------------------------------------------------------------------
+# Directorio de huéspedes (búsqueda e historial)
+# ----------------------------------------------------------------------
+profiler.section("Huéspedes")
+with st.expander("👥 Huéspedes"):
+    directory_query = st.text_input("Buscar por nombre o documento (sin importar tildes)", key="directory_search")
+    if directory_query:
+        found_guests = st.session_state.store.search_guests(directory_query, limit=50)
+        if not found_guests:
+            st.info("Sin coincidencias.")
+        for record in found_guests[:10]:
+            with st.container(border=True):
+                st.markdown(f"**{record.name or 'Sin nombre'}** · {record.document or 'sin documento'}")
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Estadías", record.visits)
+                col2.metric("Total", format_currency(record.total_spent))
+                col3.metric("Saldo", format_currency(record.balance))
+                st.dataframe(
+                    [{"Ingreso": format_date_key(stay.start_date), "Salida": format_date_key(stay.end_date), "Tipo": stay.type,
+                      "Principal": stay.payer, "Total": format_currency(stay.total), "Saldo": format_currency(stay.balance)}
+                     for stay in record.history()],
+                    hide_index=True,
+                )
+        if len(found_guests) > 10:
+            st.caption(f"Se muestran 10 de {len(found_guests)}{'+' if len(found_guests) == 50 else ''} coincidencias; escriba más para acotar.")
+
+# ----------------------------------------------------------------------
+# Analítica de varios años (ocupación, ingresos, ADR, saldos)
+# ----------------------------------------------------------------------
+@st.cache_resource(max_entries=2)
+def get_analytics(_store, property_id: str, version: int) -> Analytics:
+    """Frames de analítica de todas las reservas; se recalculan solo si cambió el store."""
+    bookings = _store.all()
+    profiler.count("reservas leídas", len(bookings))
+    return Analytics(bookings)
+
+profiler.section("Analítica")
+with st.expander("📈 Analítica"):
+    # la analítica lee todas las reservas: el cuerpo de un expander corre en cada rerun aunque esté
+    # cerrado, así que solo se arma cuando se pide (y queda en caché hasta el próximo cambio)
+    if not st.toggle("Ver analítica", key="show_analytics"):
+        st.caption("Lee todas las reservas de la propiedad; puede tardar con historiales grandes.")
+    else:
+        analytics = get_analytics(st.session_state.store, current_property.id, st.session_state.store.version)
+        if analytics.monthly.empty:
+            st.info("Aún no hay reservas para analizar.")
+        else:
+            years = sorted(analytics.yearly.index)
+            first_year, last_year = st.select_slider("Años", options=years, value=(years[0], years[-1]), key="analytics_years") if len(years) > 1 else (years[0], years[0])
+            monthly = analytics.monthly[(analytics.monthly.index.year >= first_year) & (analytics.monthly.index.year <= last_year)]
+            yearly = analytics.yearly.loc[first_year:last_year]
+            noches = int(monthly["Noches Hospedaje"].sum())
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Ocupación", f"{monthly['Días ocupados'].sum() / monthly['Días del mes'].sum() * 100:.1f}%")
+            with col2:
+                st.metric("Ingresos", format_currency(monthly["Ingresos"].sum()))
+            with col3:
+                st.metric("ADR Hospedaje", format_currency(monthly["Ingresos Hospedaje"].sum() / noches if noches else 0))
+            with col4:
+                st.metric("Saldo pendiente", format_currency(monthly["Saldo pendiente"].sum()))
+            chart = monthly.rename(index=str)
+            st.markdown("**Ocupación mensual**")
+            st.line_chart(chart["Ocupación"])
+            st.markdown("**Ingresos por tipo**")
+            st.bar_chart(chart[["Ingresos Hospedaje", "Ingresos Pasadía"]])
+            st.markdown("**Noches de fin de semana vs. entre semana (Hospedaje)**")
+            st.bar_chart(chart[["Noches fin de semana", "Noches entre semana"]])
+            money = ["Ingresos Hospedaje", "Ingresos Pasadía", "Ingresos", "ADR", "Descuentos", "Saldo pendiente", "Aseo pendiente"]
+            st.dataframe(yearly.style.format(format_currency, subset=money).format("{:.1%}", subset=["Ocupación"]))
+
+# ----------------------------------------------------------------------
+# Importación masiva de reservas (JSONL o CSV)
+# ----------------------------------------------------------------------
+profiler.section("Importación")
+with st.expander("📥 Importar reservas"):
+    st.caption("JSONL (una reserva por línea, también el formato de \"Exportar JSON\") o CSV con columnas camelCase. "
+               "Los precios y saldos se recalculan con las tarifas actuales.")
+    upload = st.file_uploader("Archivo", type=["jsonl", "json", "csv"], key="import_file")
+    if upload is not None and st.button("Importar", key="import_run"):
+        with st.spinner("Importando..."):
+            import_report = import_bookings(st.session_state.store, upload, rates=current_rates)
+        if import_report.loaded:
+            st.success(f"Se cargaron {import_report.loaded} reservas.")
+        if import_report.failed:
+            st.warning(f"{import_report.failed} filas con errores.")
+            import pandas as pd
+
+            st.dataframe(pd.DataFrame(
+                [(e.line, e.message) for e in import_report.errors], columns=["Línea", "Error"],
+            ))
+
+# ----------------------------------------------------------------------
+# Exportación masiva (CSV, Parquet, iCalendar)
+# ----------------------------------------------------------------------
+@st.cache_resource
+def get_ics_feed(_store, property_id: str, calendar_name: str) -> IcsFeed:
+    """Calendario público del proceso; solo regenera los meses que cambiaron."""
+    return IcsFeed(_store, calendar_name=calendar_name)
+
+profiler.section("Exportación")
+ics_feed = get_ics_feed(st.session_state.store, current_property.id, current_property.name)
+# OHANNA_ICS=ruta/al/archivo.ics publica el calendario (un año atrás, dos adelante) tras cada cambio;
+# las demás propiedades publican en <ruta>.<id>.ics
+ics_path = partition_location(os.environ.get("OHANNA_ICS"), current_property.id, current_property is partitions.primary)
+if ics_path and ics_feed.written_version != st.session_state.store.version:
+    today = datetime.now().date()
+    ics_feed.write(ics_path, today.replace(year=today.year - 1, month=1, day=1), today.replace(year=today.year + 2, month=12, day=31))
+
+with st.expander("📤 Exportar reservas"):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        export_start = st.date_input("Desde", value=st.session_state.current_date.date().replace(month=1), key="export_start")
+    with col2:
+        export_end = st.date_input("Hasta", value=st.session_state.current_date.date().replace(month=12, day=31), key="export_end")
+    with col3:
+        export_format = st.selectbox("Formato", ["CSV", "Parquet", "iCalendar"], key="export_format")
+    include_guests = export_format == "iCalendar" and st.checkbox("Incluir nombres de huéspedes", key="export_guests")
+
+    export_store, export_chalet = st.session_state.store, current_property.name  # la descarga corre en otro hilo, sin session_state
+
+    def export_file():
+        """Se ejecuta al hacer clic: arma el archivo por trozos en un temporal."""
+        bookings = iter_bookings(export_store, export_start, export_end)
+        if export_format == "CSV":
+            return spool(csv_chunks(bookings))
+        if export_format == "Parquet":
+            return spool(parquet_chunks(bookings))
+        if include_guests:
+            return spool(ics_chunks(bookings, include_guests=True, calendar_name=export_chalet))
+        return spool(ics_feed.chunks(export_start, export_end))
+
+    extension, mime = {
+        "CSV": ("csv", "text/csv"),
+        "Parquet": ("parquet", "application/vnd.apache.parquet"),
+        "iCalendar": ("ics", "text/calendar"),
+    }[export_format]
+    st.download_button(
+        "⬇️ Descargar", data=export_file, mime=mime,
+        file_name=f"reservas_{format_date_key(export_start)}_{format_date_key(export_end)}.{extension}",
+    )
+
+# ----------------------------------------------------------------------
+# Panel de perfil (solo con OHANNA_PROFILE o ?profile=1)
+# ----------------------------------------------------------------------
+if profiler.enabled:
+    last_run = profiler.finish()
+    with st.expander("⏱️ Perfil de ejecución", expanded=True):
+        st.caption(f"Última ejecución: {last_run['total_ms']:.1f} ms · historial de {len(profiler.runs)} ejecuciones")
+        profile = profiler.summary()
+        st.dataframe(profile.style.format("{:.1f}", subset=["p50 ms", "p95 ms", "última ms"]))
+        st.download_button("⬇️ Descargar historial (JSON)", data=profiler.to_json(), file_name="perfil.json", mime="application/json")
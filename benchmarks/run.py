@@ -0,0 +1,218 @@
+"""Benchmarks del motor de reservas con datos sintéticos.
+
+Uso (desde la raíz del repositorio)::
+
+    python -m benchmarks.run --sizes 100 1000 10000 100000 --out bench.json
+    python -m benchmarks.run --compare viejo.json nuevo.json
+
+Para cada tamaño se genera un historial reproducible (``--seed``) con
+``ohanna.synthetic``: a lo sumo ``--years`` años de fechas, con tantas
+propiedades (líneas de tiempo sin cruces) como hagan falta para que quepan
+las reservas, todas cargadas en el mismo store. Se mide, en MemoryStore y SQLite:
+
+* filtro del mes (``bookings_for_month``, lo que usa ``get_bookings_for_month``);
+* resolución de la grilla del calendario (índice de ocupación + HTML del mes);
+* cotización de estadías (función escalar, ``quote_stay`` y ``quote_ranges``);
+* agregados mensuales (consulta incremental y reconstrucción completa);
+* resumen de recaudación por método (mes y año).
+
+Cada medición reporta la mediana y el mínimo de ``--repeat`` repeticiones,
+en segundos por llamada. El JSON incluye la versión de Python, NumPy,
+pandas, la plataforma y el commit, para comparar entre versiones, y en
+``meta.datasets`` las propiedades y el rango de fechas de cada tamaño.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ohanna.aggregates import MonthlyAggregates
+from ohanna.models import HOSPEDAJE
+from ohanna.occupancy import build_occupancy_index
+from ohanna.pricing import calculate_hospedaje_price
+from ohanna.quotes import quote_ranges, quote_stay
+from ohanna.render import build_month_view
+from ohanna.storage import MemoryStore, SQLiteStore
+from ohanna.synthetic import generate_bookings, properties_for
+
+
+def measure(fn: Callable[[], object], repeat: int, min_time: float = 0.05) -> Dict[str, float]:
+    """Segundos por llamada (mediana y mínimo de ``repeat`` rondas).
+
+    Cada ronda repite ``fn`` las veces necesarias para durar al menos
+    ``min_time``, así las operaciones de microsegundos se miden bien.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10
+    rounds = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number)
+    return {"median_s": statistics.median(rounds), "min_s": min(rounds), "calls": number, "rounds": repeat}
+
+
+def _months(bookings, rnd: random.Random, count: int):
+    """Meses al azar dentro del historial generado."""
+    first, last = bookings[0].start_date, max(b.end_date for b in bookings)
+    span = (last - first).days
+    return [(d.year, d.month) for d in (first + timedelta(days=rnd.randrange(span + 1)) for _ in range(count))]
+
+
+def dataset(bookings, properties: int) -> Dict:
+    """Forma del historial generado, para el JSON de resultados."""
+    return {"bookings": len(bookings), "properties": properties,
+            "first": bookings[0].start_date.isoformat(), "last": max(b.end_date for b in bookings).isoformat()}
+
+
+def bench_size(size: int, seed: int, repeat: int, backends: List[str], years: float) -> Tuple[List[Dict], Dict]:
+    """Mediciones de un tamaño y la descripción de su historial."""
+    results: List[Dict] = []
+    rnd = random.Random(seed)
+
+    def record(name: str, backend: str, fn: Callable[[], object]) -> None:
+        row = {"name": name, "size": size, "backend": backend, **measure(fn, repeat)}
+        results.append(row)
+        print(f"  {name:<28} {backend:<7} {row['median_s'] * 1e3:10.3f} ms", file=sys.stderr)
+
+    def record_once(name: str, backend: str, elapsed: float) -> None:
+        results.append({"name": name, "size": size, "backend": backend, "median_s": elapsed,
+                        "min_s": elapsed, "calls": 1, "rounds": 1})
+
+    properties = properties_for(size, years)
+    start = time.perf_counter()
+    bookings = generate_bookings(size, seed, properties=properties)
+    record_once("generate", "-", time.perf_counter() - start)
+    months = _months(bookings, rnd, 12)
+    month_cycle = itertools.cycle(months)
+
+    stores = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            start = time.perf_counter()
+            if backend == "memory":
+                store = MemoryStore(bookings)
+            else:
+                store = SQLiteStore(os.path.join(tmp, "bench.db"))
+                store.save_many(bookings)
+            record_once("load_store", backend, time.perf_counter() - start)
+            if backend == "sqlite":
+                # abrir un archivo existente no debe depender del número de reservas
+                store.close()
+                start = time.perf_counter()
+                store = SQLiteStore(os.path.join(tmp, "bench.db"))
+                record_once("open_store", backend, time.perf_counter() - start)
+            stores[backend] = store
+
+        for backend, store in stores.items():
+            record("month_filter", backend, lambda: store.bookings_for_month(*next(month_cycle)))
+            record("month_grid", backend, lambda: build_month_view(
+                *(ym := next(month_cycle)), build_occupancy_index(store.bookings_for_month(*ym))))
+            record("month_aggregates", backend, lambda: store.month_stats(*next(month_cycle)))
+            record("method_totals_month", backend, lambda: store.method_totals(*next(month_cycle)))
+            record("method_totals_year", backend, lambda: store.payment_totals(
+                *(lambda y: (date(y, 1, 1), date(y, 12, 31)))(next(month_cycle)[0])))
+        for store in stores.values():
+            if isinstance(store, SQLiteStore):
+                store.close()
+
+    record("aggregates_rebuild", "-", lambda: MonthlyAggregates(bookings))
+
+    stay = next(b for b in bookings if b.type == HOSPEDAJE and b.nights >= 3)
+    record("price_stay_scalar", "-", lambda: sum(
+        calculate_hospedaje_price(stay.num_people, stay.num_children, stay.start_date + timedelta(days=i))
+        for i in range(stay.nights)))
+    record("price_stay_vector", "-", lambda: quote_stay(stay.num_people, stay.num_children, stay.start_date, stay.end_date))
+    stays = [b for b in bookings if b.type == HOSPEDAJE]
+    starts = np.array([b.start_date for b in stays], dtype="datetime64[D]")
+    ends = np.array([b.end_date for b in stays], dtype="datetime64[D]")
+    record("price_all_stays", "-", lambda: quote_ranges(4, 1, starts, ends))
+    return results, dataset(bookings, properties)
+
+
+def metadata(seed: int, years: float, datasets: Dict[int, Dict]) -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "seed": seed,
+        "max_years": years,
+        "datasets": datasets,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Imprime la razón nuevo/viejo de cada medición presente en ambos archivos."""
+    with open(old_path, encoding="utf-8") as f:
+        old = {(r["name"], r["size"], r["backend"]): r for r in json.load(f)["results"]}
+    with open(new_path, encoding="utf-8") as f:
+        new = {(r["name"], r["size"], r["backend"]): r for r in json.load(f)["results"]}
+    print(f"{'medición':<28} {'tamaño':>7} {'backend':<7} {'viejo ms':>10} {'nuevo ms':>10} {'razón':>7}")
+    for key in sorted(old.keys() & new.keys(), key=lambda k: (k[1], k[0], k[2])):
+        before, after = old[key]["median_s"], new[key]["median_s"]
+        ratio = after / before if before else float("inf")
+        flag = "  <-- más lento" if ratio > 1.2 else ""
+        print(f"{key[0]:<28} {key[1]:>7} {key[2]:<7} {before * 1e3:10.3f} {after * 1e3:10.3f} {ratio:7.2f}{flag}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks del motor de reservas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--years", type=float, default=10,
+                        help="años máximos del historial; las reservas se reparten en más propiedades")
+    parser.add_argument("--backends", nargs="+", default=["memory", "sqlite"], choices=["memory", "sqlite"])
+    parser.add_argument("--out", default="-", help="archivo JSON de salida ('-' = stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("VIEJO", "NUEVO"), help="compara dos resultados")
+    args = parser.parse_args(argv)
+    if args.compare:
+        compare(*args.compare)
+        return
+    results = []
+    datasets: Dict[int, Dict] = {}
+    for size in args.sizes:
+        print(f"tamaño {size}", file=sys.stderr)
+        rows, datasets[size] = bench_size(size, args.seed, args.repeat, args.backends, args.years)
+        results.extend(rows)
+    report = {"meta": metadata(args.seed, args.years, datasets), "results": results}
+    if args.out == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
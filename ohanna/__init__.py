@@ -0,0 +1,68 @@
+"""Lógica de dominio del gestor de reservas del Chalet Ohanna Bay (y otras propiedades).
+
+No depende de Streamlit: la usan ``app.py``, la línea de comandos
+(``python -m ohanna``) y scripts propios. Los nombres principales se
+exportan aquí de forma perezosa (``ohanna.quote_stay``, ``ohanna.open_store``,
+...): ``import ohanna`` no carga NumPy ni pandas hasta que se usa algo que
+los necesita.
+"""
+import importlib
+
+_EXPORTS = {
+    "HOSPEDAJE": "ohanna.models",
+    "PASADIA": "ohanna.models",
+    "Booking": "ohanna.models",
+    "Expense": "ohanna.models",
+    "Guest": "ohanna.models",
+    "Payment": "ohanna.models",
+    "DEFAULT_RATES": "ohanna.rates",
+    "RateSource": "ohanna.rates",
+    "RateTable": "ohanna.rates",
+    "compile_rates": "ohanna.rates",
+    "load_rates": "ohanna.rates",
+    "calculate_hospedaje_price": "ohanna.pricing",
+    "calculate_pasadia_price": "ohanna.pricing",
+    "nightly_breakdown": "ohanna.pricing",
+    "format_currency": "ohanna.helpers",
+    "format_date_key": "ohanna.helpers",
+    "get_days_in_month": "ohanna.helpers",
+    "BookingConflictError": "ohanna.availability",
+    "BookingStore": "ohanna.storage",
+    "MemoryStore": "ohanna.storage",
+    "SQLiteStore": "ohanna.storage",
+    "month_bounds": "ohanna.storage",
+    "open_store": "ohanna.storage",
+    "GuestDirectory": "ohanna.guests",
+    "SharedStore": "ohanna.shared",
+    "PartitionedStore": "ohanna.properties",
+    "Property": "ohanna.properties",
+    "load_properties": "ohanna.properties",
+    "open_partitions": "ohanna.properties",
+    "StaleBookingError": "ohanna.shared",
+    "quote_stay": "ohanna.quotes",
+    "quote_total": "ohanna.quotes",
+    "quote_ranges": "ohanna.quotes",
+    "daily_digest": "ohanna.digest",
+    "render_digest": "ohanna.digest",
+    "turnovers": "ohanna.digest",
+    "MESSAGES": "ohanna.messages",
+    "admin_summary": "ohanna.messages",
+    "booking_json": "ohanna.messages",
+    "monica_message": "ohanna.messages",
+    "portero_message": "ohanna.messages",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'ohanna' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
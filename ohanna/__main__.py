@@ -0,0 +1,5 @@
+import sys
+
+from ohanna.cli import main
+
+sys.exit(main())
@@ -0,0 +1,139 @@
+"""Agregados mensuales mantenidos de forma incremental.
+
+Cada reserva suma en todos los meses que toca (de su mes de inicio a su mes
+de fin, igual que ``get_bookings_for_month``); cada pago suma en el mes en
+que se recibió. Guardar o eliminar aplica solo la diferencia, así que leer
+las estadísticas de un mes es O(1).
+
+Los días ocupados y el ingreso van al mes de cada día ocupado; el total con
+descuento se reparte entre los días como en ``ohanna.analytics``, pero en
+enteros (la suma por meses da exactamente el total de la reserva).
+"""
+from dataclasses import dataclass, fields, replace
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ohanna.models import HOSPEDAJE, PASADIA, Booking
+
+MonthKey = Tuple[int, int]
+
+
+@dataclass(slots=True)
+class MonthStats:
+    """Valores de la barra de estadísticas de un mes."""
+    bookings: int = 0
+    hospedajes: int = 0
+    pasadias: int = 0
+    balance: int = 0
+    cleaning_balance: int = 0
+    occupied_days: int = 0
+    revenue: int = 0
+
+
+def combine(stats: Iterable[MonthStats]) -> MonthStats:
+    """Suma campo a campo (por ejemplo, el mismo mes de varias propiedades)."""
+    total = MonthStats()
+    for item in stats:
+        for f in fields(MonthStats):
+            setattr(total, f.name, getattr(total, f.name) + getattr(item, f.name))
+    return total
+
+
+def months_touched(booking: Booking) -> Iterator[MonthKey]:
+    """Meses (año, mes) desde el inicio hasta el fin de la reserva, inclusive."""
+    year, month = booking.start_date.year, booking.start_date.month
+    last = (booking.end_date.year, booking.end_date.month)
+    while (year, month) <= last:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def occupancy_by_month(booking: Booking) -> Dict[MonthKey, Tuple[int, int]]:
+    """(días ocupados, ingreso) por mes; el ingreso se reparte por día sin perder pesos."""
+    start, end = booking.start_date, booking.occupied_end
+    days = (end - start).days
+    result: Dict[MonthKey, Tuple[int, int]] = {}
+    done = 0
+    cursor = start
+    while cursor < end:
+        following = date(cursor.year + 1, 1, 1) if cursor.month == 12 else date(cursor.year, cursor.month + 1, 1)
+        chunk = (min(following, end) - cursor).days
+        # ingreso acumulado hasta el fin del tramo menos el acumulado al inicio
+        revenue = booking.final_total * (done + chunk) // days - booking.final_total * done // days
+        result[(cursor.year, cursor.month)] = (chunk, revenue)
+        done += chunk
+        cursor = following
+    return result
+
+
+def payment_entries(booking: Booking) -> Iterator[Tuple[date, str, int]]:
+    """Pagos de la reserva como (fecha, método, monto).
+
+    Si la reserva no tiene ``payments`` pero sí ``deposit`` (formato legacy), el
+    abono se asocia a la fecha de inicio con ``paymentMethod``.
+    """
+    if booking.payments:
+        for p in booking.payments:
+            yield p.date, p.method, p.amount
+    elif booking.deposit > 0:
+        yield booking.start_date, booking.payment_method or "No especificado", booking.deposit
+
+
+class MonthlyAggregates:
+    """Estadísticas por (año, mes) y recaudo por (año, mes, método)."""
+
+    def __init__(self, bookings: Iterable[Booking] = ()):
+        self._months: Dict[MonthKey, MonthStats] = {}
+        # método -> [monto, número de pagos]; el conteo permite quitar métodos sin pagos
+        self._methods: Dict[MonthKey, Dict[str, List[int]]] = {}
+        for b in bookings:
+            self.add(b)
+
+    def _apply(self, booking: Booking, sign: int) -> None:
+        occupancy = occupancy_by_month(booking)
+        for key in months_touched(booking):
+            stats = self._months.get(key)
+            if stats is None:
+                stats = self._months[key] = MonthStats()
+            stats.bookings += sign
+            stats.hospedajes += sign * (booking.type == HOSPEDAJE)
+            stats.pasadias += sign * (booking.type == PASADIA)
+            stats.balance += sign * booking.balance
+            stats.cleaning_balance += sign * booking.cleaning_balance
+            days, revenue = occupancy.get(key, (0, 0))
+            stats.occupied_days += sign * days
+            stats.revenue += sign * revenue
+            if stats.bookings == 0:
+                del self._months[key]
+        for pay_date, method, amount in payment_entries(booking):
+            key = (pay_date.year, pay_date.month)
+            totals = self._methods.setdefault(key, {})
+            entry = totals.setdefault(method, [0, 0])
+            entry[0] += sign * amount
+            entry[1] += sign
+            if entry[1] == 0:
+                del totals[method]
+                if not totals:
+                    del self._methods[key]
+
+    def add(self, booking: Booking) -> None:
+        self._apply(booking, 1)
+
+    def remove(self, booking: Booking) -> None:
+        self._apply(booking, -1)
+
+    def replace(self, old: Optional[Booking], new: Optional[Booking]) -> None:
+        """Aplica el cambio de ``old`` a ``new`` (cualquiera puede ser None)."""
+        if old is not None:
+            self.remove(old)
+        if new is not None:
+            self.add(new)
+
+    def month(self, year: int, month: int) -> MonthStats:
+        """Estadísticas del mes (ceros si no hay reservas); es una copia, las escrituras no la cambian."""
+        stats = self._months.get((year, month))
+        return replace(stats) if stats is not None else MonthStats()
+
+    def method_totals(self, year: int, month: int) -> Dict[str, int]:
+        """Recaudo del mes por método de pago."""
+        return {method: entry[0] for method, entry in self._methods.get((year, month), {}).items()}
@@ -0,0 +1,124 @@
+"""Analítica de ocupación e ingresos de varios años.
+
+Se arma una sola vez un DataFrame por reserva (``bookings_frame``) y, a
+partir de él, uno por día ocupado (``nights_frame``) con NumPy, sin recorrer
+los meses. ``monthly_summary`` obtiene todos los indicadores por mes con
+groupbys vectorizados:
+
+* ocupación: días ocupados / días del mes (un Pasadía ocupa su día);
+* ingresos por tipo: el total con descuento de cada reserva repartido por
+  igual entre sus días;
+* ADR (tarifa promedio por noche) de Hospedaje;
+* noches de fin de semana (sábado y domingo, como en el calendario) y entre
+  semana;
+* descuentos y saldos pendientes, en el mes de llegada de la reserva.
+"""
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from ohanna.models import HOSPEDAJE, PASADIA, Booking
+
+SUMMARY_COLUMNS = [
+    "Días del mes", "Días ocupados", "Ocupación", "Noches Hospedaje", "Pasadías", "Ingresos Hospedaje",
+    "Ingresos Pasadía", "Ingresos", "ADR", "Noches fin de semana", "Noches entre semana",
+    "Descuentos", "Saldo pendiente", "Aseo pendiente",
+]
+
+
+def bookings_frame(bookings: Iterable[Booking]) -> pd.DataFrame:
+    """Una fila por reserva con fechas como ``datetime64[D]`` y montos enteros."""
+    bookings = list(bookings)
+    starts = np.array([b.start_date for b in bookings], dtype="datetime64[D]")
+    ends = np.array([b.occupied_end for b in bookings], dtype="datetime64[D]")
+    return pd.DataFrame({
+        "id": [b.id for b in bookings],
+        "type": [b.type for b in bookings],
+        "start": starts,
+        "end": ends,  # día siguiente al último ocupado
+        "days": (ends - starts).astype(np.int64),
+        "final_total": np.array([b.final_total for b in bookings], dtype=np.int64),
+        "discount": np.array([b.discount for b in bookings], dtype=np.int64),
+        "balance": np.array([b.balance for b in bookings], dtype=np.int64),
+        "cleaning_balance": np.array([b.cleaning_balance for b in bookings], dtype=np.int64),
+    })
+
+
+def nights_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Una fila por día ocupado: fecha, reserva, tipo, ingreso del día y si es fin de semana."""
+    days = np.maximum(frame["days"].to_numpy(), 0)
+    row = np.repeat(np.arange(len(frame)), days)
+    # posición de cada día dentro de su reserva: 0, 1, ..., days-1
+    offset = np.arange(len(row)) - np.repeat(np.cumsum(days) - days, days)
+    # pandas puede guardar las fechas en segundos: volver a días antes de operar
+    dates = frame["start"].to_numpy().astype("datetime64[D]")[row] + offset.astype("timedelta64[D]")
+    # 1970-01-01 fue jueves: (días + 3) % 7 da 0 = lunes ... 6 = domingo
+    weekday = (dates.astype(np.int64) + 3) % 7
+    revenue = frame["final_total"].to_numpy() / np.maximum(days, 1)
+    return pd.DataFrame({
+        "date": dates,
+        "booking": row,
+        "type": frame["type"].to_numpy()[row],
+        "revenue": revenue[row],
+        "weekend": weekday >= 5,
+    })
+
+
+def monthly_summary(frame: pd.DataFrame, nights: pd.DataFrame) -> pd.DataFrame:
+    """Indicadores por mes (índice ``Period``) entre el primer y el último mes con datos."""
+    if frame.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    month = nights["date"].dt.to_period("M")
+    by_type = nights.groupby([month, nights["type"]]).agg(days=("date", "size"), revenue=("revenue", "sum")).unstack(fill_value=0)
+    occupied = nights["date"].drop_duplicates()
+    hospedaje = nights["type"] == HOSPEDAJE
+    weekend = (
+        nights["weekend"][hospedaje].groupby([month[hospedaje], nights["weekend"][hospedaje]]).size()
+        .unstack(fill_value=0).reindex(columns=[True, False], fill_value=0)
+    )
+    start_month = frame["start"].dt.to_period("M")
+    money = frame.groupby(start_month)[["discount", "balance", "cleaning_balance"]].sum()
+
+    periods = pd.period_range(min(month.min(), start_month.min()), max(month.max(), start_month.max()), freq="M")
+    summary = pd.DataFrame(index=periods)
+    summary["Días del mes"] = periods.days_in_month
+    summary["Días ocupados"] = occupied.groupby(occupied.dt.to_period("M")).size()
+    summary["Noches Hospedaje"] = by_type.get(("days", HOSPEDAJE))
+    summary["Pasadías"] = by_type.get(("days", PASADIA))
+    summary["Ingresos Hospedaje"] = by_type.get(("revenue", HOSPEDAJE))
+    summary["Ingresos Pasadía"] = by_type.get(("revenue", PASADIA))
+    summary = summary.fillna(0)
+    summary["Ocupación"] = summary["Días ocupados"] / summary["Días del mes"]
+    summary["Ingresos"] = summary["Ingresos Hospedaje"] + summary["Ingresos Pasadía"]
+    summary["ADR"] = (summary["Ingresos Hospedaje"] / summary["Noches Hospedaje"].where(summary["Noches Hospedaje"] > 0)).fillna(0)
+    summary["Noches fin de semana"] = weekend[True]
+    summary["Noches entre semana"] = weekend[False]
+    summary["Descuentos"] = money["discount"]
+    summary["Saldo pendiente"] = money["balance"]
+    summary["Aseo pendiente"] = money["cleaning_balance"]
+    summary = summary.reindex(columns=SUMMARY_COLUMNS).fillna(0)
+    counts = ["Días del mes", "Días ocupados", "Noches Hospedaje", "Pasadías", "Noches fin de semana", "Noches entre semana",
+              "Descuentos", "Saldo pendiente", "Aseo pendiente"]
+    summary[counts] = summary[counts].astype(np.int64)
+    return summary
+
+
+def yearly_summary(monthly: pd.DataFrame) -> pd.DataFrame:
+    """Suma los meses por año; ocupación y ADR se recalculan sobre el año."""
+    if monthly.empty:
+        return monthly
+    yearly = monthly.groupby(monthly.index.year).sum()
+    yearly["Ocupación"] = yearly["Días ocupados"] / yearly["Días del mes"]
+    yearly["ADR"] = (yearly["Ingresos Hospedaje"] / yearly["Noches Hospedaje"].where(yearly["Noches Hospedaje"] > 0)).fillna(0)
+    return yearly
+
+
+class Analytics:
+    """Frames y resúmenes de todas las reservas, calculados una vez por versión del store."""
+
+    def __init__(self, bookings: Iterable[Booking]):
+        self.bookings = bookings_frame(bookings)
+        self.nights = nights_frame(self.bookings)
+        self.monthly = monthly_summary(self.bookings, self.nights)
+        self.yearly = yearly_summary(self.monthly)
@@ -0,0 +1,137 @@
+"""Disponibilidad y detección de cruces entre reservas.
+
+Cada reserva ocupa el intervalo de días ``[inicio, fin)`` que usa el
+calendario (un Pasadía ocupa solo su día). Los intervalos se guardan
+ordenados por inicio; como ninguna estadía dura más que la más larga
+registrada, las que pueden cruzarse con ``[s, e)`` están entre los inicios
+``s - estadía_máxima`` y ``e``, así que una consulta cuesta O(log n + k).
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from ohanna.columns import BULK_MIN, merge_rows
+from ohanna.models import Booking
+
+
+class BookingConflictError(ValueError):
+    """La reserva se cruza con otras ya guardadas."""
+
+    def __init__(self, booking: Booking, conflicts: List[str]):
+        self.booking = booking
+        self.conflicts = conflicts
+        super().__init__(f"La reserva {booking.id} se cruza con: {', '.join(conflicts)}")
+
+
+def occupied_range(booking: Booking) -> Tuple[date, date]:
+    """Intervalo ``[inicio, fin)`` de días que ocupa la reserva en el calendario."""
+    return booking.start_date, booking.occupied_end
+
+
+class AvailabilityIndex:
+    """Intervalos ocupados ordenados por día de inicio."""
+
+    def __init__(self, bookings: Iterable[Booking] = ()):
+        self._starts: List[int] = []  # date.toordinal()
+        self._ends: List[int] = []
+        self._ids: List[str] = []
+        self._max_span = 0
+        self.add_many(bookings)
+
+    def add(self, booking: Booking) -> None:
+        start, end = (d.toordinal() for d in occupied_range(booking))
+        if end <= start:
+            return
+        i = bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._ids.insert(i, booking.id)
+        # solo crece: quitar reservas no lo reduce, lo que mantiene las consultas correctas
+        self._max_span = max(self._max_span, end - start)
+
+    def add_many(self, bookings: Iterable[Booking]) -> None:
+        """Agrega muchas reservas mezclando el lote ordenado con las columnas."""
+        bookings = list(bookings)
+        if len(bookings) < BULK_MIN:
+            for b in bookings:
+                self.add(b)
+            return
+        rows = []
+        for b in bookings:
+            start, end = (d.toordinal() for d in occupied_range(b))
+            if end > start:
+                rows.append((start, end, b.id))
+                self._max_span = max(self._max_span, end - start)
+        self._starts, self._ends, self._ids = merge_rows((self._starts, self._ends, self._ids), rows)
+
+    def remove(self, booking: Booking) -> None:
+        start = booking.start_date.toordinal()
+        for i in range(bisect_left(self._starts, start), bisect_right(self._starts, start)):
+            if self._ids[i] == booking.id:
+                del self._starts[i], self._ends[i], self._ids[i]
+                return
+
+    def replace(self, old: Optional[Booking], new: Optional[Booking]) -> None:
+        """Aplica el cambio de ``old`` a ``new`` (cualquiera puede ser None)."""
+        if old is not None:
+            self.remove(old)
+        if new is not None:
+            self.add(new)
+
+    def replace_many(self, old: Iterable[Booking], new: Iterable[Booking]) -> None:
+        for booking in old:
+            self.remove(booking)
+        self.add_many(new)
+
+    def conflicts(self, start: date, end: date, exclude_id: Optional[str] = None) -> List[str]:
+        """Ids de las reservas que ocupan algún día de ``[start, end)``."""
+        s, e = start.toordinal(), end.toordinal()
+        lo = bisect_left(self._starts, s - self._max_span)
+        hi = bisect_left(self._starts, e)
+        return [self._ids[i] for i in range(lo, hi) if self._ends[i] > s and self._ids[i] != exclude_id]
+
+    def booking_conflicts(self, booking: Booking) -> List[str]:
+        """Ids de las reservas que se cruzan con ``booking`` (excluyéndola)."""
+        return self.conflicts(*occupied_range(booking), exclude_id=booking.id)
+
+    def is_available(self, start: date, end: date, exclude_id: Optional[str] = None) -> bool:
+        return not self.conflicts(start, end, exclude_id)
+
+    def next_free_ranges(self, after: date, nights: int, count: int = 3,
+                         exclude_id: Optional[str] = None) -> List[Tuple[date, date]]:
+        """Los primeros rangos libres de ``nights`` noches de los próximos ``count`` huecos desde ``after``.
+
+        Ver ``free_ranges``; ``exclude_id`` ignora una reserva (la que se está editando).
+        """
+        lo = bisect_left(self._starts, after.toordinal() - self._max_span)
+        intervals = ((self._starts[i], self._ends[i]) for i in range(lo, len(self._starts)) if self._ids[i] != exclude_id)
+        return free_ranges(intervals, after, nights, count)
+
+
+def free_ranges(intervals: Iterable[Tuple[int, int]], after: date, nights: int, count: int = 3) -> List[Tuple[date, date]]:
+    """Primer rango libre de ``nights`` noches de cada uno de los próximos ``count`` huecos desde ``after``.
+
+    ``intervals`` son los ``[inicio, fin)`` ocupados (en ordinales) ordenados
+    por inicio, desde cualquier inicio que pueda cubrir ``after``. Se propone
+    un rango por hueco, así las opciones no se repiten dentro del mismo; el
+    hueco después de la última reserva es uno solo, por eso puede haber menos
+    de ``count`` rangos.
+    """
+    nights = max(nights, 1)
+    cursor = after.toordinal()
+    result: List[Tuple[date, date]] = []
+    pending = iter(intervals)
+    current = next(pending, None)
+    while len(result) < count:
+        if current is not None and current[0] < cursor + nights:
+            # el intervalo bloquea el candidato actual (o ya terminó)
+            cursor = max(cursor, current[1])
+            current = next(pending, None)
+            continue
+        result.append((date.fromordinal(cursor), date.fromordinal(cursor + nights)))
+        if current is None:
+            break  # después de la última reserva todo está libre: un solo hueco
+        # saltar al siguiente hueco: pasar el próximo intervalo ocupado
+        cursor = current[1]
+        current = next(pending, None)
+    return result
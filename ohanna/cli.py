@@ -0,0 +1,473 @@
+"""Línea de comandos del gestor de reservas (``python -m ohanna``).
+
+Uso::
+
+    python -m ohanna quote hospedaje 2025-06-13 2025-06-16 --people 5 --children 1
+    python -m ohanna --db reservas.db check hospedaje 2025-06-13 2025-06-16
+    python -m ohanna --db reservas.db month 2025 6
+    python -m ohanna --db reservas.db report 2025-01-01 2025-12-31
+    python -m ohanna --db reservas.db add hospedaje 2025-06-13 2025-06-16 --people 4 --guest "Ana Pérez"
+    python -m ohanna --db reservas.db show <id> | delete <id> | message <id> --kind porteria
+    python -m ohanna --db reservas.db guests "perez ana" --history
+    python -m ohanna --db reservas.db digest 2025-06-01 2025-06-30 --part porter
+    python -m ohanna --journal datos/ import reservas.jsonl
+    python -m ohanna --properties propiedades.json --property la-cumbre --db reservas.db month 2025 6
+    python -m ohanna --properties propiedades.json --db reservas.db properties 2025 --month 6
+    python -m ohanna --rates tarifas.json rates hospedaje
+
+El store se elige como en la app: ``--db`` (o ``OHANNA_DB``) para SQLite,
+``--journal`` (o ``OHANNA_JOURNAL``) para diario + snapshot. Con
+``--properties`` (o ``OHANNA_PROPERTIES``) los comandos trabajan sobre la
+partición y las tarifas de ``--property`` (por defecto, la primera);
+``--rates`` (o ``OHANNA_RATES``) cambia las tarifas por defecto. Solo se
+importan los módulos que usa el comando: cotizar o consultar no carga NumPy
+ni pandas, así el arranque es casi el del intérprete. Con SQLite tampoco se
+arman índices al abrir: ``check``, ``month`` y ``report`` son consultas por
+rango de fechas.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from ohanna.helpers import format_currency, format_date_key
+from ohanna.models import HOSPEDAJE, PASADIA, Booking, Guest, parse_date
+from ohanna.pricing import nightly_breakdown
+
+_KINDS = {"hospedaje": HOSPEDAJE, "pasadia": PASADIA, "pasadía": PASADIA}
+
+
+class CommandError(Exception):
+    """Error de uso que se informa en stderr con código de salida 2."""
+
+
+def _date(value: str) -> date:
+    try:
+        return parse_date(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida '{value}' (use AAAA-MM-DD)")
+
+
+def _kind(value: str) -> str:
+    try:
+        return _KINDS[value.lower()]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"tipo inválido '{value}' (hospedaje o pasadia)")
+
+
+def _properties(args):
+    from ohanna.properties import load_properties
+
+    try:
+        return load_properties(args.properties, args.rates)
+    except (OSError, ValueError) as e:
+        raise CommandError(f"no se pudieron leer las propiedades o las tarifas: {e}")
+
+
+def _property(args):
+    """Propiedad elegida con ``--property``; por defecto, la primera."""
+    properties = _properties(args)
+    if args.property is None:
+        return properties[0]
+    for prop in properties:
+        if prop.id == args.property:
+            return prop
+    raise CommandError(f"propiedad desconocida '{args.property}' (hay: {', '.join(p.id for p in properties)})")
+
+
+def _require_store(args) -> None:
+    if not (args.db or args.journal):
+        raise CommandError("indique --db o --journal (o las variables OHANNA_DB / OHANNA_JOURNAL)")
+
+
+def _store(args):
+    """Abre la partición de la propiedad elegida; los comandos con datos necesitan un store persistente."""
+    _require_store(args)
+    from ohanna.properties import partition_location
+    from ohanna.storage import open_store
+
+    prop, primary = _property(args), _properties(args)[0]
+    return open_store(
+        partition_location(args.db, prop.id, prop.id == primary.id),
+        partition_location(args.journal, prop.id, prop.id == primary.id),
+    )
+
+
+def _close(store) -> None:
+    close = getattr(store, "close", None)
+    if close:
+        close()
+
+
+def _occupied_end(kind: str, start: date, end: Optional[date]) -> date:
+    if kind == PASADIA:
+        return start + timedelta(days=1)
+    if end is None or end <= start:
+        raise CommandError("un hospedaje necesita fecha de salida posterior al ingreso")
+    return end
+
+
+def _describe(booking: Booking) -> str:
+    return f"{booking.guest_name or booking.type} ({format_date_key(booking.start_date)} a {format_date_key(booking.end_date)})"
+
+
+def _print_json(data) -> None:
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+# -- comandos ------------------------------------------------------------
+
+def cmd_quote(args) -> int:
+    end = _occupied_end(args.kind, args.start, args.end)
+    nights = nightly_breakdown(args.kind, args.people, args.children, args.start, end, args.holiday, _property(args).rates)
+    total = sum(price for _, price in nights)
+    if args.json:
+        _print_json({"total": total, "noches": [{"fecha": d.isoformat(), "precio": p} for d, p in nights]})
+        return 0
+    for d, price in nights:
+        print(f"{format_date_key(d)}  {format_currency(price):>12}")
+    print(f"Total: {format_currency(total)}")
+    return 0
+
+
+def cmd_check(args) -> int:
+    end = _occupied_end(args.kind, args.start, args.end)
+    store = _store(args)
+    try:
+        conflicts = store.conflicts(args.start, end, exclude_id=args.exclude)
+        if not conflicts:
+            print("Disponible")
+            return 0
+        print("Ocupado por: " + ", ".join(_describe(store.get(i)) for i in conflicts))
+        options = store.next_free_ranges(args.start, (end - args.start).days, count=3, exclude_id=args.exclude)
+        print("Próximas fechas libres: " + ", ".join(f"{format_date_key(a)} a {format_date_key(b)}" for a, b in options))
+        return 1
+    finally:
+        _close(store)
+
+
+def cmd_month(args) -> int:
+    store = _store(args)
+    try:
+        bookings = store.bookings_for_month(args.year, args.month)
+        stats = store.month_stats(args.year, args.month)
+        if args.json:
+            _print_json([b.to_dict() for b in bookings])
+            return 0
+        for b in bookings:
+            print(f"{format_date_key(b.start_date)}  {format_date_key(b.end_date)}  {b.type:<9}  "
+                  f"{(b.guest_name or '-')[:30]:<30}  {format_currency(b.final_total):>12}  saldo {format_currency(b.balance)}  [{b.id}]")
+        print(f"Reservas: {stats.bookings}  Hospedajes: {stats.hospedajes}  Pasadías: {stats.pasadias}  "
+              f"Días ocupados: {stats.occupied_days}  Ingresos: {format_currency(stats.revenue)}  "
+              f"Saldos: {format_currency(stats.balance)}  Aseo pendiente: {format_currency(stats.cleaning_balance)}")
+        return 0
+    finally:
+        _close(store)
+
+
+def cmd_report(args) -> int:
+    store = _store(args)
+    try:
+        totals = store.payment_totals(args.first, args.last)
+        if args.json:
+            _print_json(totals)
+            return 0
+        for method, amount in sorted(totals.items(), key=lambda x: x[1], reverse=True):
+            print(f"{method:<20} {format_currency(amount):>14}")
+        print(f"{'Total':<20} {format_currency(sum(totals.values())):>14}")
+        return 0
+    finally:
+        _close(store)
+
+
+def cmd_show(args) -> int:
+    store = _store(args)
+    try:
+        booking = store.get(args.id)
+        if booking is None:
+            raise CommandError(f"no existe la reserva {args.id}")
+        _print_json(booking.to_dict())
+        return 0
+    finally:
+        _close(store)
+
+
+def cmd_message(args) -> int:
+    from ohanna.messages import MESSAGES
+
+    store = _store(args)
+    try:
+        booking = store.get(args.id)
+        if booking is None:
+            raise CommandError(f"no existe la reserva {args.id}")
+        print(MESSAGES[args.kind](booking, _property(args).name))
+        return 0
+    finally:
+        _close(store)
+
+
+def cmd_guests(args) -> int:
+    store = _store(args)
+    try:
+        records = store.search_guests(args.query, limit=args.limit)
+        if args.json:
+            _print_json([
+                {"nombre": r.name, "documento": r.document, "estadias": r.visits, "total": r.total_spent,
+                 "saldo": r.balance, "reservas": [s.booking_id for s in r.history()]}
+                for r in records
+            ])
+            return 0
+        for r in records:
+            last = format_date_key(r.last_visit) if r.last_visit else "-"
+            print(f"{(r.name or '-')[:30]:<30}  {r.document or '-':<14}  {r.visits:>3} estadías  última {last}  "
+                  f"total {format_currency(r.total_spent)}  saldo {format_currency(r.balance)}")
+            if args.history:
+                for s in r.history():
+                    print(f"    {format_date_key(s.start_date)}  {format_date_key(s.end_date)}  {s.type:<9}  "
+                          f"{format_currency(s.total):>12}  saldo {format_currency(s.balance)}  [{s.booking_id}]")
+        return 0 if records else 1
+    finally:
+        _close(store)
+
+
+def cmd_digest(args) -> int:
+    from ohanna import digest
+
+    chalet = _property(args).name
+    store = _store(args)
+    try:
+        if args.part == "all":
+            print(digest.render_digest(store, args.first, args.last, chalet))
+        elif args.part == "arrivals":
+            print("\n\n".join(digest.arrival_messages(digest.daily_digest(store, args.first, args.last), chalet)))
+        elif args.part == "porter":
+            print(digest.porter_list(digest.daily_digest(store, args.first, args.last), args.first, args.last, chalet))
+        else:
+            print("\n".join(digest.turnover_lines(digest.turnovers(store, args.first, args.last))))
+        return 0
+    finally:
+        _close(store)
+
+
+def cmd_add(args) -> int:
+    from ohanna.availability import BookingConflictError
+
+    end = args.start if args.kind == PASADIA else _occupied_end(args.kind, args.start, args.end)
+    rates = _property(args).rates
+    total = sum(price for _, price in nightly_breakdown(args.kind, args.people, args.children, args.start, end, args.holiday, rates))
+    booking = Booking(
+        id=str(datetime.now().timestamp()),
+        start_date=args.start,
+        end_date=end,
+        type=args.kind,
+        num_people=args.people,
+        num_children=args.children,
+        guests=[Guest(name=args.guest, document=args.document)] if args.guest else [],
+        total_price=total,
+        discount=args.discount,
+        deposit=0,
+        balance=total - args.discount,
+        expenses=[],
+        payments=[],
+        cleaning_total=0,
+        cleaning_deposit=0,
+        cleaning_balance=0,
+        payment_method="Efectivo",
+        schedule=args.schedule if args.kind == PASADIA else "9:00 AM - 5:30 PM",
+        is_holiday=args.holiday,
+    )
+    store = _store(args)
+    try:
+        try:
+            store.save(booking)
+        except BookingConflictError as e:
+            print("No se guardó: las fechas se cruzan con " + ", ".join(_describe(store.get(i)) for i in e.conflicts),
+                  file=sys.stderr)
+            return 1
+        print(booking.id)
+        return 0
+    finally:
+        _close(store)
+
+
+def cmd_delete(args) -> int:
+    store = _store(args)
+    try:
+        if store.get(args.id) is None:
+            raise CommandError(f"no existe la reserva {args.id}")
+        store.delete(args.id)
+        return 0
+    finally:
+        _close(store)
+
+
+def cmd_import(args) -> int:
+    from ohanna.importer import import_bookings
+
+    store = _store(args)
+    try:
+        report = import_bookings(store, args.file, fmt=args.format, check_conflicts=not args.no_check,
+                                 rates=_property(args).rates)
+    finally:
+        _close(store)
+    print(f"Cargadas: {report.loaded}  Con errores: {report.failed}")
+    for error in report.errors:
+        print(f"línea {error.line}: {error.message}", file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+def cmd_properties(args) -> int:
+    from ohanna.aggregates import combine
+    from ohanna.helpers import get_days_in_month
+    from ohanna.properties import open_partitions
+
+    _require_store(args)
+    properties = _properties(args)
+    months = [(args.year, args.month)] if args.month else [(args.year, m) for m in range(1, 13)]
+    days = sum(len(get_days_in_month(year, month)) for year, month in months)
+    partitions = open_partitions(properties, args.db, args.journal)
+    try:
+        rollup = partitions.rollup(months)
+    finally:
+        partitions.close()
+    # (nombre, estadísticas, días disponibles); el total suma la capacidad de todas
+    rows = [(p.name, rollup[p.id], days) for p in properties]
+    if len(properties) > 1:
+        rows.append(("Total", combine(rollup.values()), days * len(properties)))
+    if args.json:
+        data = []
+        for name, s, available in rows:
+            item = {"propiedad": name, "dias_ocupados": s.occupied_days, "ocupacion": s.occupied_days / available,
+                    "ingresos": s.revenue}
+            if args.month:  # reservas y saldos cuentan en cada mes que toca la reserva: solo por mes
+                item.update(reservas=s.bookings, saldo=s.balance, aseo_pendiente=s.cleaning_balance)
+            data.append(item)
+        _print_json(data)
+        return 0
+    for name, s, available in rows:
+        line = f"{name[:30]:<30}  {s.occupied_days:>4} días  {s.occupied_days / available:>6.1%}  ingresos {format_currency(s.revenue):>14}"
+        if args.month:
+            line += f"  {s.bookings:>4} reservas  saldo {format_currency(s.balance)}"
+        print(line)
+    return 0
+
+
+def cmd_rates(args) -> int:
+    rates = _property(args).rates
+    if args.json:
+        _print_json(rates.config)
+        return 0
+    for row in rates.describe(args.kind):
+        base = " ".join(format_currency(v) for v in row["base"])
+        print(f"{row['temporada'][:24]:<24}  {row['tipo']:<10}  base {base}  "
+              f"adicional {format_currency(row['adicional'])}  niño {format_currency(row['niño'])}")
+    return 0
+
+
+# -- argumentos ----------------------------------------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m ohanna", description="Gestor de reservas del Chalet Ohanna Bay")
+    parser.add_argument("--db", default=os.environ.get("OHANNA_DB"), help="archivo SQLite (o OHANNA_DB)")
+    parser.add_argument("--journal", default=os.environ.get("OHANNA_JOURNAL"), help="carpeta del diario (o OHANNA_JOURNAL)")
+    parser.add_argument("--properties", default=os.environ.get("OHANNA_PROPERTIES"),
+                        help="JSON con las propiedades y sus tarifas (o OHANNA_PROPERTIES)")
+    parser.add_argument("--property", help="id de la propiedad (por defecto, la primera)")
+    parser.add_argument("--rates", default=os.environ.get("OHANNA_RATES"),
+                        help="JSON de tarifas por defecto (o OHANNA_RATES)")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMANDO")
+
+    def stay_arguments(sub, people: bool = True) -> None:
+        sub.add_argument("kind", type=_kind, metavar="TIPO", help="hospedaje o pasadia")
+        sub.add_argument("start", type=_date, metavar="INGRESO")
+        sub.add_argument("end", type=_date, nargs="?", metavar="SALIDA", help="no aplica a Pasadía")
+        if people:
+            sub.add_argument("--people", type=int, default=2, help="personas (adultos)")
+            sub.add_argument("--children", type=int, default=0, help="niños")
+            sub.add_argument("--holiday", action="store_true", help="fuerza tarifa festiva")
+
+    sub = commands.add_parser("quote", help="cotiza una estadía o un pasadía")
+    stay_arguments(sub)
+    sub.add_argument("--json", action="store_true")
+    sub.set_defaults(run=cmd_quote)
+
+    sub = commands.add_parser("check", help="revisa disponibilidad y sugiere fechas libres")
+    stay_arguments(sub, people=False)
+    sub.add_argument("--exclude", help="id de una reserva a ignorar (al moverla)")
+    sub.set_defaults(run=cmd_check)
+
+    sub = commands.add_parser("month", help="reservas y estadísticas de un mes")
+    sub.add_argument("year", type=int)
+    sub.add_argument("month", type=int, choices=range(1, 13), metavar="MES")
+    sub.add_argument("--json", action="store_true")
+    sub.set_defaults(run=cmd_month)
+
+    sub = commands.add_parser("report", help="recaudación por método de pago en un rango")
+    sub.add_argument("first", type=_date, metavar="DESDE")
+    sub.add_argument("last", type=_date, metavar="HASTA")
+    sub.add_argument("--json", action="store_true")
+    sub.set_defaults(run=cmd_report)
+
+    sub = commands.add_parser("show", help="muestra una reserva en JSON")
+    sub.add_argument("id")
+    sub.set_defaults(run=cmd_show)
+
+    sub = commands.add_parser("message", help="mensaje para compartir una reserva")
+    sub.add_argument("id")
+    sub.add_argument("--kind", choices=["monica", "porteria", "admin", "json"], default="monica")
+    sub.set_defaults(run=cmd_message)
+
+    sub = commands.add_parser("guests", help="busca huéspedes por nombre o documento (prefijo, sin tildes)")
+    sub.add_argument("query", metavar="BÚSQUEDA")
+    sub.add_argument("--limit", type=int, default=20)
+    sub.add_argument("--history", action="store_true", help="muestra las estadías de cada huésped")
+    sub.add_argument("--json", action="store_true")
+    sub.set_defaults(run=cmd_guests)
+
+    sub = commands.add_parser("digest", help="llegadas, salidas, portería y aseo de un rango")
+    sub.add_argument("first", type=_date, metavar="DESDE")
+    sub.add_argument("last", type=_date, metavar="HASTA")
+    sub.add_argument("--part", choices=["all", "arrivals", "porter", "cleaning"], default="all")
+    sub.set_defaults(run=cmd_digest)
+
+    sub = commands.add_parser("add", help="crea una reserva con el precio de las tarifas")
+    stay_arguments(sub)
+    sub.add_argument("--guest", default="", help="nombre del huésped principal")
+    sub.add_argument("--document", default="", help="documento del huésped principal")
+    sub.add_argument("--discount", type=int, default=0)
+    sub.add_argument("--schedule", default="9:00 AM - 5:30 PM", choices=["9:00 AM - 5:30 PM", "2:00 PM - 10:30 PM"],
+                     help="horario del Pasadía")
+    sub.set_defaults(run=cmd_add)
+
+    sub = commands.add_parser("delete", help="elimina una reserva")
+    sub.add_argument("id")
+    sub.set_defaults(run=cmd_delete)
+
+    sub = commands.add_parser("import", help="importa reservas de un JSONL o CSV")
+    sub.add_argument("file")
+    sub.add_argument("--format", choices=["jsonl", "csv"])
+    sub.add_argument("--no-check", action="store_true", help="no rechazar filas que se cruzan")
+    sub.set_defaults(run=cmd_import)
+
+    sub = commands.add_parser("properties", help="ocupación e ingresos de todas las propiedades")
+    sub.add_argument("year", type=int)
+    sub.add_argument("--month", type=int, choices=range(1, 13), metavar="MES")
+    sub.add_argument("--json", action="store_true")
+    sub.set_defaults(run=cmd_properties)
+
+    sub = commands.add_parser("rates", help="tabla de tarifas compilada de la propiedad")
+    sub.add_argument("kind", type=_kind, nargs="?", default=HOSPEDAJE, metavar="TIPO", help="hospedaje o pasadia")
+    sub.add_argument("--json", action="store_true", help="configuración completa (con los valores por defecto)")
+    sub.set_defaults(run=cmd_rates)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.run(args)
+    except CommandError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
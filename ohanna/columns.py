@@ -0,0 +1,32 @@
+"""Columnas paralelas ordenadas por la primera (libro de pagos y disponibilidad)."""
+from bisect import bisect_right
+from operator import itemgetter
+from typing import Iterable, List, Sequence, Tuple
+
+# desde este tamaño de lote conviene mezclar en vez de insertar una a una
+BULK_MIN = 64
+
+
+def merge_rows(columns: Sequence[List], rows: Iterable[Tuple]) -> List[List]:
+    """Mezcla ``rows`` en ``columns`` y retorna las columnas nuevas.
+
+    Cada fila nueva queda después de las existentes con la misma clave, igual
+    que al insertar con ``bisect_right`` una por una, pero las columnas se
+    copian por tramos en lugar de desplazarse en cada inserción.
+    """
+    rows = sorted(rows, key=itemgetter(0))  # estable
+    keys = columns[0]
+    if not keys:
+        # columnas vacías (índice recién creado): basta transponer el lote ordenado
+        return [list(column) for column in zip(*rows)] if rows else [[] for _ in columns]
+    merged: List[List] = [[] for _ in columns]
+    prev = 0
+    for row in rows:
+        pos = bisect_right(keys, row[0], prev)
+        for column, out, value in zip(columns, merged, row):
+            out.extend(column[prev:pos])
+            out.append(value)
+        prev = pos
+    for column, out in zip(columns, merged):
+        out.extend(column[prev:])
+    return merged
@@ -0,0 +1,138 @@
+"""Resumen de operación por rango de fechas: llegadas, salidas, portería y aseo.
+
+Lo que la app genera reserva por reserva desde el modal, aquí sale para
+todo un rango en una pasada: se leen una sola vez las reservas del rango
+(``store.bookings_between``, indexado por fecha) y se agrupan por día de
+llegada y de salida. Las plantillas se preparan al importar el módulo
+(``str.format`` ya ligado) y los mensajes por reserva son los de
+``ohanna.messages``, así el texto es idéntico al del modal (``chalet`` es el
+nombre de la propiedad en los encabezados).
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from ohanna.helpers import format_currency, format_date_key
+from ohanna.messages import CHALET_NAME, monica_message
+from ohanna.models import HOSPEDAJE, Booking
+
+# días hacia adelante en que se busca la próxima llegada después de una salida
+TURNOVER_LOOKAHEAD = 60
+
+_DAY_HEADER = "📆 *{day}* — {arrivals} llegada(s), {departures} salida(s)".format
+_DEPARTURE = "🚪 *Salida:* {guest} ({type}) · {time} · 💰 Saldo: {balance} · 🧹 Aseo pendiente: {cleaning}".format
+_PORTER_HEADER = "👮 *AUTORIZACIÓN PORTERÍA* 👮\n--------------------------------\n🏠 *{chalet}*\n📅 *Del {first} al {last}*".format
+_PORTER_BOOKING = "\n📅 *{start} al {end}* ({type})\n{guests}".format
+_PORTER_GUEST = "• {name} - {document}".format
+_PORTER_FOOTER = "--------------------------------"
+_TURNOVER = "{day}  {time:<8}  sale {departing:<28}  entra {arriving:<40}  aseo pendiente {cleaning}".format
+
+
+@dataclass(slots=True)
+class DayDigest:
+    """Movimientos de un día."""
+    day: date
+    arrivals: List[Booking] = field(default_factory=list)
+    departures: List[Booking] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Turnover:
+    """Aseo entre una salida y la próxima llegada."""
+    day: date
+    departing: Booking
+    next_arrival: Optional[Booking]
+
+    @property
+    def same_day(self) -> bool:
+        """La próxima llegada es el mismo día de la salida (aseo con poco margen)."""
+        return self.next_arrival is not None and self.next_arrival.start_date == self.day
+
+    @property
+    def cleaning_balance(self) -> int:
+        return self.departing.cleaning_balance
+
+
+def _checkout_time(booking: Booking) -> str:
+    if booking.type == HOSPEDAJE:
+        return "1:00 PM"
+    return (booking.schedule or "9:00 AM - 5:30 PM").split("-")[-1].strip()
+
+
+def daily_digest(store, first: date, last: date) -> List[DayDigest]:
+    """Días de ``[first, last]`` con llegadas o salidas, en orden."""
+    days: Dict[date, DayDigest] = {}
+    for b in sorted(store.bookings_between(first, last), key=lambda b: (b.start_date, b.end_date)):
+        if first <= b.start_date <= last:
+            days.setdefault(b.start_date, DayDigest(b.start_date)).arrivals.append(b)
+        if first <= b.end_date <= last:
+            days.setdefault(b.end_date, DayDigest(b.end_date)).departures.append(b)
+    return [days[day] for day in sorted(days)]
+
+
+def turnovers(store, first: date, last: date) -> List[Turnover]:
+    """Salidas de ``[first, last]`` con la llegada siguiente y el aseo pendiente."""
+    upcoming = sorted(
+        store.bookings_between(first, last + timedelta(days=TURNOVER_LOOKAHEAD)),
+        key=lambda b: (b.start_date, b.end_date),
+    )
+    result: List[Turnover] = []
+    arrival = 0
+    for b in sorted(upcoming, key=lambda b: (b.end_date, b.start_date)):
+        if not first <= b.end_date <= last:
+            continue
+        # las salidas van en orden: el puntero de llegadas solo avanza
+        while arrival < len(upcoming) and upcoming[arrival].start_date < b.end_date:
+            arrival += 1
+        following = next((n for n in upcoming[arrival:arrival + 3] if n.id != b.id), None)
+        result.append(Turnover(b.end_date, b, following))
+    return result
+
+
+def arrival_messages(digest: List[DayDigest], chalet: str = CHALET_NAME) -> Iterator[str]:
+    """Por día: encabezado, el mensaje de cada llegada y una línea por salida."""
+    for day in digest:
+        yield _DAY_HEADER(day=format_date_key(day.day), arrivals=len(day.arrivals), departures=len(day.departures))
+        for b in day.arrivals:
+            yield monica_message(b, chalet)
+        for b in day.departures:
+            yield _DEPARTURE(
+                guest=b.guest_name or "Sin nombre", type=b.type, time=_checkout_time(b),
+                balance=format_currency(b.balance), cleaning=format_currency(b.cleaning_balance),
+            )
+
+
+def porter_list(digest: List[DayDigest], first: date, last: date, chalet: str = CHALET_NAME) -> str:
+    """Una sola autorización de portería con los huéspedes de todas las llegadas."""
+    parts = [_PORTER_HEADER(chalet=chalet, first=format_date_key(first), last=format_date_key(last))]
+    for day in digest:
+        for b in day.arrivals:
+            guests = "\n".join(_PORTER_GUEST(name=g.name, document=g.document) for g in b.guests if g.name) or "No registrados"
+            parts.append(_PORTER_BOOKING(start=format_date_key(b.start_date), end=format_date_key(b.end_date), type=b.type, guests=guests))
+    parts.append(_PORTER_FOOTER)
+    return "\n".join(parts)
+
+
+def turnover_lines(items: List[Turnover]) -> Iterator[str]:
+    """Agenda de aseo en texto, una línea por salida."""
+    for t in items:
+        arriving = "sin llegada próxima"
+        if t.next_arrival is not None:
+            when = "hoy" if t.same_day else format_date_key(t.next_arrival.start_date)
+            arriving = f"{when} {t.next_arrival.guest_name or t.next_arrival.type}"
+        yield _TURNOVER(
+            day=format_date_key(t.day), time=_checkout_time(t.departing),
+            departing=(t.departing.guest_name or t.departing.type)[:28], arriving=arriving[:40],
+            cleaning=format_currency(t.cleaning_balance),
+        )
+
+
+def render_digest(store, first: date, last: date, chalet: str = CHALET_NAME) -> str:
+    """Documento completo: llegadas y salidas, portería y agenda de aseo."""
+    digest = daily_digest(store, first, last)
+    sections = ["\n\n".join(arrival_messages(digest, chalet)) or "Sin llegadas ni salidas.", porter_list(digest, first, last, chalet)]
+    schedule = turnovers(store, first, last)
+    pending = sum(t.cleaning_balance for t in schedule)
+    sections.append("🧹 *AGENDA DE ASEO*\n" + ("\n".join(turnover_lines(schedule)) or "Sin salidas.")
+                    + f"\nAseo pendiente total: {format_currency(pending)}")
+    return "\n\n".join(sections)
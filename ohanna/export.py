@@ -0,0 +1,355 @@
+"""Exportación masiva de reservas a CSV, Parquet e iCalendar.
+
+Todas las exportaciones son generadores de trozos (``str`` o ``bytes``): las
+reservas se leen del store mes a mes con ``iter_bookings`` y se escriben a
+medida que llegan, sin armar el archivo completo en memoria. ``spool``
+junta un generador en un ``BytesIO`` (o en un temporal en disco si es grande)
+para ``st.download_button``.
+
+El CSV usa las mismas columnas que acepta ``ohanna.importer``. El Parquet
+guarda huéspedes, pagos y gastos como listas de structs, para analizarlos
+directamente con pandas/pyarrow. ``IcsFeed`` mantiene el ``.ics`` del
+calendario público y solo regenera los meses cuya ``month_version`` cambió.
+"""
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import date, datetime, timezone
+from typing import IO, Dict, Iterable, Iterator, List, Tuple
+
+from ohanna.aggregates import MonthKey
+from ohanna.messages import CHALET_NAME
+from ohanna.models import Booking
+from ohanna.storage import month_bounds
+
+CSV_COLUMNS = [
+    "id", "startDate", "endDate", "type", "numPeople", "numChildren", "guests",
+    "totalPrice", "discount", "deposit", "balance", "expenses", "payments",
+    "paymentMethod", "schedule", "isHoliday", "cleaningTotal", "cleaningDeposit",
+    "cleaningBalance",
+]
+_JSON_COLUMNS = ("guests", "expenses", "payments")
+
+
+def iter_months(first: date, last: date) -> Iterator[MonthKey]:
+    """Los (año, mes) entre ``first`` y ``last`` inclusive."""
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def iter_bookings(store, first: date, last: date) -> Iterator[Booking]:
+    """Reservas que tocan ``[first, last]``, leídas del store mes a mes.
+
+    Cada reserva sale una sola vez: en el mes de ``max(inicio, first)``.
+    """
+    for year, month in iter_months(first, last):
+        yield from _month_bookings(store, year, month, first, last)
+
+
+def _month_bookings(store, year: int, month: int, first: date, last: date) -> Iterator[Booking]:
+    """Las reservas de ``iter_bookings`` que le tocan al mes indicado."""
+    month_first, month_last = month_bounds(year, month)
+    month_first, month_last = max(month_first, first), min(month_last, last)
+    for b in store.bookings_between(month_first, month_last):
+        if month_first <= max(b.start_date, first) <= month_last:
+            yield b
+
+
+def csv_chunks(bookings: Iterable[Booking], rows_per_chunk: int = 1000) -> Iterator[str]:
+    """CSV con encabezado, en trozos de ``rows_per_chunk`` filas."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    pending = 0
+    for b in bookings:
+        data = b.to_dict()
+        for key in _JSON_COLUMNS:
+            if key in data:  # los campos ausentes quedan como celda vacía (ver ``Booking.absent``)
+                data[key] = json.dumps(data[key], ensure_ascii=False)
+        writer.writerow([data.get(key, "") for key in CSV_COLUMNS])
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Archivo de solo escritura que guarda lo escrito hasta que se retira."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("id", pa.string()),
+        ("startDate", pa.date32()),
+        ("endDate", pa.date32()),
+        ("type", pa.string()),
+        ("numPeople", pa.int32()),
+        ("numChildren", pa.int32()),
+        ("nights", pa.int32()),
+        ("guests", pa.list_(pa.struct([("name", pa.string()), ("document", pa.string())]))),
+        ("totalPrice", pa.int64()),
+        ("discount", pa.int64()),
+        ("finalTotal", pa.int64()),
+        ("deposit", pa.int64()),
+        ("balance", pa.int64()),
+        ("expenses", pa.list_(pa.struct([("id", pa.string()), ("description", pa.string()), ("amount", pa.int64())]))),
+        ("payments", pa.list_(pa.struct([
+            ("id", pa.string()), ("amount", pa.int64()), ("method", pa.string()), ("date", pa.date32()),
+        ]))),
+        ("paymentMethod", pa.string()),
+        ("schedule", pa.string()),
+        ("isHoliday", pa.bool_()),
+        ("cleaningTotal", pa.int64()),
+        ("cleaningDeposit", pa.int64()),
+        ("cleaningBalance", pa.int64()),
+        ("extra", pa.string()),  # JSON
+    ])
+
+
+def _parquet_columns(bookings: List[Booking]) -> Dict[str, list]:
+    return {
+        "id": [b.id for b in bookings],
+        "startDate": [b.start_date for b in bookings],
+        "endDate": [b.end_date for b in bookings],
+        "type": [b.type for b in bookings],
+        "numPeople": [b.num_people for b in bookings],
+        "numChildren": [b.num_children for b in bookings],
+        "nights": [b.nights for b in bookings],
+        "guests": [[{"name": g.name, "document": g.document} for g in b.guests] for b in bookings],
+        "totalPrice": [b.total_price for b in bookings],
+        "discount": [b.discount for b in bookings],
+        "finalTotal": [b.final_total for b in bookings],
+        "deposit": [b.deposit for b in bookings],
+        "balance": [b.balance for b in bookings],
+        "expenses": [[{"id": e.id, "description": e.description, "amount": e.amount} for e in b.expenses] for b in bookings],
+        "payments": [
+            [{"id": p.id, "amount": p.amount, "method": p.method, "date": p.date} for p in b.payments]
+            for b in bookings
+        ],
+        "paymentMethod": [b.payment_method for b in bookings],
+        "schedule": [b.schedule for b in bookings],
+        "isHoliday": [b.is_holiday for b in bookings],
+        "cleaningTotal": [b.cleaning_total for b in bookings],
+        "cleaningDeposit": [b.cleaning_deposit for b in bookings],
+        "cleaningBalance": [b.cleaning_balance for b in bookings],
+        "extra": [json.dumps(b.extra, ensure_ascii=False) if b.extra else None for b in bookings],
+    }
+
+
+def parquet_chunks(bookings: Iterable[Booking], rows_per_group: int = 10000) -> Iterator[bytes]:
+    """Parquet con un row group cada ``rows_per_group`` reservas (requiere pyarrow)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema()
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        batch: List[Booking] = []
+        for b in bookings:
+            batch.append(b)
+            if len(batch) >= rows_per_group:
+                writer.write_table(pa.Table.from_pydict(_parquet_columns(batch), schema=schema))
+                batch = []
+                yield sink.take()
+        if batch:
+            writer.write_table(pa.Table.from_pydict(_parquet_columns(batch), schema=schema))
+    yield sink.take()
+
+
+# -- iCalendar -------------------------------------------------------
+
+def _ics_text(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _ics_fold(line: str) -> str:
+    """Parte las líneas de más de 75 octetos como pide RFC 5545."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    while data:
+        size = 75 if not parts else 74  # las continuaciones empiezan con un espacio
+        while size < len(data) and (data[size] & 0xC0) == 0x80:
+            size -= 1  # no cortar un carácter UTF-8
+        parts.append(data[:size].decode("utf-8"))
+        data = data[size:]
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def ics_event(booking: Booking, stamp: str, include_guests: bool = False) -> str:
+    """VEVENT de día completo que cubre los días que ocupa la reserva.
+
+    Sin ``include_guests`` el resumen no lleva el nombre del huésped (para el
+    calendario público).
+    """
+    summary = booking.type
+    if include_guests and booking.guest_name:
+        summary = f"{booking.type} - {booking.guest_name}"
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{booking.id}@ohannabay",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;VALUE=DATE:{booking.start_date:%Y%m%d}",
+        f"DTEND;VALUE=DATE:{booking.occupied_end:%Y%m%d}",
+        f"SUMMARY:{_ics_text(summary)}",
+        "TRANSP:OPAQUE",
+        "END:VEVENT",
+    ]
+    if include_guests and booking.schedule:
+        lines.insert(-2, f"DESCRIPTION:{_ics_text(booking.schedule)}")
+    return "".join(_ics_fold(line) for line in lines)
+
+
+def ics_header(calendar_name: str = CHALET_NAME) -> str:
+    """Encabezado del calendario con el nombre de la propiedad."""
+    name = _ics_text(calendar_name)
+    return (
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        f"PRODID:-//{name}//Reservas//ES\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+        f"X-WR-CALNAME:{name}\r\n"
+        "X-WR-TIMEZONE:America/Bogota\r\n"
+    )
+
+
+ICS_HEADER = ics_header()
+ICS_FOOTER = "END:VCALENDAR\r\n"
+
+
+def _stamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def ics_chunks(bookings: Iterable[Booking], include_guests: bool = False,
+               calendar_name: str = CHALET_NAME) -> Iterator[str]:
+    """Calendario ``.ics`` completo, un evento por trozo."""
+    stamp = _stamp()
+    yield ics_header(calendar_name)
+    for b in bookings:
+        yield ics_event(b, stamp, include_guests)
+    yield ICS_FOOTER
+
+
+class IcsFeed:
+    """Calendario ``.ics`` que se regenera por meses.
+
+    Guarda los eventos de cada mes (las reservas que empiezan en él) junto
+    con la ``month_version`` del store con que se armaron; ``chunks`` solo
+    vuelve a consultar los meses cuya versión cambió. El primer mes y un
+    último mes incompleto se arman aparte con las mismas reservas que
+    ``iter_bookings``.
+    """
+
+    def __init__(self, store, include_guests: bool = False, calendar_name: str = CHALET_NAME):
+        self.store = store
+        self.include_guests = include_guests
+        self.header = ics_header(calendar_name)
+        self._months: Dict[MonthKey, Tuple[int, str]] = {}
+        self.written_version = None  # ``store.version`` del último ``write``
+
+    def month(self, year: int, month: int) -> str:
+        """Eventos del mes, desde la caché si el mes no cambió."""
+        version = self.store.month_version(year, month)
+        cached = self._months.get((year, month))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        stamp = _stamp()
+        events = "".join(
+            ics_event(b, stamp, self.include_guests)
+            for b in self.store.bookings_for_month(year, month)
+            if (b.start_date.year, b.start_date.month) == (year, month)
+        )
+        self._months[(year, month)] = (version, events)
+        return events
+
+    def chunks(self, first: date, last: date) -> Iterator[str]:
+        """El calendario con las reservas que tocan ``[first, last]`` (como ``iter_bookings``)."""
+        yield self.header
+        for year, month in iter_months(first, last):
+            if (year, month) == (first.year, first.month) or month_bounds(year, month)[1] > last:
+                # el primer mes incluye las reservas que empezaron antes de ``first``; el último puede estar cortado
+                stamp = _stamp()
+                yield "".join(ics_event(b, stamp, self.include_guests)
+                              for b in _month_bookings(self.store, year, month, first, last))
+            else:
+                yield self.month(year, month)
+        yield ICS_FOOTER
+
+    def write(self, path: str, first: date, last: date) -> None:
+        """Escribe el calendario en ``path`` (reemplazo atómico)."""
+        version = self.store.version
+        write_chunks(path, self.chunks(first, last))
+        self.written_version = version
+
+
+def write_chunks(path: str, chunks: Iterable) -> None:
+    """Escribe un generador de trozos (str o bytes) en ``path`` de forma atómica."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+    os.replace(tmp, path)
+
+
+def spool(chunks: Iterable, max_memory: int = 8 * 1024 * 1024) -> IO[bytes]:
+    """Junta los trozos listos para leer: en memoria (``BytesIO``) hasta ``max_memory``, luego en disco.
+
+    Pasado el límite el resto va a un temporal que se reabre en solo lectura
+    (``BufferedReader``), uno de los tipos que acepta ``st.download_button``.
+    """
+    chunks = iter(chunks)
+    buffer = io.BytesIO()
+    for chunk in chunks:
+        buffer.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+        if buffer.tell() > max_memory:
+            return _spill(buffer, chunks)
+    buffer.seek(0)
+    return buffer
+
+
+def _spill(buffer: io.BytesIO, chunks: Iterator) -> IO[bytes]:
+    fd, path = tempfile.mkstemp(prefix="ohanna-", suffix=".export")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buffer.getbuffer())
+            buffer.close()
+            for chunk in chunks:
+                f.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+        reader = open(path, "rb")
+    finally:
+        try:
+            os.unlink(path)  # el archivo abierto sigue legible; en Windows queda en el temporal
+        except OSError:
+            pass
+    return reader
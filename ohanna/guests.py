@@ -0,0 +1,214 @@
+"""Directorio de huéspedes con búsqueda por prefijo.
+
+Los huéspedes solo existen dentro de ``Booking.guests``; el directorio los
+agrupa por persona (documento, o nombre normalizado si no hay documento) y
+guarda sus estadías. Para autocompletar se mantiene una lista ordenada de
+términos (nombre completo, el nombre desde cada palabra y el documento), sin
+tildes ni mayúsculas: buscar un prefijo son dos búsquedas binarias y un
+recorrido solo de las coincidencias.
+
+Igual que ``aggregates``, ``ledger`` y ``availability``, el store lo
+actualiza en cada save/delete.
+"""
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from ohanna.columns import BULK_MIN, merge_rows
+from ohanna.models import Booking, Guest
+
+
+@lru_cache(maxsize=65536)
+def _fold(word: str) -> str:
+    if word.isascii():
+        return word.casefold()
+    decomposed = unicodedata.normalize("NFKD", word)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sin tildes y con espacios simples: "  José  Ñáñez" -> "jose nanez"."""
+    # los nombres y apellidos se repiten mucho: se normaliza (y se cachea) palabra por palabra
+    return " ".join(_fold(word) for word in text.split())
+
+
+def normalize_document(document: str) -> str:
+    """Solo letras y dígitos, en minúsculas: "1.020.304-5" -> "10203045"."""
+    if document.isalnum():
+        return document.casefold()
+    return "".join(ch for ch in document if ch.isalnum()).casefold()
+
+
+def guest_key(guest: Guest) -> Optional[str]:
+    """Identidad del huésped en el directorio; None si no tiene nombre ni documento."""
+    document = normalize_document(guest.document)
+    if document:
+        return "doc:" + document
+    name = normalize(guest.name)
+    return "nombre:" + name if name else None
+
+
+@dataclass(slots=True)
+class GuestStay:
+    """Una reserva en la que aparece el huésped."""
+    booking_id: str
+    start_date: date
+    end_date: date
+    type: str
+    name: str  # como quedó escrito en esa reserva
+    payer: bool  # huésped principal: a él se le cuentan total y saldo
+    total: int
+    balance: int
+
+
+@dataclass(slots=True)
+class GuestRecord:
+    """Un huésped del directorio con su historial."""
+    key: str
+    document: str = ""
+    stays: Dict[str, GuestStay] = field(default_factory=dict)
+    terms: FrozenSet[str] = frozenset()
+
+    @property
+    def name(self) -> str:
+        """Nombre de la estadía más reciente."""
+        return max(self.stays.values(), key=lambda s: s.start_date).name if self.stays else ""
+
+    @property
+    def visits(self) -> int:
+        return len(self.stays)
+
+    @property
+    def last_visit(self) -> Optional[date]:
+        return max((s.start_date for s in self.stays.values()), default=None)
+
+    @property
+    def total_spent(self) -> int:
+        """Suma del total con descuento de las reservas en que fue huésped principal."""
+        return sum(s.total for s in self.stays.values() if s.payer)
+
+    @property
+    def balance(self) -> int:
+        """Saldo por cobrar de las reservas en que fue huésped principal."""
+        return sum(s.balance for s in self.stays.values() if s.payer)
+
+    def history(self) -> List[GuestStay]:
+        """Estadías de la más reciente a la más antigua."""
+        return sorted(self.stays.values(), key=lambda s: s.start_date, reverse=True)
+
+    def as_guest(self) -> Guest:
+        return Guest(name=self.name, document=self.document)
+
+
+def _terms(record: GuestRecord) -> FrozenSet[str]:
+    terms = set()
+    for name in {stay.name for stay in record.stays.values()}:
+        words = normalize(name).split()
+        # el nombre completo y desde cada palabra: "ana perez" encuentra "Ana Pérez Gómez"
+        terms.update(" ".join(words[i:]) for i in range(len(words)))
+    document = normalize_document(record.document)
+    if document:
+        terms.add(document)
+    return frozenset(terms)
+
+
+class GuestDirectory:
+    """Huéspedes por identidad, con términos de búsqueda en columnas ordenadas."""
+
+    def __init__(self, bookings: Iterable[Booking] = ()):
+        self._records: Dict[str, GuestRecord] = {}
+        self._terms: List[str] = []
+        self._keys: List[str] = []
+        self.add_many(bookings)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, key: str) -> Optional[GuestRecord]:
+        return self._records.get(key)
+
+    def find(self, guest: Guest) -> Optional[GuestRecord]:
+        """El registro del directorio que corresponde a ``guest``."""
+        key = guest_key(guest)
+        return self._records.get(key) if key else None
+
+    def search(self, query: str, limit: int = 10) -> List[GuestRecord]:
+        """Huéspedes cuyo nombre (o alguna palabra desde la que empieza) o documento empieza por ``query``."""
+        prefixes = {normalize(query), normalize_document(query)} - {""}
+        found: Dict[str, GuestRecord] = {}
+        for prefix in sorted(prefixes):
+            i = bisect_left(self._terms, prefix)
+            while i < len(self._terms) and len(found) < limit and self._terms[i].startswith(prefix):
+                found.setdefault(self._keys[i], self._records[self._keys[i]])
+                i += 1
+        return list(found.values())
+
+    # -- mantenimiento ---------------------------------------------------
+
+    def _apply(self, removed: Iterable[Booking], added: Iterable[Booking]) -> None:
+        """Quita las estadías de ``removed``, agrega las de ``added`` y actualiza solo los términos que cambian."""
+        before: Dict[str, FrozenSet[str]] = {}
+        for booking in removed:
+            for guest in booking.guests:
+                key = guest_key(guest)
+                record = self._records.get(key) if key else None
+                if record is not None:
+                    before.setdefault(key, record.terms)
+                    record.stays.pop(booking.id, None)
+        for booking in added:
+            for position, guest in enumerate(booking.guests):
+                key = guest_key(guest)
+                if key is None:
+                    continue
+                record = self._records.get(key)
+                if record is None:
+                    record = self._records[key] = GuestRecord(key)
+                before.setdefault(key, record.terms)
+                if booking.id not in record.stays:  # un huésped repetido en la misma reserva cuenta una vez
+                    if guest.document:
+                        record.document = guest.document
+                    record.stays[booking.id] = GuestStay(
+                        booking.id, booking.start_date, booking.end_date, booking.type, guest.name,
+                        position == 0, booking.final_total, booking.balance,
+                    )
+        rows: List[Tuple[str, str]] = []
+        for key, old_terms in before.items():
+            record = self._records[key]
+            if not record.stays:
+                del self._records[key]
+                record.terms = frozenset()
+            else:
+                record.terms = _terms(record)
+            for term in old_terms - record.terms:
+                i = bisect_left(self._terms, term)
+                while self._keys[i] != key:
+                    i += 1
+                del self._terms[i], self._keys[i]
+            rows.extend((term, key) for term in record.terms - old_terms)
+        if len(rows) < BULK_MIN:
+            for term, key in rows:
+                i = bisect_left(self._terms, term)
+                self._terms.insert(i, term)
+                self._keys.insert(i, key)
+        else:
+            self._terms, self._keys = merge_rows((self._terms, self._keys), rows)
+
+    def add(self, booking: Booking) -> None:
+        self._apply((), [booking])
+
+    def add_many(self, bookings: Iterable[Booking]) -> None:
+        self._apply((), bookings)
+
+    def remove(self, booking: Booking) -> None:
+        self._apply([booking], ())
+
+    def replace(self, old: Optional[Booking], new: Optional[Booking]) -> None:
+        """Aplica el cambio de ``old`` a ``new`` (cualquiera puede ser None)."""
+        self.replace_many([old] if old is not None else [], [new] if new is not None else [])
+
+    def replace_many(self, old: Iterable[Booking], new: Iterable[Booking]) -> None:
+        """Cambia muchas reservas a la vez; un huésped que sigue igual no toca la lista de términos."""
+        self._apply(old, new)
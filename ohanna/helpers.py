@@ -0,0 +1,26 @@
+"""Funciones de ayuda (portadas de utils/helpers.ts)."""
+from datetime import datetime, timedelta
+from typing import List
+
+
+def format_currency(value: int) -> str:
+    """Formatea un número como moneda COP sin decimales."""
+    return f"${value:,.0f}".replace(",", ".")
+
+def get_days_in_month(year: int, month: int) -> List[datetime.date]:
+    """Retorna una lista de objetos date para cada día del mes."""
+    first_day = datetime(year, month, 1)
+    if month == 12:
+        next_month = datetime(year+1, 1, 1)
+    else:
+        next_month = datetime(year, month+1, 1)
+    days = []
+    current = first_day
+    while current < next_month:
+        days.append(current.date())
+        current += timedelta(days=1)
+    return days
+
+def format_date_key(date: datetime.date) -> str:
+    """Convierte una fecha a string YYYY-MM-DD."""
+    return date.strftime("%Y-%m-%d")
@@ -0,0 +1,126 @@
+"""Calendario de festivos de Colombia.
+
+Incluye los festivos fijos, los trasladados al lunes siguiente (Ley 51 de
+1983, "Ley Emiliani") y los que dependen de la Pascua. Cada año se calcula
+una sola vez y queda en caché como conjunto (consultas escalares O(1)) y
+como mapa de bits por día del año (consultas vectorizadas con NumPy, que se
+importa recién al usarlas).
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, FrozenSet
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# (mes, día, nombre) que se celebran en su fecha
+_FIXED = (
+    (1, 1, "Año Nuevo"),
+    (5, 1, "Día del Trabajo"),
+    (7, 20, "Día de la Independencia"),
+    (8, 7, "Batalla de Boyacá"),
+    (12, 8, "Inmaculada Concepción"),
+    (12, 25, "Navidad"),
+)
+
+# (mes, día, nombre) que se trasladan al lunes siguiente
+_MOVABLE = (
+    (1, 6, "Reyes Magos"),
+    (3, 19, "San José"),
+    (6, 29, "San Pedro y San Pablo"),
+    (8, 15, "Asunción de la Virgen"),
+    (10, 12, "Día de la Raza"),
+    (11, 1, "Todos los Santos"),
+    (11, 11, "Independencia de Cartagena"),
+)
+
+# (días desde el domingo de Pascua, nombre, se traslada al lunes)
+_EASTER_BASED = (
+    (-3, "Jueves Santo", False),
+    (-2, "Viernes Santo", False),
+    (39, "Ascensión del Señor", True),
+    (60, "Corpus Christi", True),
+    (68, "Sagrado Corazón", True),
+)
+
+
+def easter_sunday(year: int) -> date:
+    """Domingo de Pascua (calendario gregoriano, algoritmo anónimo)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _next_monday(d: date) -> date:
+    return d + timedelta(days=(7 - d.weekday()) % 7)
+
+
+@lru_cache(maxsize=None)
+def holidays_for_year(year: int) -> Dict[date, str]:
+    """Festivos del año como mapa fecha -> nombre, ordenado por fecha.
+
+    Si dos festivos caen el mismo lunes (p. ej. San Pedro y Sagrado Corazón
+    en 2025) el nombre los junta: "San Pedro y San Pablo / Sagrado Corazón".
+    """
+    result = {date(year, m, d): name for m, d, name in _FIXED}
+
+    def add(day: date, name: str) -> None:
+        result[day] = f"{result[day]} / {name}" if day in result else name
+
+    for m, d, name in _MOVABLE:
+        add(_next_monday(date(year, m, d)), name)
+    easter = easter_sunday(year)
+    for offset, name, moves in _EASTER_BASED:
+        day = easter + timedelta(days=offset)
+        add(_next_monday(day) if moves else day, name)
+    return dict(sorted(result.items()))
+
+
+@lru_cache(maxsize=None)
+def _holiday_set(year: int) -> FrozenSet[date]:
+    return frozenset(holidays_for_year(year))
+
+
+@lru_cache(maxsize=None)
+def _holiday_bitmap(year: int) -> "np.ndarray":
+    """Arreglo booleano indexado por día del año (0 = 1 de enero)."""
+    import numpy as np
+
+    bitmap = np.zeros(366, dtype=bool)
+    for d in holidays_for_year(year):
+        bitmap[d.timetuple().tm_yday - 1] = True
+    bitmap.flags.writeable = False
+    return bitmap
+
+
+def is_holiday(d: date) -> bool:
+    """Indica si ``d`` es festivo en Colombia."""
+    return d in _holiday_set(d.year)
+
+
+def holiday_name(d: date) -> str:
+    """Nombre del festivo o cadena vacía."""
+    return holidays_for_year(d.year).get(d, "")
+
+
+def holiday_mask(dates: "np.ndarray") -> "np.ndarray":
+    """Versión vectorizada de ``is_holiday`` para un arreglo datetime64[D]."""
+    import numpy as np
+
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    years = dates.astype("datetime64[Y]")
+    day_of_year = (dates - years.astype("datetime64[D]")).astype(np.int64)
+    year_numbers = years.astype(np.int64) + 1970
+    mask = np.zeros(dates.shape, dtype=bool)
+    for year in np.unique(year_numbers):
+        selected = year_numbers == year
+        mask[selected] = _holiday_bitmap(int(year))[day_of_year[selected]]
+    return mask
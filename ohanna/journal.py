@@ -0,0 +1,181 @@
+"""Persistencia en archivos: diario de cambios más snapshot compactado.
+
+``JournalStore`` es un ``MemoryStore`` que además anota cada escritura en
+``journal.log`` (una línea por reserva guardada o eliminada). Las líneas se
+acumulan en memoria y un hilo en segundo plano las escribe por lotes con un
+solo ``fsync``, así guardar desde la app nunca espera al disco.
+
+Cada ``compact_every`` registros se escribe ``snapshot.json`` con todas las
+reservas y el diario vuelve a empezar. Al abrir se carga el snapshot y se
+reaplican solo los registros posteriores a él. Cada línea lleva su CRC32:
+las líneas truncadas o dañadas (por ejemplo tras un corte de luz) se saltan
+y se cuentan en ``skipped``.
+"""
+import atexit
+import json
+import os
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from ohanna.models import Booking
+from ohanna.storage import MemoryStore
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.log"
+
+
+def encode_record(record: Dict) -> bytes:
+    """Línea del diario: ``<crc32 hex> <json>\\n``."""
+    payload = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+
+def decode_record(line: bytes) -> Optional[Dict]:
+    """Registro de una línea del diario, o None si está truncada o dañada."""
+    if not line.endswith(b"\n"):
+        return None
+    crc, _, payload = line[:-1].partition(b" ")
+    try:
+        if int(crc, 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def load_journal(directory: str) -> Tuple[List[Booking], int, int, int]:
+    """Lee snapshot y diario de ``directory``.
+
+    Retorna (reservas, último número de secuencia, registros aplicados del
+    diario, líneas dañadas).
+    """
+    bookings: Dict[str, Dict] = {}
+    seq = 0
+    snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        seq = snapshot["seq"]
+        bookings = {d["id"]: d for d in snapshot["bookings"]}
+    applied = skipped = 0
+    journal_path = os.path.join(directory, JOURNAL_FILE)
+    if os.path.exists(journal_path):
+        with open(journal_path, "rb") as f:
+            for line in f:
+                record = decode_record(line)
+                if record is None:
+                    skipped += 1
+                    continue
+                if record["seq"] <= seq:
+                    continue  # ya incluido en el snapshot
+                seq = record["seq"]
+                applied += 1
+                if record["op"] == "put":
+                    # upsert: una reserva existente conserva su posición
+                    bookings[record["booking"]["id"]] = record["booking"]
+                else:
+                    bookings.pop(record["id"], None)
+    return [Booking.from_dict(d) for d in bookings.values()], seq, applied, skipped
+
+
+class JournalStore(MemoryStore):
+    """Reservas en memoria respaldadas por un diario en ``directory``."""
+
+    def __init__(self, directory: str, compact_every: int = 5000, fsync: bool = True):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.compact_every = compact_every
+        self.fsync = fsync
+        bookings, self._seq, self._since_snapshot, self.skipped = load_journal(directory)
+        super().__init__(bookings)
+        self._pending: List[bytes] = []
+        self._pending_seq = self._flushed_seq = self._seq
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()  # solo un hilo toca los archivos a la vez
+        self._closed = False
+        self._file = open(os.path.join(directory, JOURNAL_FILE), "ab")
+        if self.skipped:
+            # reescribir limpio, para no anexar detrás de una línea dañada
+            self.compact()
+        self._thread = threading.Thread(target=self._run, name="ohanna-journal", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # -- escritura -----------------------------------------------------
+
+    def _append(self, records: List[Dict]) -> None:
+        for record in records:
+            self._seq += 1
+            record["seq"] = self._seq
+            self._pending.append(encode_record(record))
+        self._pending_seq = self._seq
+        self._cond.notify()
+
+    def _write(self, bookings: List[Booking]) -> None:
+        with self._cond:
+            super()._write(bookings)
+            self._append([{"op": "put", "booking": b.to_dict()} for b in bookings])
+
+    def _remove(self, booking_id: str) -> None:
+        with self._cond:
+            super()._remove(booking_id)
+            self._append([{"op": "del", "id": booking_id}])
+
+    # -- hilo de escritura -----------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return  # cerrado y sin nada pendiente
+                batch, self._pending = self._pending, []
+                batch_seq = self._pending_seq
+            with self._io_lock:
+                self._file.write(b"".join(batch))
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+                self._since_snapshot += len(batch)
+                needs_compaction = self._since_snapshot >= self.compact_every
+            with self._cond:
+                self._flushed_seq = max(self._flushed_seq, batch_seq)
+                self._cond.notify_all()
+            if needs_compaction:
+                self.compact()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que lo guardado hasta ahora esté en disco. False si se agotó ``timeout``."""
+        with self._cond:
+            target = self._pending_seq
+            return self._cond.wait_for(lambda: self._flushed_seq >= target, timeout)
+
+    def compact(self) -> None:
+        """Escribe un snapshot con todas las reservas y vacía el diario."""
+        with self._io_lock:
+            with self._cond:
+                bookings = list(self._bookings.values())
+                seq = self._seq
+            # los registros pendientes con seq <= snapshot se ignoran al cargar
+            snapshot = {"seq": seq, "bookings": [b.to_dict() for b in bookings]}
+            path = os.path.join(self.directory, SNAPSHOT_FILE)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            self._file.truncate(0)
+            self._file.seek(0)
+            self._since_snapshot = 0
+
+    def close(self) -> None:
+        """Escribe lo pendiente y detiene el hilo de escritura."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._file.close()
@@ -0,0 +1,127 @@
+"""Libro de pagos global, ordenado por fecha de pago.
+
+Guarda todos los abonos (``payments`` y los ``deposit`` legacy) en columnas
+paralelas ordenadas por fecha. Los totales de un rango se obtienen con dos
+búsquedas binarias y un recorrido solo de los pagos del rango, sin tocar las
+reservas.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ohanna.aggregates import payment_entries
+from ohanna.columns import BULK_MIN, merge_rows
+from ohanna.models import Booking
+
+
+class PaymentLedger:
+    """Pagos en columnas (día, monto, método, reserva) ordenadas por día."""
+
+    def __init__(self, bookings: Iterable[Booking] = ()):
+        self._days: List[int] = []  # date.toordinal()
+        self._amounts: List[int] = []
+        self._methods: List[str] = []
+        self._booking_ids: List[str] = []
+        self.add_many(bookings)
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def _insert(self, day: int, amount: int, method: str, booking_id: str) -> None:
+        i = bisect_right(self._days, day)
+        self._days.insert(i, day)
+        self._amounts.insert(i, amount)
+        self._methods.insert(i, method)
+        self._booking_ids.insert(i, booking_id)
+
+    def add(self, booking: Booking) -> None:
+        for pay_date, method, amount in payment_entries(booking):
+            self._insert(pay_date.toordinal(), amount, method, booking.id)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, int, str, str]]) -> "PaymentLedger":
+        """Libro a partir de filas (día ordinal, monto, método, id reserva) ya leídas (por ejemplo, con SQL)."""
+        ledger = cls()
+        ledger._add_rows(list(rows))
+        return ledger
+
+    def add_many(self, bookings: Iterable[Booking]) -> None:
+        """Agrega muchas reservas mezclando el lote ordenado con las columnas."""
+        self._add_rows([
+            (pay_date.toordinal(), amount, method, b.id)
+            for b in bookings
+            for pay_date, method, amount in payment_entries(b)
+        ])
+
+    def _add_rows(self, rows: List[Tuple[int, int, str, str]]) -> None:
+        if len(rows) < BULK_MIN:
+            for row in rows:
+                self._insert(*row)
+            return
+        self._days, self._amounts, self._methods, self._booking_ids = merge_rows(
+            (self._days, self._amounts, self._methods, self._booking_ids), rows,
+        )
+
+    def remove(self, booking: Booking) -> None:
+        for pay_date, method, amount in payment_entries(booking):
+            day = pay_date.toordinal()
+            for i in range(bisect_left(self._days, day), bisect_right(self._days, day)):
+                if self._booking_ids[i] == booking.id and self._methods[i] == method and self._amounts[i] == amount:
+                    del self._days[i], self._amounts[i], self._methods[i], self._booking_ids[i]
+                    break
+
+    def replace(self, old: Optional[Booking], new: Optional[Booking]) -> None:
+        """Aplica el cambio de ``old`` a ``new`` (cualquiera puede ser None)."""
+        if old is not None:
+            self.remove(old)
+        if new is not None:
+            self.add(new)
+
+    def replace_many(self, old: Iterable[Booking], new: Iterable[Booking]) -> None:
+        for booking in old:
+            self.remove(booking)
+        self.add_many(new)
+
+    def _slice(self, first: date, last: date) -> Tuple[int, int]:
+        return bisect_left(self._days, first.toordinal()), bisect_right(self._days, last.toordinal())
+
+    def entries(self, first: date, last: date) -> Iterator[Tuple[date, str, int, str]]:
+        """Pagos entre ``first`` y ``last`` (inclusive) como (fecha, método, monto, id reserva)."""
+        lo, hi = self._slice(first, last)
+        for i in range(lo, hi):
+            yield date.fromordinal(self._days[i]), self._methods[i], self._amounts[i], self._booking_ids[i]
+
+    def totals_by_method(self, first: date, last: date) -> Dict[str, int]:
+        """Total recaudado por método entre ``first`` y ``last`` (inclusive)."""
+        lo, hi = self._slice(first, last)
+        totals: Dict[str, int] = {}
+        for method, amount in zip(self._methods[lo:hi], self._amounts[lo:hi]):
+            totals[method] = totals.get(method, 0) + amount
+        return totals
+
+    def total(self, first: date, last: date) -> int:
+        lo, hi = self._slice(first, last)
+        return sum(self._amounts[lo:hi])
+
+    def report(self, first: date, last: date, freq: str = "M"):
+        """Reporte de caja: DataFrame con un período por fila y un método por columna.
+
+        ``freq`` es una frecuencia de períodos de pandas ("M" mensual, "Y" anual, ...).
+        Incluye una columna ``Total``.
+        """
+        import pandas as pd
+
+        lo, hi = self._slice(first, last)
+        if lo == hi:
+            return pd.DataFrame({"Total": []})
+        frame = pd.DataFrame({
+            "day": self._days[lo:hi],
+            "method": self._methods[lo:hi],
+            "amount": self._amounts[lo:hi],
+        })
+        # ordinal 719163 = 1970-01-01, origen de datetime64
+        frame["period"] = (pd.to_datetime(frame["day"] - 719163, unit="D")).dt.to_period(freq)
+        table = frame.pivot_table(index="period", columns="method", values="amount", aggfunc="sum", fill_value=0)
+        table.columns.name = None
+        table["Total"] = table.sum(axis=1)
+        return table
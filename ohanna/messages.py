@@ -0,0 +1,88 @@
+"""Mensajes para compartir una reserva (portados de ShareActions.tsx).
+
+``chalet`` es el nombre de la propiedad que aparece en el encabezado.
+"""
+import json
+
+from ohanna.helpers import format_currency, format_date_key
+from ohanna.models import HOSPEDAJE, Booking
+
+CHALET_NAME = "Chalet Ohanna Bay"
+
+
+def monica_message(booking: Booking, chalet: str = CHALET_NAME) -> str:
+    """Aviso de ingreso y salida con el saldo pendiente."""
+    schedule = (booking.schedule or "9:00 AM - 5:30 PM").split("-")
+    check_in = "3:00 PM" if booking.type == HOSPEDAJE else schedule[0].strip()
+    check_out = "1:00 PM" if booking.type == HOSPEDAJE else schedule[1].strip()
+    return f"""🏡 *RESERVA {chalet.upper()}* 🏡
+--------------------------------
+👤 *Monica:*
+📅 *Ingreso:* {booking.start_date} ({check_in})
+📅 *Salida:* {booking.end_date} ({check_out})
+🏨 *Tipo:* {booking.type}
+👥 *Personas:* {booking.num_people}
+💰 *Saldo Pendiente:* {format_currency(booking.balance)}
+--------------------------------"""
+
+
+def portero_message(booking: Booking, chalet: str = CHALET_NAME) -> str:
+    """Lista de huéspedes autorizados para portería."""
+    guest_list = "\n".join([f"• {g.name} - {g.document}" for g in booking.guests if g.name]) or "No registrados"
+    return f"""👮 *AUTORIZACIÓN PORTERÍA* 👮
+--------------------------------
+📅 *Fecha:* {booking.start_date} al {booking.end_date}
+🏠 *{chalet}*
+👥 *Huéspedes:*
+{guest_list}
+--------------------------------"""
+
+
+def admin_summary(booking: Booking, chalet: str = CHALET_NAME) -> str:
+    """Resumen de precios, abonos y aseo para administración."""
+    total_guests = booking.num_people + booking.num_children
+    hospedaje = booking.type == HOSPEDAJE
+    days_count = (booking.end_date - booking.start_date).days if hospedaje else 1
+    day_label = "Día Hospedaje" if hospedaje and days_count == 1 else "Días Hospedaje" if hospedaje else "Día Pasadía" if days_count == 1 else "Días Pasadía"
+    payments = booking.payments
+    payment_lines = "\n".join([f"• {format_currency(p.amount)} ({p.method}) - {format_date_key(p.date)}" for p in payments]) if payments else f"• {format_currency(booking.deposit)} (No especificado)"
+    return f"""📝 *RESUMEN DE RESERVA (ADMIN)* 📝
+--------------------------------
+🏠 *{chalet}*
+👥 *Huéspedes totales:* {total_guests} ({booking.num_people} adultos, {booking.num_children} niños)
+📅 *Duración:* {days_count} {day_label}
+💰 *Desglose:* {format_currency(booking.total_price)} (Tarifa base + adicionales)
+📉 *Descuento:* {format_currency(booking.discount)}
+✅ *Total:* {format_currency(booking.final_total)}
+💳 *Abonos:*
+{payment_lines}
+🧹 *Aseo:* {format_currency(booking.cleaning_total)} (Abonado: {format_currency(booking.cleaning_deposit)}, Saldo: {format_currency(booking.cleaning_balance)})
+--------------------------------"""
+
+
+def booking_json(booking: Booking, chalet: str = CHALET_NAME) -> str:
+    """Resumen JSON (cliente, fechas, total y abonos)."""
+    data = {
+        "chalet": chalet,
+        "cliente": booking.guests[0].name if booking.guests else "No registrado",
+        "tipo": booking.type,
+        "inicio": format_date_key(booking.start_date),
+        "fin": format_date_key(booking.end_date),
+        "huespedes": booking.num_people + booking.num_children,
+        "adultos": booking.num_people,
+        "ninos": booking.num_children,
+        "total": booking.final_total,
+        "abonos": [p.to_dict() for p in booking.payments],
+        "aseo_total": booking.cleaning_total,
+        "aseo_abonado": booking.cleaning_deposit,
+    }
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+# nombre corto -> generador (reserva, chalet), en el orden de los botones de la app
+MESSAGES = {
+    "monica": monica_message,
+    "porteria": portero_message,
+    "admin": admin_summary,
+    "json": booking_json,
+}
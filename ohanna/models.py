@@ -0,0 +1,213 @@
+"""Modelo tipado de reservas (portado de types.ts).
+
+Las fechas se guardan como objetos ``date`` y se parsean una sola vez al
+cargar; ``to_dict``/``from_dict`` mantienen el formato camelCase con fechas
+``YYYY-MM-DD`` que usan el JSON exportado y la app React.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, FrozenSet, List, Optional
+
+HOSPEDAJE = "Hospedaje"
+PASADIA = "Pasadía"
+
+_BOOKING_KEYS = (
+    "id", "startDate", "endDate", "type", "numPeople", "numChildren", "guests",
+    "totalPrice", "discount", "deposit", "balance", "expenses", "payments",
+    "paymentMethod", "schedule", "isHoliday", "cleaningTotal", "cleaningDeposit",
+    "cleaningBalance",
+)
+_KNOWN_KEYS = frozenset(_BOOKING_KEYS)
+# claves que ``from_dict`` completa si faltan: clave -> (atributo, valor por defecto)
+_DEFAULTS: Dict[str, tuple] = {
+    "numPeople": ("num_people", 2), "numChildren": ("num_children", 0), "guests": ("guests", []),
+    "totalPrice": ("total_price", 0), "discount": ("discount", 0), "deposit": ("deposit", 0),
+    "balance": ("balance", 0), "expenses": ("expenses", []), "payments": ("payments", []),
+    "cleaningTotal": ("cleaning_total", 0), "cleaningDeposit": ("cleaning_deposit", 0),
+    "cleaningBalance": ("cleaning_balance", 0),
+}
+
+
+def parse_date(value: str) -> date:
+    """Convierte un string YYYY-MM-DD a date."""
+    return date.fromisoformat(value)
+
+
+def parse_amount(value: Any, name: str = "monto") -> int:
+    """Entero a partir de un int, un float sin decimales o un texto con dígitos; si no, ``ValueError``."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().removeprefix("-").isdigit():
+        return int(value)
+    raise ValueError(f"{name}: valor inválido {value!r}")
+
+
+@dataclass(slots=True)
+class Guest:
+    name: str = ""
+    document: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Guest":
+        return cls(name=data.get("name", ""), document=data.get("document", ""))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "document": self.document}
+
+
+@dataclass(slots=True)
+class Expense:
+    id: str
+    description: str = ""
+    amount: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Expense":
+        return cls(id=data["id"], description=data.get("description", ""),
+                   amount=parse_amount(data.get("amount", 0), "amount"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "description": self.description, "amount": self.amount}
+
+
+@dataclass(slots=True)
+class Payment:
+    id: str
+    amount: int
+    method: str
+    date: date
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Payment":
+        if not isinstance(data["method"], str):
+            raise ValueError(f"método de pago inválido: {data['method']!r}")
+        return cls(id=data["id"], amount=parse_amount(data["amount"], "amount"), method=data["method"],
+                   date=parse_date(data["date"]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "amount": self.amount, "method": self.method, "date": self.date.isoformat()}
+
+
+@dataclass(slots=True)
+class Booking:
+    id: str
+    start_date: date
+    end_date: date
+    type: str
+    num_people: int
+    num_children: int
+    guests: List[Guest]
+    total_price: int
+    discount: int
+    deposit: int
+    balance: int
+    expenses: List[Expense]
+    payments: List[Payment]
+    cleaning_total: int
+    cleaning_deposit: int
+    cleaning_balance: int
+    payment_method: Optional[str] = None
+    schedule: Optional[str] = None
+    is_holiday: Optional[bool] = None
+    # claves desconocidas del dict original, para que el ida y vuelta no pierda datos
+    extra: Dict[str, Any] = field(default_factory=dict)
+    # claves de ``_DEFAULTS`` que no venían en el dict original
+    absent: FrozenSet[str] = field(default=frozenset(), compare=False, repr=False)
+    # derivados, calculados una sola vez al construir
+    nights: int = field(init=False)
+    final_total: int = field(init=False)
+
+    def __post_init__(self):
+        self.nights = (self.end_date - self.start_date).days if self.type == HOSPEDAJE else 0
+        self.final_total = self.total_price - self.discount
+
+    @property
+    def guest_name(self) -> str:
+        """Nombre del huésped principal."""
+        return self.guests[0].name if self.guests else ""
+
+    @property
+    def occupied_end(self) -> date:
+        """Día siguiente al último que la reserva ocupa en el calendario."""
+        return self.start_date + timedelta(days=1) if self.type == PASADIA else self.end_date
+
+    def occupies(self, day: date) -> bool:
+        """Indica si la reserva ocupa ``day`` en el calendario."""
+        return self.start_date <= day < self.occupied_end
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Booking":
+        """Construye una reserva a partir del formato dict/JSON.
+
+        Los campos que faltan toman el valor de ``_DEFAULTS`` (2 adultos, montos
+        en 0, listas vacías) y quedan en ``absent``: ``to_dict`` no los escribe
+        mientras sigan con ese valor, así que el ida y vuelta no agrega claves.
+        """
+        return cls(**booking_fields(data))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte la reserva al formato dict/JSON (camelCase, fechas YYYY-MM-DD)."""
+        data = {
+            "id": self.id,
+            "startDate": self.start_date.isoformat(),
+            "endDate": self.end_date.isoformat(),
+            "type": self.type,
+            "numPeople": self.num_people,
+            "numChildren": self.num_children,
+            "guests": [g.to_dict() for g in self.guests],
+            "totalPrice": self.total_price,
+            "discount": self.discount,
+            "deposit": self.deposit,
+            "balance": self.balance,
+            "expenses": [e.to_dict() for e in self.expenses],
+            "payments": [p.to_dict() for p in self.payments],
+        }
+        if self.payment_method is not None:
+            data["paymentMethod"] = self.payment_method
+        if self.schedule is not None:
+            data["schedule"] = self.schedule
+        if self.is_holiday is not None:
+            data["isHoliday"] = self.is_holiday
+        data["cleaningTotal"] = self.cleaning_total
+        data["cleaningDeposit"] = self.cleaning_deposit
+        data["cleaningBalance"] = self.cleaning_balance
+        for key in self.absent:
+            name, default = _DEFAULTS[key]
+            if getattr(self, name) == default:
+                del data[key]
+        data.update(self.extra)
+        return data
+
+
+def booking_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Argumentos de ``Booking`` a partir del formato dict/JSON (lo que usa ``Booking.from_dict``).
+
+    Sirve para completar o corregir campos antes de construir la reserva una
+    sola vez (el importador agrega los precios recalculados).
+    """
+    extra_keys = data.keys() - _KNOWN_KEYS
+    return {
+        "id": data["id"],
+        "start_date": parse_date(data["startDate"]),
+        "end_date": parse_date(data["endDate"]),
+        "type": data["type"],
+        "num_people": data.get("numPeople", 2),
+        "num_children": data.get("numChildren", 0),
+        "guests": [Guest(g.get("name", ""), g.get("document", "")) for g in data.get("guests", ())],
+        "total_price": data.get("totalPrice", 0),
+        "discount": data.get("discount", 0),
+        "deposit": data.get("deposit", 0),
+        "balance": data.get("balance", 0),
+        "expenses": [Expense.from_dict(e) for e in data.get("expenses", ())],
+        "payments": [Payment.from_dict(p) for p in data.get("payments", ())],
+        "cleaning_total": data.get("cleaningTotal", 0),
+        "cleaning_deposit": data.get("cleaningDeposit", 0),
+        "cleaning_balance": data.get("cleaningBalance", 0),
+        "payment_method": data.get("paymentMethod"),
+        "schedule": data.get("schedule"),
+        "is_holiday": data.get("isHoliday"),
+        "extra": {k: v for k, v in data.items() if k in extra_keys} if extra_keys else {},
+        "absent": frozenset(_DEFAULTS.keys() - data.keys()),
+    }
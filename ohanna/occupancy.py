@@ -0,0 +1,25 @@
+"""Índice de ocupación: fecha -> reserva que ocupa ese día."""
+from datetime import date, timedelta
+from typing import Dict, Iterable
+
+from ohanna.models import PASADIA, Booking
+
+
+def build_occupancy_index(bookings: Iterable[Booking]) -> Dict[date, Booking]:
+    """Construye un mapa fecha -> reserva aplicando las reglas del calendario.
+
+    Un Pasadía ocupa solo su fecha de inicio; un Hospedaje ocupa cada día
+    con ``start <= d < end``. Si dos reservas se solapan gana la primera de la
+    lista, igual que el recorrido lineal que reemplaza.
+    """
+    index: Dict[date, Booking] = {}
+    one_day = timedelta(days=1)
+    for b in bookings:
+        if b.type == PASADIA:
+            index.setdefault(b.start_date, b)
+            continue
+        current = b.start_date
+        while current < b.end_date:
+            index.setdefault(current, b)
+            current += one_day
+    return index
@@ -0,0 +1,37 @@
+"""Tarifas y cálculo de precios (portado de constants.ts).
+
+Los valores salen de un ``RateTable`` compilado (``ohanna.rates``);
+``DEFAULT_RATES`` son las tarifas del Chalet Ohanna Bay y es lo que usan las
+funciones si no se indica otra tabla.
+"""
+import datetime
+from typing import List, Tuple
+
+from ohanna.models import HOSPEDAJE, PASADIA
+# las constantes de siempre se siguen importando desde aquí
+from ohanna.rates import CHILD_RATE, DEFAULT_RATES, WEEKDAY_RATE, WEEKEND_HOLIDAY_RATE, RateTable
+
+
+def calculate_hospedaje_price(num_people: int, num_children: int, date: datetime.date, is_holiday: bool = False,
+                              rates: RateTable = DEFAULT_RATES) -> int:
+    """Calcula el precio de una noche de hospedaje.
+
+    Los festivos de Colombia se aplican solos; ``is_holiday`` fuerza la tarifa festiva.
+    """
+    return rates.night(HOSPEDAJE, num_people, num_children, date, is_holiday)
+
+def calculate_pasadia_price(num_people: int, num_children: int, date: datetime.date, is_holiday: bool = False,
+                            rates: RateTable = DEFAULT_RATES) -> int:
+    """Calcula el precio de un pasadía (festivos como en ``calculate_hospedaje_price``)."""
+    return rates.night(PASADIA, num_people, num_children, date, is_holiday)
+
+def nightly_breakdown(kind: str, num_people: int, num_children: int, start: datetime.date, end: datetime.date,
+                      is_holiday: bool = False, rates: RateTable = DEFAULT_RATES) -> List[Tuple[datetime.date, int]]:
+    """(fecha, precio) de cada noche de ``start`` a ``end`` (excluida); un Pasadía cobra solo su día.
+
+    Versión escalar de ``ohanna.quotes.quote_stay``: no necesita NumPy, útil para cotizaciones sueltas.
+    """
+    if kind == PASADIA:
+        return [(start, calculate_pasadia_price(num_people, num_children, start, is_holiday, rates))]
+    days = [start + datetime.timedelta(days=i) for i in range((end - start).days)]
+    return [(d, calculate_hospedaje_price(num_people, num_children, d, is_holiday, rates)) for d in days]
@@ -0,0 +1,127 @@
+"""Medición por ejecución de las secciones de la app (panel de depuración).
+
+``RunProfiler`` cronometra el script por tramos: ``section(nombre)`` cierra
+el tramo anterior y abre uno nuevo, así basta una línea en cada encabezado
+de sección de ``app.py``. Además acumula contadores (reservas leídas,
+widgets emitidos) y, al terminar la ejecución, guarda todo en un buffer
+circular de las últimas ``history`` ejecuciones para sacar p50/p95.
+
+Deshabilitado se usa ``NULL_PROFILER``, cuyos métodos no hacen nada: el
+costo es una llamada vacía por sección.
+"""
+import json
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+
+class RunProfiler:
+    """Tiempos y contadores por sección de las últimas ``history`` ejecuciones.
+
+    ``widget_count`` (opcional) retorna cuántos widgets lleva emitidos la
+    ejecución; la diferencia entre el inicio y el fin de cada sección se
+    guarda como contador ``widgets``.
+    """
+
+    enabled = True
+
+    def __init__(self, history: int = 200, widget_count: Optional[Callable[[], int]] = None):
+        self.runs: Deque[Dict] = deque(maxlen=history)
+        self.widget_count = widget_count
+        self._sections: Dict[str, float] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._current: Optional[str] = None
+        self._started = 0.0
+        self._run_started = 0.0
+        self._widgets = 0
+
+    def start(self) -> None:
+        """Empieza una ejecución; descarta la anterior si quedó a medias (``st.rerun``)."""
+        self._sections = {}
+        self._counters = {}
+        self._current = None
+        self._run_started = time.perf_counter()
+
+    def section(self, name: str) -> None:
+        """Cierra la sección en curso y abre ``name``."""
+        now = time.perf_counter()
+        widgets = self.widget_count() if self.widget_count else 0
+        self._close(now, widgets)
+        self._current, self._started, self._widgets = name, now, widgets
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Suma ``amount`` al contador de la sección en curso."""
+        counters = self._counters.setdefault(self._current or "", {})
+        counters[counter] = counters.get(counter, 0) + amount
+
+    def finish(self) -> Dict:
+        """Cierra la ejecución, la agrega al historial y la retorna."""
+        now = time.perf_counter()
+        self._close(now, self.widget_count() if self.widget_count else 0)
+        self._current = None
+        run = {
+            "at": time.time(),
+            "total_ms": (now - self._run_started) * 1e3,
+            "sections": {name: seconds * 1e3 for name, seconds in self._sections.items()},
+            "counters": self._counters,
+        }
+        self.runs.append(run)
+        return run
+
+    def _close(self, now: float, widgets: int) -> None:
+        if self._current is None:
+            return
+        self._sections[self._current] = self._sections.get(self._current, 0.0) + now - self._started
+        if self.widget_count and widgets != self._widgets:
+            self.count("widgets", widgets - self._widgets)
+
+    def summary(self):
+        """DataFrame con p50, p95 y último valor (ms) por sección, más los contadores de la última ejecución."""
+        import numpy as np
+        import pandas as pd
+
+        if not self.runs:
+            return pd.DataFrame(columns=["p50 ms", "p95 ms", "última ms"])
+        names: List[str] = list(self.runs[-1]["sections"]) + ["Total"]
+        rows = []
+        for name in names:
+            values = np.array([
+                run["total_ms"] if name == "Total" else run["sections"][name]
+                for run in self.runs if name == "Total" or name in run["sections"]
+            ])
+            p50, p95 = np.percentile(values, [50, 95])
+            rows.append({"sección": name, "p50 ms": p50, "p95 ms": p95, "última ms": values[-1], "ejecuciones": len(values)})
+        frame = pd.DataFrame(rows).set_index("sección")
+        last = pd.DataFrame.from_dict(self.runs[-1]["counters"], orient="index")
+        if not last.empty:
+            last.loc["Total"] = last.sum()
+        return frame.join(last).fillna(0)
+
+    def to_json(self) -> str:
+        """Historial completo y resumen p50/p95, para comparar fuera de la app."""
+        summary = self.summary()
+        return json.dumps({
+            "summary": {name: row.to_dict() for name, row in summary.iterrows()},
+            "runs": list(self.runs),
+        }, ensure_ascii=False, indent=2, default=float)
+
+
+class _NullProfiler:
+    """Mismo contrato que ``RunProfiler`` sin medir nada."""
+
+    enabled = False
+
+    def start(self) -> None:
+        pass
+
+    def section(self, name: str) -> None:
+        pass
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        pass
+
+    def finish(self) -> None:
+        return None
+
+
+NULL_PROFILER = _NullProfiler()
@@ -0,0 +1,208 @@
+"""Varias propiedades (chalets) en un mismo despliegue.
+
+Cada ``Property`` tiene sus tarifas y su partición de datos: un
+``SharedStore`` propio, con sus índices (disponibilidad, libro, huéspedes) y
+sus agregados mensuales. ``PartitionedStore`` abre cada partición la primera
+vez que se usa, así consultar o dibujar una propiedad no toca las demás.
+
+Los consolidados entre propiedades (``rollup``) suman los ``MonthStats`` que
+devuelve cada partición para cada mes: en SQLite, una consulta acotada a las
+reservas del mes; en los demás backends, sus agregados.
+
+Las propiedades se leen de un JSON (``OHANNA_PROPERTIES`` en la app)::
+
+    [
+      {"id": "ohanna-bay", "name": "Chalet Ohanna Bay"},
+      {"id": "la-cumbre", "name": "Cabaña La Cumbre", "calendarUrl": "https://...",
+       "rates": {"hospedaje": {"child": 30000}}},
+      {"id": "el-mirador", "name": "El Mirador", "rates": "tarifas-mirador.json"}
+    ]
+
+``rates`` es un dict con lo que cambia respecto a ``DEFAULT_CONFIG`` (el
+formato de ``ohanna.rates``) o la ruta de un archivo de tarifas, relativa al
+archivo de propiedades, que se recarga en caliente. Sin ``rates`` se usan las
+tarifas por defecto del despliegue (``OHANNA_RATES`` o ``DEFAULT_RATES``). La primera
+propiedad es la principal: conserva la base de datos o el diario de
+siempre; las demás usan ``<ruta>.<id>`` (``reservas.db`` ->
+``reservas.la-cumbre.db``). El store (y SQLite) se importa al abrir la primera
+partición: leer propiedades y tarifas es liviano.
+"""
+import dataclasses
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence
+
+from ohanna.aggregates import MonthKey, MonthStats, combine
+from ohanna.messages import CHALET_NAME
+from ohanna.rates import DEFAULT_CONFIG, DEFAULT_SOURCE, RateSource, RateTable, compile_rates, merge_config
+
+if TYPE_CHECKING:
+    from ohanna.shared import SharedStore
+    from ohanna.storage import BookingStore
+
+PUBLIC_CALENDAR_URL = (
+    "https://calendar.google.com/calendar/embed?src=7780f7085d435f8d62c0d6f0368a29965149fb2d9134768cdb15cf4eddce53fb"
+    "%40group.calendar.google.com&ctz=America%2FBogota"
+)
+
+_ID = re.compile(r"^[a-z0-9][a-z0-9-]*$")
+
+
+@dataclass(frozen=True)
+class Property:
+    """Una propiedad con sus tarifas."""
+    id: str
+    name: str
+    rates_source: RateSource = DEFAULT_SOURCE
+    calendar_url: str = ""
+
+    @property
+    def rates(self) -> RateTable:
+        """Tabla vigente (si viene de un archivo, la última versión válida)."""
+        return self.rates_source.table
+
+
+DEFAULT_PROPERTY = Property("ohanna-bay", CHALET_NAME, DEFAULT_SOURCE, PUBLIC_CALENDAR_URL)
+
+
+def rate_source(data, base_dir: str = "", default: RateSource = DEFAULT_SOURCE) -> RateSource:
+    """Tarifas de una propiedad: ruta de archivo, dict parcial sobre ``DEFAULT_CONFIG`` o ``default``."""
+    if not data:
+        return default
+    if isinstance(data, str):
+        return RateSource(os.path.join(base_dir, data))
+    if not isinstance(data, dict):
+        raise ValueError(f"tarifas inválidas: {data!r}")
+    return RateSource(fixed=compile_rates(merge_config(DEFAULT_CONFIG, data)))
+
+
+def parse_properties(data: List[Dict], base_dir: str = "", default_rates: RateSource = DEFAULT_SOURCE) -> List[Property]:
+    """Propiedades a partir de la lista JSON (ver docstring del módulo)."""
+    if not data:
+        raise ValueError("se necesita al menos una propiedad")
+    properties: List[Property] = []
+    for item in data:
+        try:
+            prop = Property(
+                id=item["id"], name=item["name"], calendar_url=item.get("calendarUrl", ""),
+                rates_source=rate_source(item.get("rates"), base_dir, default_rates),
+            )
+        except KeyError as e:
+            raise ValueError(f"falta el campo {e.args[0]}") from None
+        except ValueError as e:
+            raise ValueError(f"{item.get('id', '?')}: {e}") from None
+        if not _ID.match(prop.id):
+            raise ValueError(f"id de propiedad inválido: {prop.id!r} (solo minúsculas, dígitos y guiones)")
+        if any(p.id == prop.id for p in properties):
+            raise ValueError(f"propiedad repetida: {prop.id}")
+        properties.append(prop)
+    return properties
+
+
+def load_properties(path: Optional[str] = None, rates_path: Optional[str] = None) -> List[Property]:
+    """Propiedades del archivo ``path``; sin archivo, solo ``DEFAULT_PROPERTY``.
+
+    ``rates_path`` es el archivo de tarifas por defecto (``OHANNA_RATES``).
+    """
+    default_rates = RateSource(rates_path) if rates_path else DEFAULT_SOURCE
+    if not path:
+        return [dataclasses.replace(DEFAULT_PROPERTY, rates_source=default_rates)]
+    with open(path, encoding="utf-8") as f:
+        return parse_properties(json.load(f), os.path.dirname(path), default_rates)
+
+
+def partition_location(location: Optional[str], property_id: str, primary: bool) -> Optional[str]:
+    """Ruta de la partición: la principal usa ``location``; las demás, ``<ruta>.<id><ext>``."""
+    if not location or primary:
+        return location
+    root, ext = os.path.splitext(location.rstrip("/\\"))
+    return f"{root}.{property_id}{ext}"
+
+
+class PartitionedStore:
+    """Un ``SharedStore`` por propiedad, abierto a demanda con ``open_backend``."""
+
+    def __init__(self, properties: Sequence[Property], open_backend: Callable[[Property, bool], "BookingStore"]):
+        self.properties: Dict[str, Property] = {p.id: p for p in properties}
+        self.primary = properties[0]
+        self._open_backend = open_backend
+        self._partitions: Dict[str, "SharedStore"] = {}
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return iter(self.properties.values())
+
+    def __len__(self) -> int:
+        return len(self.properties)
+
+    def get(self, property_id: str) -> Property:
+        try:
+            return self.properties[property_id]
+        except KeyError:
+            raise KeyError(f"propiedad desconocida: {property_id}") from None
+
+    def partition(self, property_id: str) -> "SharedStore":
+        """El store de la propiedad; se abre la primera vez (los índices se arman a demanda)."""
+        shared = self._partitions.get(property_id)
+        if shared is not None:
+            return shared
+        from ohanna.shared import SharedStore
+
+        prop = self.get(property_id)
+        with self._lock:
+            shared = self._partitions.get(property_id)
+            if shared is None:
+                shared = self._partitions[property_id] = SharedStore(self._open_backend(prop, prop is self.primary))
+        return shared
+
+    @property
+    def opened(self) -> List[str]:
+        """Ids de las particiones ya abiertas."""
+        return list(self._partitions)
+
+    def rollup(self, months: Iterable[MonthKey]) -> Dict[str, MonthStats]:
+        """Estadísticas de ``months`` sumadas por propiedad, desde los agregados de cada partición.
+
+        Días ocupados e ingresos se suman sin repetir; reservas y saldos cuentan
+        la reserva en cada mes que toca, así que solo son exactos para un mes.
+        """
+        months = list(months)
+        result: Dict[str, MonthStats] = {}
+        for prop in self:
+            with self.partition(prop.id).reading() as backend:
+                result[prop.id] = combine(backend.month_stats(year, month) for year, month in months)
+        return result
+
+    def method_totals(self, months: Iterable[MonthKey]) -> Dict[str, int]:
+        """Recaudo de ``months`` por método de pago, de todas las propiedades."""
+        months = list(months)
+        totals: Dict[str, int] = {}
+        for prop in self:
+            with self.partition(prop.id).reading() as backend:
+                for year, month in months:
+                    for method, amount in backend.method_totals(year, month).items():
+                        totals[method] = totals.get(method, 0) + amount
+        return totals
+
+    def close(self) -> None:
+        for shared in self._partitions.values():
+            close = getattr(shared.backend, "close", None)
+            if close is not None:
+                close()
+
+
+def open_partitions(properties: Sequence[Property], db_path: Optional[str] = None,
+                    journal_dir: Optional[str] = None) -> PartitionedStore:
+    """Particiones con el mismo tipo de backend que ``open_store`` (SQLite, diario o memoria)."""
+    def open_backend(prop: Property, primary: bool) -> "BookingStore":
+        from ohanna.storage import open_store
+
+        return open_store(
+            partition_location(db_path, prop.id, primary),
+            partition_location(journal_dir, prop.id, primary),
+        )
+
+    return PartitionedStore(properties, open_backend)
@@ -0,0 +1,112 @@
+"""Motor de cotizaciones vectorizado.
+
+Cotiza rangos completos (o muchos rangos candidatos) en una sola pasada con
+NumPy, leyendo la misma tabla compilada que el cálculo noche a noche
+(``RateTable``, ver ``ohanna.rates``): se clasifica cada noche en su fila
+(temporada y tipo de día) y el precio es una lectura por (fila, adultos,
+niños), así que los resultados coinciden exactamente.
+
+Los festivos de Colombia se toman de ``ohanna.holidays``; ``is_holiday``
+fuerza la tarifa festiva además de ellos. ``rates`` elige la tabla de
+tarifas de la propiedad (por defecto, la del Chalet Ohanna Bay).
+"""
+from datetime import date, timedelta
+from typing import Union
+
+import numpy as np
+
+from ohanna.models import HOSPEDAJE, PASADIA
+from ohanna.rates import DEFAULT_RATES, MAX_ADULTS, MAX_CHILDREN, RateTable
+
+ArrayLike = Union[int, bool, np.ndarray, list]
+
+
+def date_range(start: date, end: date) -> np.ndarray:
+    """Noches de ``start`` (incluida) a ``end`` (excluida) como datetime64[D]."""
+    return np.arange(np.datetime64(start, "D"), np.datetime64(end, "D"))
+
+
+def day_types(dates: np.ndarray, is_holiday: ArrayLike = False, rates: RateTable = DEFAULT_RATES) -> np.ndarray:
+    """Fila de ``rates`` de cada fecha (por defecto: 0 = entre semana, 1 = sábado o festivo, 2 = domingo)."""
+    return rates.rows(dates, is_holiday)
+
+
+def nightly_prices(num_people: ArrayLike, num_children: ArrayLike, dates: np.ndarray,
+                   is_holiday: ArrayLike = False, kind: str = HOSPEDAJE,
+                   rates: RateTable = DEFAULT_RATES) -> np.ndarray:
+    """Precio de cada noche para cada tamaño de grupo.
+
+    ``num_people`` y ``num_children`` pueden ser escalares o arreglos 1-D
+    (uno por grupo); el resultado tiene forma ``(grupos, noches)`` o
+    ``(noches,)`` si ambos son escalares.
+    """
+    table, extra, child = rates.arrays(kind)
+    people = np.maximum(np.asarray(num_people, dtype=np.int64), 0)
+    children = np.asarray(num_children, dtype=np.int64)
+    scalar = people.ndim == 0 and children.ndim == 0
+    people, children = np.broadcast_arrays(np.atleast_1d(people), np.atleast_1d(children))
+    rows = rates.rows(dates, is_holiday)
+    p, c = people[:, None], children[:, None]
+    # una lectura por (noche, grupo); fuera de la tabla los adicionales son lineales
+    p_in, c_in = np.minimum(p, MAX_ADULTS), np.clip(c, 0, MAX_CHILDREN)
+    prices = table[rows[None, :], p_in, c_in]
+    if (p_in != p).any() or (c_in != c).any():
+        prices = prices + (p - p_in) * extra[rows][None, :] + (c - c_in) * child[rows][None, :]
+    return prices[0] if scalar else prices
+
+
+def quote_total(num_people: int, num_children: int, start: date, end: date, is_holiday: ArrayLike = False,
+                rates: RateTable = DEFAULT_RATES) -> int:
+    """Total de un Hospedaje de ``start`` a ``end`` (0 si no hay noches), sin armar desglose."""
+    return int(nightly_prices(num_people, num_children, date_range(start, end), is_holiday, rates=rates).sum())
+
+
+def quote_stay(num_people: int, num_children: int, start: date, end: date, is_holiday: ArrayLike = False,
+               rates: RateTable = DEFAULT_RATES):
+    """Cotiza un Hospedaje completo.
+
+    Retorna ``(total, desglose)`` donde el desglose es un DataFrame con una
+    fila por noche (columnas ``date`` y ``price``); si solo se necesita el
+    total, ``quote_total`` no importa pandas.
+    """
+    import pandas as pd
+
+    dates = date_range(start, end)
+    prices = nightly_prices(num_people, num_children, dates, is_holiday, rates=rates)
+    breakdown = pd.DataFrame({"date": dates, "price": prices})
+    return int(prices.sum()), breakdown
+
+
+def quote_ranges(num_people: ArrayLike, num_children: ArrayLike, starts, ends,
+                 is_holiday: ArrayLike = False, kind: str = HOSPEDAJE,
+                 rates: RateTable = DEFAULT_RATES) -> np.ndarray:
+    """Cotiza muchos rangos ``[start, end)`` a la vez.
+
+    Calcula una sola vez el precio por noche de todo el intervalo cubierto y
+    obtiene el total de cada rango con sumas acumuladas. ``is_holiday`` puede
+    ser un escalar o un arreglo alineado con las noches entre el menor inicio
+    y el mayor fin. Para Pasadía se cotiza solo el día de inicio. Retorna
+    ``(grupos, rangos)`` o ``(rangos,)`` si el grupo es escalar.
+    """
+    starts = np.asarray(starts, dtype="datetime64[D]")
+    ends = np.asarray(ends, dtype="datetime64[D]")
+    if kind == PASADIA:
+        ends = starts + 1
+    origin = starts.min()
+    dates = np.arange(origin, max(ends.max(), origin + 1))
+    prices = nightly_prices(num_people, num_children, dates, is_holiday, kind, rates)
+    squeeze = prices.ndim == 1
+    prices = np.atleast_2d(prices)
+    cumulative = np.zeros((prices.shape[0], prices.shape[1] + 1), dtype=np.int64)
+    np.cumsum(prices, axis=1, out=cumulative[:, 1:])
+    i = (starts - origin).astype(np.int64)
+    j = (ends - origin).astype(np.int64)
+    totals = cumulative[:, j] - cumulative[:, i]
+    return totals[0] if squeeze else totals
+
+
+def quote_all_stays(num_people: ArrayLike, num_children: ArrayLike, start: date, days: int,
+                    nights: int, is_holiday: ArrayLike = False, rates: RateTable = DEFAULT_RATES) -> np.ndarray:
+    """Total de cada estadía de ``nights`` noches que empieza en los ``days`` días desde ``start``."""
+    starts = date_range(start, start + timedelta(days=days))
+    return quote_ranges(num_people, num_children, starts, starts + nights, is_holiday, rates=rates)
@@ -0,0 +1,419 @@
+"""Tarifas configurables, compiladas a una tabla plana.
+
+Las tarifas se describen en JSON (``DEFAULT_CONFIG`` reproduce las de
+siempre)::
+
+    {
+      "dayTypes": {"default": "semana", "rules": [
+        {"type": "pico", "holiday": true}, {"type": "pico", "weekdays": [5]},
+        {"type": "domingo", "weekdays": [6]}]},
+      "hospedaje": {"base": {"semana": [380000, 380000, 380000, 430000, ...], ...},
+                    "extraAdult": {"semana": 56000, "pico": 70000, "domingo": 70000}, "child": 40000},
+      "pasadia": {"maxBasePeople": 6, "base": {"semana": 280000, ...}, ...},
+      "seasons": [{"name": "Fin de año", "from": "12-15", "to": "01-15",
+                   "hospedaje": {"base": {"semana": [450000, ...]}}}]
+    }
+
+* ``dayTypes``: reglas en orden (``holiday`` y/o ``weekdays``, 0 = lunes);
+  la primera que aplica da el tipo del día y, si ninguna, ``default``.
+* ``hospedaje`` / ``pasadia``: por tipo de día (o un valor para todos), la
+  tarifa base (un valor, o una lista por número de adultos hasta
+  ``maxBasePeople``), el adicional por adulto de ahí en adelante
+  (``extraAdult``) y el valor por niño (``child``).
+* ``seasons``: rangos ``"MM-DD"`` (cada año, pueden cruzar el 31 de
+  diciembre) o ``"AAAA-MM-DD"`` que cambian cualquiera de esos valores. Si
+  dos temporadas se cruzan gana la primera; las de fecha exacta, antes que
+  las anuales.
+
+``compile_rates`` lo convierte en un ``RateTable``: una fila por (temporada,
+tipo de día) y, en cada fila, el precio de la noche para cada (adultos,
+niños) hasta ``MAX_ADULTS``/``MAX_CHILDREN``, todo en un ``array`` plano.
+Cotizar una noche es clasificar el día (dos lecturas en tablas chicas) y leer
+una posición; fuera de la tabla los adicionales son lineales.
+
+``RateSource`` lee un archivo y lo recompila cuando cambia, sin reiniciar.
+"""
+import copy
+import json
+import os
+import threading
+import time
+from array import array
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from ohanna.holidays import is_holiday as is_public_holiday
+from ohanna.models import HOSPEDAJE, PASADIA, parse_date
+
+if TYPE_CHECKING:
+    import numpy as np
+
+WEEKEND_HOLIDAY_RATE = 70000
+WEEKDAY_RATE = 56000
+CHILD_RATE = 40000
+
+# la tabla compilada cubre adultos 0..MAX_ADULTS y niños 0..MAX_CHILDREN por fila
+MAX_ADULTS = 20
+MAX_CHILDREN = 10
+# fechas clasificadas que recuerda cada tabla (unos 27 años de noches); al llenarse se vacía
+ROW_CACHE_SIZE = 10_000
+
+# sección del JSON -> tipo de reserva
+_KINDS = {"hospedaje": HOSPEDAJE, "pasadia": PASADIA}
+
+DEFAULT_CONFIG: Dict = {
+    "dayTypes": {
+        "default": "semana",
+        "rules": [
+            {"type": "pico", "holiday": True},
+            {"type": "pico", "weekdays": [5]},  # sábado
+            {"type": "domingo", "weekdays": [6]},
+        ],
+    },
+    "hospedaje": {
+        "base": {
+            "semana": [380000, 380000, 380000, 430000, 500000, 570000, 640000],
+            "pico": [450000, 450000, 450000, 520000, 590000, 660000, 730000],
+            "domingo": [380000, 380000, 380000, 430000, 500000, 570000, 640000],
+        },
+        "extraAdult": {"semana": WEEKDAY_RATE, "pico": WEEKEND_HOLIDAY_RATE, "domingo": WEEKEND_HOLIDAY_RATE},
+        "child": CHILD_RATE,
+    },
+    "pasadia": {
+        "maxBasePeople": 6,
+        "base": {"semana": 280000, "pico": 400000, "domingo": 400000},
+        "extraAdult": {"semana": WEEKDAY_RATE, "pico": WEEKEND_HOLIDAY_RATE, "domingo": WEEKEND_HOLIDAY_RATE},
+        "child": CHILD_RATE,
+    },
+    "seasons": [],
+}
+
+# posición en el año (bisiesto) del día 1 de cada mes, para ubicar "MM-DD"
+_MONTH_START = (0, 0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335)
+# date(1970, 1, 1).toordinal(): pasa de datetime64[D] a ordinal
+_EPOCH_ORDINAL = 719163
+
+
+def merge_config(base: Dict, override: Dict) -> Dict:
+    """Copia de ``base`` con ``override`` encima (los dicts se combinan; listas y valores se reemplazan)."""
+    result = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = merge_config(result[key], value)
+        else:
+            result[key] = copy.deepcopy(value)
+    return result
+
+
+def _by_type(section: Dict, key: str, types: List[str], where: str) -> List:
+    """Valor de ``key`` para cada tipo de día (un dict por tipo o un valor para todos)."""
+    if key not in section:
+        raise ValueError(f"{where}: falta {key}")
+    value = section[key]
+    if not isinstance(value, dict):
+        return [value] * len(types)
+    unknown = set(value) - set(types)
+    if unknown:
+        raise ValueError(f"{where}.{key}: tipos de día desconocidos: {', '.join(sorted(unknown))}")
+    missing = [t for t in types if t not in value]
+    if missing:
+        raise ValueError(f"{where}.{key}: faltan los tipos de día {', '.join(missing)}")
+    return [value[t] for t in types]
+
+
+def _base_rows(section: Dict, types: List[str], where: str) -> Tuple[int, List[List[int]]]:
+    """(máximo de adultos con tarifa base, tarifa base por adultos de cada tipo de día)."""
+    bases = _by_type(section, "base", types, where)
+    for b in bases:
+        if not isinstance(b, list):
+            _amount(b, f"{where}.base")  # antes de pedir maxBasePeople: "abc" no es una tarifa sin tope
+    lengths = [len(b) for b in bases if isinstance(b, list)]
+    if "maxBasePeople" in section:
+        max_base = _amount(section["maxBasePeople"], f"{where}.maxBasePeople")
+    elif lengths:
+        max_base = max(lengths) - 1
+    else:
+        raise ValueError(f"{where}: falta maxBasePeople")
+    if max_base < 0 or any(n == 0 or n > max_base + 1 for n in lengths):
+        raise ValueError(f"{where}.base: las listas deben tener entre 1 y maxBasePeople + 1 valores")
+    rows = []
+    for b in bases:
+        values = [_amount(v, f"{where}.base") for v in (b if isinstance(b, list) else [b])]
+        # una lista corta repite su último valor hasta maxBasePeople
+        rows.append(values + [values[-1]] * (max_base + 1 - len(values)))
+    return max_base, rows
+
+
+def _amount(value, where: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{where}: valor inválido {value!r}")
+    return int(value)
+
+
+def _day_index(text: str, where: str) -> Tuple[Optional[int], int]:
+    """``"MM-DD"`` -> (None, posición en el año); ``"AAAA-MM-DD"`` -> (ordinal, 0)."""
+    try:
+        if len(text) == 5:
+            month, day = (int(x) for x in text.split("-"))
+            date(2000, month, day)  # valida (2000 es bisiesto: admite 02-29)
+            return None, _MONTH_START[month] + day - 1
+        return parse_date(text).toordinal(), 0
+    except (TypeError, ValueError):
+        raise ValueError(f"{where}: fecha inválida {text!r} (use MM-DD o AAAA-MM-DD)") from None
+
+
+class RateTable:
+    """Tarifas compiladas (ver el docstring del módulo).
+
+    Inmutable; se compara por identidad, así que sirve de llave de caché: al
+    recargar un archivo sale un ``RateTable`` nuevo.
+    """
+
+    __slots__ = ("config", "day_types", "seasons", "max_base", "_type_lut", "_season_lut", "_dated",
+                 "_tables", "_extra", "_child", "_arrays", "_rows")
+
+    def __init__(self, config: Dict):
+        self.config = config
+        rules = config.get("dayTypes") or {}
+        if not rules.get("default"):
+            raise ValueError("dayTypes: falta default")
+        types = [rules["default"]]
+        for rule in rules.get("rules", []):
+            if "type" not in rule:
+                raise ValueError("dayTypes.rules: cada regla necesita type")
+            if any(w not in range(7) for w in rule.get("weekdays", [])):
+                raise ValueError("dayTypes.rules: weekdays va de 0 (lunes) a 6 (domingo)")
+            if rule["type"] not in types:
+                types.append(rule["type"])
+        self.day_types: Tuple[str, ...] = tuple(types)
+        # (día de la semana * 2 + festivo) -> tipo de día: la primera regla que aplica
+        lut = bytearray(14)
+        for weekday in range(7):
+            for holiday in (False, True):
+                for rule in rules.get("rules", []):
+                    if rule.get("holiday", holiday) == holiday and weekday in rule.get("weekdays", range(7)):
+                        lut[weekday * 2 + holiday] = types.index(rule["type"])
+                        break
+        self._type_lut = bytes(lut)
+
+        seasons = config.get("seasons") or []
+        self.seasons: Tuple[str, ...] = ("",) + tuple(s.get("name") or f"Temporada {i + 1}" for i, s in enumerate(seasons))
+        season_lut = bytearray(366)
+        self._dated: Dict[int, int] = {}
+        for number, season in enumerate(seasons, start=1):
+            where = f"seasons[{number - 1}]"
+            try:
+                (first_ordinal, first), (last_ordinal, last) = _day_index(season["from"], where), _day_index(season["to"], where)
+            except KeyError as e:
+                raise ValueError(f"{where}: falta {e.args[0]}") from None
+            if (first_ordinal is None) != (last_ordinal is None):
+                raise ValueError(f"{where}: from y to deben tener el mismo formato")
+            if first_ordinal is not None:
+                for ordinal in range(first_ordinal, last_ordinal + 1):
+                    self._dated.setdefault(ordinal, number)
+            else:
+                span = range(first, last + 1) if first <= last else [*range(first, 366), *range(0, last + 1)]
+                for i in span:
+                    season_lut[i] = season_lut[i] or number
+        if len(self.seasons) > 255:
+            raise ValueError("seasons: máximo 254 temporadas")
+        self._season_lut = bytes(season_lut)
+
+        self.max_base: Dict[str, int] = {}
+        self._tables: Dict[str, array] = {}
+        self._extra: Dict[str, Tuple[int, ...]] = {}
+        self._child: Dict[str, Tuple[int, ...]] = {}
+        for key, kind in _KINDS.items():
+            table, extras, children = array("q"), [], []
+            for number, season in enumerate([{}] + list(seasons)):
+                section = merge_config(config.get(key) or {}, season.get(key) or {})
+                where = key if not number else f"seasons[{number - 1}].{key}"
+                max_base, bases = _base_rows(section, types, where)
+                if number and kind in self.max_base and max_base != self.max_base[kind]:
+                    raise ValueError(f"{where}: maxBasePeople no puede cambiar por temporada")
+                self.max_base[kind] = max_base
+                for base, extra, child in zip(bases, _by_type(section, "extraAdult", types, where),
+                                              _by_type(section, "child", types, where)):
+                    extra, child = _amount(extra, f"{where}.extraAdult"), _amount(child, f"{where}.child")
+                    extras.append(extra)
+                    children.append(child)
+                    for adults in range(MAX_ADULTS + 1):
+                        adult_price = base[min(adults, max_base)] + max(0, adults - max_base) * extra
+                        table.extend(adult_price + n * child for n in range(MAX_CHILDREN + 1))
+            self._tables[kind] = table
+            self._extra[kind] = tuple(extras)
+            self._child[kind] = tuple(children)
+        self._arrays: Dict[str, Tuple] = {}
+        self._rows: Dict[date, int] = {}  # fila de cada fecha ya clasificada (sin festivo forzado)
+
+    def __repr__(self) -> str:
+        return f"RateTable(day_types={self.day_types}, seasons={self.seasons[1:]})"
+
+    # -- escalar -------------------------------------------------------
+
+    def season(self, day: date) -> int:
+        """Índice de la temporada de ``day`` (0 = sin temporada)."""
+        if self._dated:
+            number = self._dated.get(day.toordinal())
+            if number is not None:
+                return number
+        return self._season_lut[_MONTH_START[day.month] + day.day - 1]
+
+    def row(self, day: date, is_holiday: bool = False) -> int:
+        """Fila de la tabla para ``day``: temporada * tipos de día + tipo de día."""
+        if not is_holiday:
+            row = self._rows.get(day)
+            if row is not None:
+                return row
+        holiday = bool(is_holiday) or is_public_holiday(day)
+        row = self.season(day) * len(self.day_types) + self._type_lut[day.weekday() * 2 + holiday]
+        if not is_holiday:
+            if len(self._rows) >= ROW_CACHE_SIZE:
+                self._rows.clear()
+            self._rows[day] = row
+        return row
+
+    def price(self, kind: str, row: int, num_people: int, num_children: int) -> int:
+        """Precio de una noche en la fila ``row``."""
+        adults = max(num_people, 0)  # sin adultos no hay adicionales negativos
+        if adults <= MAX_ADULTS and 0 <= num_children <= MAX_CHILDREN:
+            return self._tables[kind][(row * (MAX_ADULTS + 1) + adults) * (MAX_CHILDREN + 1) + num_children]
+        a, c = min(adults, MAX_ADULTS), min(max(num_children, 0), MAX_CHILDREN)
+        return (self._tables[kind][(row * (MAX_ADULTS + 1) + a) * (MAX_CHILDREN + 1) + c]
+                + (adults - a) * self._extra[kind][row] + (num_children - c) * self._child[kind][row])
+
+    def night(self, kind: str, num_people: int, num_children: int, day: date, is_holiday: bool = False) -> int:
+        """Precio de la noche de ``day`` (festivos de Colombia incluidos; ``is_holiday`` fuerza la tarifa festiva)."""
+        row = None if is_holiday else self._rows.get(day)
+        if row is None:
+            row = self.row(day, is_holiday)
+        if 0 <= num_people <= MAX_ADULTS and 0 <= num_children <= MAX_CHILDREN:
+            return self._tables[kind][(row * (MAX_ADULTS + 1) + num_people) * (MAX_CHILDREN + 1) + num_children]
+        return self.price(kind, row, num_people, num_children)
+
+    # -- vectorizado ---------------------------------------------------
+
+    def rows(self, dates: "np.ndarray", is_holiday=False) -> "np.ndarray":
+        """``row`` de cada fecha (datetime64[D]) de una vez."""
+        import numpy as np
+
+        from ohanna.holidays import holiday_mask
+
+        days = dates.astype("datetime64[D]")
+        weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 fue jueves; 0 = lunes
+        holiday = np.asarray(is_holiday, dtype=bool) | holiday_mask(days)
+        types = np.frombuffer(self._type_lut, dtype=np.uint8)[weekday * 2 + holiday].astype(np.int64)
+        if len(self.seasons) == 1:
+            return types
+        months = days.astype("datetime64[M]")
+        position = np.asarray(_MONTH_START)[months.astype(np.int64) % 12 + 1] + (days - months).astype(np.int64)
+        seasons = np.frombuffer(self._season_lut, dtype=np.uint8)[position].astype(np.int64)
+        if self._dated:
+            keys = np.array(sorted(self._dated), dtype=np.int64)
+            values = np.array([self._dated[k] for k in keys.tolist()], dtype=np.int64)
+            ordinal = days.astype(np.int64) + _EPOCH_ORDINAL
+            i = np.minimum(np.searchsorted(keys, ordinal), len(keys) - 1)
+            seasons = np.where(keys[i] == ordinal, values[i], seasons)
+        return seasons * len(self.day_types) + types
+
+    def arrays(self, kind: str):
+        """(tabla[fila, adultos, niños], adicional[fila], niño[fila]) como arreglos de NumPy."""
+        cached = self._arrays.get(kind)
+        if cached is None:
+            import numpy as np
+
+            table = np.frombuffer(self._tables[kind], dtype=np.int64).reshape(-1, MAX_ADULTS + 1, MAX_CHILDREN + 1)
+            cached = self._arrays[kind] = (
+                table, np.array(self._extra[kind], dtype=np.int64), np.array(self._child[kind], dtype=np.int64),
+            )
+        return cached
+
+    def describe(self, kind: str) -> List[Dict]:
+        """Una fila por (temporada, tipo de día) con la tarifa base por adultos, el adicional y el niño."""
+        top = self.max_base[kind]
+        result = []
+        for row in range(len(self.seasons) * len(self.day_types)):
+            season, day_type = divmod(row, len(self.day_types))
+            result.append({
+                "temporada": self.seasons[season] or "general", "tipo": self.day_types[day_type],
+                "base": [self.price(kind, row, adults, 0) for adults in range(top + 1)],
+                "adicional": self._extra[kind][row], "niño": self._child[kind][row],
+            })
+        return result
+
+
+def compile_rates(config: Dict) -> RateTable:
+    """Valida ``config`` y arma su tabla; lanza ``ValueError`` si algo no cuadra."""
+    try:
+        return RateTable(config)
+    except (TypeError, AttributeError) as e:
+        raise ValueError(f"tarifas inválidas: {e}") from None
+
+
+def load_rates(path: str, base: Optional[Dict] = None) -> RateTable:
+    """Compila el JSON de ``path`` encima de ``base`` (por defecto, ``DEFAULT_CONFIG``)."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return compile_rates(merge_config(base if base is not None else DEFAULT_CONFIG, data))
+
+
+DEFAULT_RATES = compile_rates(DEFAULT_CONFIG)
+
+
+class RateSource:
+    """Tarifas vigentes de una propiedad.
+
+    Con ``path`` revisa el archivo como mucho cada ``check_interval``
+    segundos y lo recompila si cambió (fecha de modificación o tamaño). Si la
+    versión nueva no es válida se sigue con la anterior y el motivo queda en
+    ``error``. Sin ``path`` retorna siempre ``fixed``.
+    """
+
+    check_interval = 1.0
+
+    def __init__(self, path: Optional[str] = None, fixed: RateTable = DEFAULT_RATES):
+        self.path = path
+        self.error: Optional[str] = None
+        self.revision = 0  # cuántas veces se cargó el archivo
+        self._table = fixed
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        if path:
+            self._stamp = self._file_stamp()
+            self._table = load_rates(path)  # al arrancar, un archivo inválido es un error
+            self.revision = 1
+
+    def _file_stamp(self) -> Tuple[int, int]:
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @property
+    def table(self) -> RateTable:
+        if self.path and time.monotonic() - self._checked >= self.check_interval:
+            self.reload()
+        return self._table
+
+    def reload(self, force: bool = False) -> bool:
+        """Recompila si el archivo cambió; retorna True si se cargó una versión nueva."""
+        with self._lock:
+            self._checked = time.monotonic()
+            try:
+                stamp = self._file_stamp()
+            except OSError as e:
+                self.error = f"{self.path}: {e}"
+                return False
+            if stamp == self._stamp and not force:
+                return False
+            try:
+                table = load_rates(self.path)
+            except (OSError, ValueError) as e:
+                # no se vuelve a intentar hasta que el archivo cambie otra vez
+                self._stamp, self.error = stamp, f"{self.path}: {e}"
+                return False
+            self._table, self._stamp, self.error = table, stamp, None
+            self.revision += 1
+            return True
+
+
+DEFAULT_SOURCE = RateSource()
@@ -0,0 +1,179 @@
+"""HTML del calendario mensual.
+
+``cell_html`` arma una celda (la usan los dos modos del calendario) y
+``month_html`` arma el mes completo como un solo bloque: cabecera L..D más
+las 42 celdas, cada una con ``data-date`` para que el componente devuelva el
+clic por un único canal (como ``components/CalendarGrid.tsx``).
+
+``MonthViewCache`` guarda las vistas ya calculadas por (año, mes, versión de
+los datos), así una ejecución que no cambió reservas no vuelve a armarlas.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from html import escape
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ohanna.helpers import format_currency, format_date_key, get_days_in_month
+from ohanna.holidays import holiday_name
+from ohanna.models import HOSPEDAJE, Booking
+from ohanna.pricing import DEFAULT_RATES, RateTable, calculate_hospedaje_price
+
+WEEKDAYS = ["L", "M", "X", "J", "V", "S", "D"]
+
+CALENDAR_CSS = """
+.calendar-cell {
+    border: 1px solid #e2e8f0;
+    border-radius: 0.5rem;
+    padding: 0.5rem;
+    min-height: 100px;
+    background-color: white;
+}
+.occupied {
+    background-color: #f1f5f9;
+}
+.holiday {
+    background-color: #fff1f2;
+    border-color: #ffe4e6;
+}
+.weekend {
+    color: #4f46e5;
+    font-weight: bold;
+}
+.hospedaje-tag {
+    background-color: #d1fae5;
+    color: #065f46;
+    border: 1px solid #a7f3d0;
+    border-radius: 0.375rem;
+    padding: 0.125rem 0.375rem;
+    font-size: 0.7rem;
+    font-weight: 600;
+}
+.pasadia-tag {
+    background-color: #e0f2fe;
+    color: #075985;
+    border: 1px solid #bae6fd;
+    border-radius: 0.375rem;
+    padding: 0.125rem 0.375rem;
+    font-size: 0.7rem;
+    font-weight: 600;
+}
+"""
+
+# estilos extra del modo de un solo bloque
+GRID_CSS = """
+.calendar-grid {
+    display: grid;
+    grid-template-columns: repeat(7, minmax(0, 1fr));
+    gap: 0.5rem;
+    font-family: sans-serif;
+}
+.calendar-head {
+    text-align: center;
+    font-weight: bold;
+    color: #94a3b8;
+}
+.calendar-cell[data-date] {
+    cursor: pointer;
+    overflow: hidden;
+}
+.calendar-cell[data-date]:hover {
+    border-color: #818cf8;
+}
+"""
+
+# Monta el HTML recibido en ``data`` y devuelve el día clickeado como trigger ``clicked``
+CALENDAR_JS = """
+export default function(component) {
+    const { data, setTriggerValue, parentElement } = component;
+    let root = parentElement.querySelector('.calendar-root');
+    if (!root) {
+        root = document.createElement('div');
+        root.className = 'calendar-root';
+        parentElement.appendChild(root);
+    }
+    root.innerHTML = data;
+    root.onclick = (e) => {
+        const cell = e.target.closest('[data-date]');
+        if (cell) {
+            setTriggerValue('clicked', cell.dataset.date);
+        }
+    };
+}
+"""
+
+EMPTY_CELL_HTML = "<div class='calendar-cell' style='background-color: #f8fafc;'></div>"
+
+
+def grid_cells(year: int, month: int) -> List[Optional[date]]:
+    """Las 42 celdas (6 semanas, desde el lunes) del mes; None en el relleno."""
+    days = get_days_in_month(year, month)
+    cells: List[Optional[date]] = [None] * days[0].weekday()
+    cells.extend(days)
+    cells.extend([None] * (42 - len(cells)))
+    return cells
+
+
+def cell_html(cell_date: date, booking: Optional[Booking], rates: RateTable = DEFAULT_RATES) -> str:
+    """HTML de la celda de un día, con la reserva que lo ocupa o su precio base según ``rates``."""
+    is_weekend = cell_date.weekday() >= 5  # sábado o domingo
+    festivo = holiday_name(cell_date)
+    css_class = "occupied" if booking else "holiday" if festivo else ""
+    content = f"<div class='calendar-cell {css_class}' title='{escape(festivo)}' data-date='{format_date_key(cell_date)}'>"
+    content += "<div style='display: flex; justify-content: space-between;'>"
+    content += f"<span class='{'weekend' if is_weekend or festivo else ''}'>{cell_date.day}</span>"
+    if not booking:
+        # precio base del día (para 2 adultos, 0 niños; incluye festivos)
+        base = calculate_hospedaje_price(2, 0, cell_date, rates=rates)
+        content += f"<span style='font-size: 0.6rem; color: #94a3b8;'>{format_currency(base)}</span>"
+    content += "</div>"
+    if booking:
+        tag_class = "hospedaje-tag" if booking.type == HOSPEDAJE else "pasadia-tag"
+        content += f"<div class='{tag_class}' style='margin-top: 4px;'>{booking.type}</div>"
+        content += f"<div style='font-size: 0.7rem; margin-top: 2px;'>{escape(booking.guest_name or 'Ocupado')}</div>"
+    content += "</div>"
+    return content
+
+
+def month_html(cell_htmls: List[str]) -> str:
+    """El mes completo como un solo bloque HTML a partir de las 42 celdas."""
+    head = "".join(f"<div class='calendar-head'>{d}</div>" for d in WEEKDAYS)
+    return f"<div class='calendar-grid'>{head}{''.join(cell_htmls)}</div>"
+
+
+@dataclass(slots=True)
+class MonthView:
+    """Todo lo que el calendario necesita de un mes, ya calculado."""
+    year: int
+    month: int
+    cells: List[Optional[date]]
+    occupancy: Dict[date, Booking]
+    cell_htmls: List[str]
+    html: str
+
+
+def build_month_view(year: int, month: int, occupancy: Dict[date, Booking],
+                     rates: RateTable = DEFAULT_RATES) -> MonthView:
+    cells = grid_cells(year, month)
+    cell_htmls = [EMPTY_CELL_HTML if d is None else cell_html(d, occupancy.get(d), rates) for d in cells]
+    return MonthView(year, month, cells, occupancy, cell_htmls, month_html(cell_htmls))
+
+
+class MonthViewCache:
+    """Caché LRU de vistas mensuales por (año, mes, versión de los datos)."""
+
+    def __init__(self, maxsize: int = 24):
+        self.maxsize = maxsize
+        self._views: "OrderedDict[Tuple[int, int, int], MonthView]" = OrderedDict()
+
+    def get(self, year: int, month: int, version: int, build: Callable[[], MonthView]) -> MonthView:
+        """Retorna la vista en caché o la construye con ``build``."""
+        key = (year, month, version)
+        view = self._views.get(key)
+        if view is not None:
+            self._views.move_to_end(key)
+            return view
+        view = self._views[key] = build()
+        if len(self._views) > self.maxsize:
+            self._views.popitem(last=False)
+        return view
@@ -0,0 +1,227 @@
+"""Store compartido entre sesiones con concurrencia optimista.
+
+``SharedStore`` envuelve un backend (``MemoryStore`` o ``SQLiteStore``) para
+que todas las sesiones del proceso vean los mismos datos. Las lecturas se
+hacen en paralelo y las escrituras son exclusivas (``ReadWriteLock``). Cada
+reserva tiene una revisión: ``save`` y ``delete`` reciben la revisión que el
+usuario vio al abrirla y rechazan la operación con ``StaleBookingError`` si
+otra sesión la cambió antes (compare-and-swap).
+
+Cada escritura queda en un registro de cambios con número de secuencia; las
+sesiones consultan ``changes_since`` para saber qué meses refrescar.
+
+Los índices del backend (agregados, libro, disponibilidad, huéspedes) no se
+exponen: se consultan con métodos (``month_stats``, ``conflicts``, ...) que
+leen bajo el lock y retornan copias, así nadie recorre una estructura que un
+escritor está cambiando.
+"""
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import date
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from ohanna.aggregates import MonthKey, MonthStats, months_touched
+from ohanna.guests import GuestRecord
+from ohanna.models import Booking
+from ohanna.storage import BookingStore
+
+
+class StaleBookingError(ValueError):
+    """La reserva cambió desde que se leyó; hay que recargarla antes de guardar."""
+
+    def __init__(self, booking_id: str, expected: Optional[int], current: Optional[int]):
+        self.booking_id = booking_id
+        self.expected = expected
+        self.current = current
+        super().__init__(f"La reserva {booking_id} cambió (revisión {expected} -> {current})")
+
+
+class ReadWriteLock:
+    """Muchos lectores a la vez o un solo escritor; los escritores tienen prioridad."""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def reading(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def writing(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class SharedStore:
+    """Store de proceso con revisiones por reserva y registro de cambios."""
+
+    def __init__(self, backend: BookingStore, history: int = 1000):
+        self.backend = backend
+        self._lock = ReadWriteLock()
+        # id -> revisión; las reservas cargadas al iniciar tienen revisión 0
+        self._revisions: Dict[str, int] = {}
+        self._seq = 0
+        self._changes: Deque[Tuple[int, Set[MonthKey]]] = deque(maxlen=history)
+
+    # -- lectura -------------------------------------------------------
+
+    @contextmanager
+    def reading(self):
+        """Bloque de lecturas consistentes (agregados, libro, vistas)."""
+        with self._lock.reading():
+            yield self.backend
+
+    @property
+    def version(self) -> int:
+        return self.backend.version
+
+    def month_version(self, year: int, month: int) -> int:
+        return self.backend.month_version(year, month)
+
+    def all(self) -> List[Booking]:
+        with self._lock.reading():
+            return self.backend.all()
+
+    def get(self, booking_id: str) -> Optional[Booking]:
+        with self._lock.reading():
+            return self.backend.get(booking_id)
+
+    def bookings_between(self, first, last) -> List[Booking]:
+        with self._lock.reading():
+            return self.backend.bookings_between(first, last)
+
+    def bookings_for_month(self, year: int, month: int) -> List[Booking]:
+        with self._lock.reading():
+            return self.backend.bookings_for_month(year, month)
+
+    def month_stats(self, year: int, month: int) -> MonthStats:
+        with self._lock.reading():
+            return self.backend.month_stats(year, month)
+
+    def method_totals(self, year: int, month: int) -> Dict[str, int]:
+        with self._lock.reading():
+            return self.backend.method_totals(year, month)
+
+    def payment_totals(self, first: date, last: date) -> Dict[str, int]:
+        with self._lock.reading():
+            return self.backend.payment_totals(first, last)
+
+    def payment_report(self, first: date, last: date, freq: str = "M"):
+        with self._lock.reading():
+            return self.backend.payment_report(first, last, freq)
+
+    def conflicts(self, start: date, end: date, exclude_id: Optional[str] = None) -> List[str]:
+        with self._lock.reading():
+            return self.backend.conflicts(start, end, exclude_id)
+
+    def next_free_ranges(self, after: date, nights: int, count: int = 3,
+                         exclude_id: Optional[str] = None) -> List[Tuple[date, date]]:
+        with self._lock.reading():
+            return self.backend.next_free_ranges(after, nights, count, exclude_id)
+
+    def search_guests(self, query: str, limit: int = 10) -> List[GuestRecord]:
+        """Copias de los registros: sus estadías se pueden recorrer fuera del lock."""
+        with self._lock.reading():  # la primera consulta arma el directorio
+            return [replace(r, stays=dict(r.stays)) for r in self.backend.search_guests(query, limit)]
+
+    def revision(self, booking_id: str) -> Optional[int]:
+        """Revisión actual de la reserva, o None si no existe."""
+        with self._lock.reading():
+            return self._current_revision(booking_id)
+
+    def changes_since(self, seq: int) -> Tuple[int, Optional[Set[MonthKey]]]:
+        """Retorna (secuencia actual, meses cambiados desde ``seq``).
+
+        Los meses son None si ``seq`` es más viejo que el registro guardado;
+        en ese caso conviene refrescar todo.
+        """
+        with self._lock.reading():
+            current = self._seq
+            if seq >= current:
+                return current, set()
+            if not self._changes or self._changes[0][0] > seq + 1:
+                return current, None
+            months: Set[MonthKey] = set()
+            for change_seq, changed in reversed(self._changes):
+                if change_seq <= seq:
+                    break
+                months |= changed
+            return current, months
+
+    # -- escritura -----------------------------------------------------
+
+    def _current_revision(self, booking_id: str) -> Optional[int]:
+        if booking_id in self._revisions:
+            return self._revisions[booking_id]
+        return 0 if self.backend.get(booking_id) is not None else None
+
+    def _record(self, *bookings: Optional[Booking]) -> None:
+        months: Set[MonthKey] = set()
+        for b in bookings:
+            if b is not None:
+                months.update(months_touched(b))
+        self._seq += 1
+        self._changes.append((self._seq, months))
+
+    def save(self, booking: Booking, expected_revision: Optional[int] = None) -> int:
+        """Guarda si la revisión actual es ``expected_revision`` (None = reserva nueva).
+
+        Retorna la nueva revisión. Lanza ``StaleBookingError`` o, si hay cruce
+        de fechas, ``BookingConflictError``.
+        """
+        with self._lock.writing():
+            current = self._current_revision(booking.id)
+            if current != expected_revision:
+                raise StaleBookingError(booking.id, expected_revision, current)
+            old = self.backend.get(booking.id)
+            self.backend.save(booking)
+            self._revisions[booking.id] = (current or 0) + 1
+            self._record(old, booking)
+            return self._revisions[booking.id]
+
+    def save_many(self, bookings: Iterable[Booking]) -> None:
+        """Carga masiva sin control de revisiones ni de cruces."""
+        bookings = list(bookings)
+        with self._lock.writing():
+            # una sola lectura de las versiones anteriores, que el backend reutiliza
+            previous = self.backend.get_many(b.id for b in bookings)
+            self.backend.save_many(bookings, previous)
+            for b in bookings:
+                self._revisions[b.id] = (self._revisions.get(b.id) or 0) + 1
+            self._record(*previous.values(), *bookings)
+
+    def delete(self, booking_id: str, expected_revision: Optional[int] = None) -> None:
+        """Elimina si la revisión actual es ``expected_revision``."""
+        with self._lock.writing():
+            current = self._current_revision(booking_id)
+            if current != expected_revision:
+                raise StaleBookingError(booking_id, expected_revision, current)
+            old = self.backend.get(booking_id)
+            self.backend.delete(booking_id)
+            self._revisions.pop(booking_id, None)
+            self._record(old)
@@ -0,0 +1,555 @@
+"""Almacenamiento de reservas.
+
+``BookingStore`` define la interfaz que usa la app; ``MemoryStore`` conserva
+el comportamiento original (lista en memoria por sesión) y ``SQLiteStore``
+persiste en un archivo SQLite en modo WAL con consultas por rango indexadas.
+
+Los índices derivados (``aggregates``, ``ledger``, ``availability`` y
+``guests``) se arman la primera vez que se usan y desde ahí cada escritura
+los mantiene al día; abrir un store no recorre las reservas. Las consultas
+(``month_stats``, ``conflicts``, ``payment_totals``, ...) usan los índices;
+``SQLiteStore`` las responde con SQL acotado por fechas mientras el índice
+no esté armado, así un proceso corto (la línea de comandos) nunca los arma.
+"""
+import calendar
+import json
+import sqlite3
+import threading
+from contextlib import closing, nullcontext
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ohanna.aggregates import MonthKey, MonthlyAggregates, MonthStats, months_touched
+from ohanna.availability import AvailabilityIndex, BookingConflictError, free_ranges, occupied_range
+from ohanna.guests import GuestDirectory, GuestRecord
+from ohanna.ledger import PaymentLedger
+from ohanna.models import PASADIA, Booking, Expense, Guest, Payment, parse_date
+
+
+def month_bounds(year: int, month: int):
+    """Retorna (primer día, último día) del mes."""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+class BookingStore:
+    """Interfaz común de los backends de reservas.
+
+    Las subclases implementan ``_write`` y ``_remove``; ``save``,
+    ``save_many`` y ``delete`` actualizan además los agregados mensuales, el
+    libro de pagos, el índice de disponibilidad y el directorio de
+    huéspedes (los que ya se armaron), e incrementan ``version`` y
+    la versión de cada mes afectado (las vistas en caché se invalidan
+    comparando ``month_version``).
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._month_versions: Dict[MonthKey, int] = {}
+        self._aggregates: Optional[MonthlyAggregates] = None
+        self._ledger: Optional[PaymentLedger] = None
+        self._availability: Optional[AvailabilityIndex] = None
+        self._guests: Optional[GuestDirectory] = None
+        self._build_lock = threading.Lock()
+
+    def _derived(self, name: str, build):
+        """Índice derivado ``name``; se arma con todas las reservas la primera vez que se pide."""
+        index = getattr(self, name)
+        if index is None:
+            with self._build_lock:
+                index = getattr(self, name)
+                if index is None:
+                    index = build(self.all())
+                    setattr(self, name, index)
+        return index
+
+    @property
+    def aggregates(self) -> MonthlyAggregates:
+        return self._derived("_aggregates", MonthlyAggregates)
+
+    @property
+    def ledger(self) -> PaymentLedger:
+        return self._derived("_ledger", PaymentLedger)
+
+    @property
+    def availability(self) -> AvailabilityIndex:
+        return self._derived("_availability", AvailabilityIndex)
+
+    @property
+    def guests(self) -> GuestDirectory:
+        return self._derived("_guests", GuestDirectory)
+
+    def month_version(self, year: int, month: int) -> int:
+        """Número que cambia cada vez que se modifica una reserva que toca el mes."""
+        return self._month_versions.get((year, month), 0)
+
+    def _touch(self, booking: Optional[Booking]) -> None:
+        if booking is not None:
+            for key in months_touched(booking):
+                self._month_versions[key] = self._month_versions.get(key, 0) + 1
+
+    def all(self) -> List[Booking]:
+        raise NotImplementedError
+
+    def get(self, booking_id: str) -> Optional[Booking]:
+        raise NotImplementedError
+
+    def get_many(self, booking_ids: Iterable[str]) -> Dict[str, Booking]:
+        """Las reservas existentes de ``booking_ids``, por id."""
+        found = {}
+        for booking_id in booking_ids:
+            booking = self.get(booking_id)
+            if booking is not None:
+                found[booking_id] = booking
+        return found
+
+    def _write(self, bookings: List[Booking]) -> None:
+        raise NotImplementedError
+
+    def _remove(self, booking_id: str) -> None:
+        raise NotImplementedError
+
+    def save(self, booking: Booking) -> None:
+        """Inserta o reemplaza la reserva con el mismo id.
+
+        Lanza ``BookingConflictError`` si se cruza con otra reserva.
+        """
+        conflicts = self.conflicts(*occupied_range(booking), exclude_id=booking.id)
+        if conflicts:
+            raise BookingConflictError(booking, conflicts)
+        self.save_many([booking])
+
+    def save_many(self, bookings: Iterable[Booking], previous: Optional[Dict[str, Booking]] = None) -> None:
+        """Upsert de varias reservas en una sola escritura (sin validar cruces).
+
+        ``previous`` son las versiones guardadas (``get_many``) si el llamador ya las leyó.
+        """
+        bookings = list(bookings)
+        latest = {b.id: b for b in bookings}  # si un id se repite, gana la última
+        found = self.get_many(latest) if previous is None else previous
+        previous = {booking_id: found.get(booking_id) for booking_id in latest}
+        self._write(bookings)
+        self.version += 1
+        olds = [old for old in previous.values() if old is not None]
+        for booking_id, new in latest.items():
+            self._touch(previous[booking_id])
+            self._touch(new)
+        if self._aggregates is not None:
+            for booking_id, new in latest.items():
+                self._aggregates.replace(previous[booking_id], new)
+        for index in (self._ledger, self._availability, self._guests):
+            if index is not None:
+                index.replace_many(olds, latest.values())
+
+    def delete(self, booking_id: str) -> None:
+        old = self.get(booking_id)
+        self._remove(booking_id)
+        self.version += 1
+        self._touch(old)
+        for index in (self._aggregates, self._ledger, self._availability, self._guests):
+            if index is not None:
+                index.replace(old, None)
+
+    def bookings_between(self, first: date, last: date) -> List[Booking]:
+        """Reservas con ``start <= last`` y ``end >= first``, en orden de creación."""
+        raise NotImplementedError
+
+    def bookings_for_month(self, year: int, month: int) -> List[Booking]:
+        """Reservas que tocan el mes indicado (inicio, fin o rango)."""
+        return self.bookings_between(*month_bounds(year, month))
+
+    # -- consultas -------------------------------------------------------
+
+    def month_stats(self, year: int, month: int) -> MonthStats:
+        """Estadísticas del mes (ver ``MonthlyAggregates``)."""
+        return self.aggregates.month(year, month)
+
+    def method_totals(self, year: int, month: int) -> Dict[str, int]:
+        """Recaudo del mes por método de pago."""
+        return self.aggregates.method_totals(year, month)
+
+    def payment_totals(self, first: date, last: date) -> Dict[str, int]:
+        """Recaudo por método de pago entre ``first`` y ``last`` (inclusive)."""
+        return self.ledger.totals_by_method(first, last)
+
+    def payment_report(self, first: date, last: date, freq: str = "M"):
+        """Reporte de caja por período (ver ``PaymentLedger.report``)."""
+        return self.ledger.report(first, last, freq)
+
+    def conflicts(self, start: date, end: date, exclude_id: Optional[str] = None) -> List[str]:
+        """Ids de las reservas que ocupan algún día de ``[start, end)``."""
+        return self.availability.conflicts(start, end, exclude_id)
+
+    def next_free_ranges(self, after: date, nights: int, count: int = 3,
+                         exclude_id: Optional[str] = None) -> List[Tuple[date, date]]:
+        """Próximos rangos libres (ver ``ohanna.availability.free_ranges``)."""
+        return self.availability.next_free_ranges(after, nights, count, exclude_id)
+
+    def search_guests(self, query: str, limit: int = 10) -> List[GuestRecord]:
+        """Huéspedes cuyo nombre o documento empieza por ``query``."""
+        return self.guests.search(query, limit)
+
+
+class MemoryStore(BookingStore):
+    """Reservas en memoria; equivale al ``st.session_state.bookings`` original.
+
+    Se guardan en un dict por id (que conserva el orden de creación), así
+    ``get`` y el upsert no recorren la lista completa.
+    """
+
+    def __init__(self, bookings: Iterable[Booking] = ()):
+        super().__init__()
+        self._bookings: Dict[str, Booking] = {b.id: b for b in bookings}
+
+    def all(self) -> List[Booking]:
+        return list(self._bookings.values())
+
+    def get(self, booking_id: str) -> Optional[Booking]:
+        return self._bookings.get(booking_id)
+
+    def get_many(self, booking_ids: Iterable[str]) -> Dict[str, Booking]:
+        return {i: self._bookings[i] for i in booking_ids if i in self._bookings}
+
+    def _write(self, bookings: List[Booking]) -> None:
+        # una reserva existente conserva su posición
+        for booking in bookings:
+            self._bookings[booking.id] = booking
+
+    def _remove(self, booking_id: str) -> None:
+        self._bookings.pop(booking_id, None)
+
+    def bookings_between(self, first: date, last: date) -> List[Booking]:
+        return [b for b in self._bookings.values() if b.start_date <= last and b.end_date >= first]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bookings (
+    id TEXT PRIMARY KEY,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    num_people INTEGER NOT NULL,
+    num_children INTEGER NOT NULL,
+    total_price INTEGER NOT NULL,
+    discount INTEGER NOT NULL,
+    deposit INTEGER NOT NULL,
+    balance INTEGER NOT NULL,
+    cleaning_total INTEGER NOT NULL,
+    cleaning_deposit INTEGER NOT NULL,
+    cleaning_balance INTEGER NOT NULL,
+    payment_method TEXT,
+    schedule TEXT,
+    is_holiday INTEGER,
+    expenses TEXT NOT NULL DEFAULT '[]',
+    extra TEXT NOT NULL DEFAULT '{}',
+    absent TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_bookings_start ON bookings(start_date);
+CREATE INDEX IF NOT EXISTS idx_bookings_end ON bookings(end_date);
+
+CREATE TABLE IF NOT EXISTS guests (
+    booking_id TEXT NOT NULL REFERENCES bookings(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    document TEXT NOT NULL,
+    PRIMARY KEY (booking_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS payments (
+    booking_id TEXT NOT NULL REFERENCES bookings(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    method TEXT NOT NULL,
+    date TEXT NOT NULL,
+    PRIMARY KEY (booking_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_payments_date ON payments(date);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_BOOKING_COLUMNS = (
+    "id, start_date, end_date, type, num_people, num_children, total_price, discount, "
+    "deposit, balance, cleaning_total, cleaning_deposit, cleaning_balance, "
+    "payment_method, schedule, is_holiday, expenses, extra, absent"
+)
+
+
+class SQLiteStore(BookingStore):
+    """Backend SQLite (modo WAL) con índices por fecha de inicio, fin y pago.
+
+    La consulta por mes acota ``start_date`` a ``[first - max_span, last]``,
+    donde ``max_span`` es la estadía más larga guardada, para que el rango
+    escaneado dependa del mes y no del tamaño del historial.
+
+    Las escrituras usan una conexión compartida protegida por un lock; cada
+    hilo lee con su propia conexión dentro de una transacción de lectura, así
+    las lecturas no se serializan entre sí (WAL permite lectores concurrentes).
+
+    Abrir no carga reservas: estadísticas del mes, recaudo, cruces y fechas
+    libres se consultan con SQL por rango de fechas hasta que algo pida el
+    índice correspondiente (y entonces se usa el índice).
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        columns = {r[1] for r in self._conn.execute("PRAGMA table_info(bookings)")}
+        if "absent" not in columns:
+            # bases creadas antes de ``Booking.absent``
+            self._conn.execute("ALTER TABLE bookings ADD COLUMN absent TEXT NOT NULL DEFAULT ''")
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'max_span'").fetchone()
+        self._max_span = row[0] if row else 0
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # -- lectura -------------------------------------------------------
+
+    def _reader(self):
+        """Retorna (conexión de lectura del hilo, lock a usar con ella)."""
+        if self.path == ":memory:":
+            # cada conexión a :memory: sería otra base; se lee por la compartida
+            return self._conn, self._lock
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, isolation_level=None)
+        return conn, nullcontext()
+
+    def _query(self, sql: str, params=()) -> List[Booking]:
+        """Ejecuta una consulta sobre ``bookings`` y carga las reservas en una misma lectura."""
+        conn, lock = self._reader()
+        with lock:
+            conn.execute("BEGIN")
+            try:
+                return self._load(conn, conn.execute(sql, params).fetchall())
+            finally:
+                conn.execute("COMMIT")
+
+    def _load(self, conn: sqlite3.Connection, rows) -> List[Booking]:
+        """Arma objetos Booking a partir de filas de ``bookings`` más sus hijos."""
+        if not rows:
+            return []
+        ids = [r[0] for r in rows]
+        guests: Dict[str, List[Guest]] = {i: [] for i in ids}
+        payments: Dict[str, List[Payment]] = {i: [] for i in ids}
+        # SQLite limita el número de parámetros por consulta
+        for k in range(0, len(ids), 500):
+            chunk = ids[k:k + 500]
+            marks = ",".join("?" * len(chunk))
+            for booking_id, name, document in conn.execute(
+                f"SELECT booking_id, name, document FROM guests WHERE booking_id IN ({marks}) "
+                "ORDER BY booking_id, position", chunk,
+            ):
+                guests[booking_id].append(Guest(name=name, document=document))
+            for booking_id, pid, amount, method, pay_date in conn.execute(
+                f"SELECT booking_id, id, amount, method, date FROM payments WHERE booking_id IN ({marks}) "
+                "ORDER BY booking_id, position", chunk,
+            ):
+                payments[booking_id].append(Payment(id=pid, amount=amount, method=method, date=parse_date(pay_date)))
+        result = []
+        for r in rows:
+            result.append(Booking(
+                id=r[0],
+                start_date=parse_date(r[1]),
+                end_date=parse_date(r[2]),
+                type=r[3],
+                num_people=r[4],
+                num_children=r[5],
+                guests=guests[r[0]],
+                total_price=r[6],
+                discount=r[7],
+                deposit=r[8],
+                balance=r[9],
+                expenses=[Expense.from_dict(e) for e in json.loads(r[16])],
+                payments=payments[r[0]],
+                cleaning_total=r[10],
+                cleaning_deposit=r[11],
+                cleaning_balance=r[12],
+                payment_method=r[13],
+                schedule=r[14],
+                is_holiday=None if r[15] is None else bool(r[15]),
+                extra=json.loads(r[17]),
+                absent=frozenset(r[18].split(",")) if r[18] else frozenset(),
+            ))
+        return result
+
+    def all(self) -> List[Booking]:
+        return self._query(f"SELECT {_BOOKING_COLUMNS} FROM bookings ORDER BY rowid")
+
+    def get(self, booking_id: str) -> Optional[Booking]:
+        loaded = self._query(f"SELECT {_BOOKING_COLUMNS} FROM bookings WHERE id = ?", (booking_id,))
+        return loaded[0] if loaded else None
+
+    def get_many(self, booking_ids: Iterable[str]) -> Dict[str, Booking]:
+        ids = list(dict.fromkeys(booking_ids))
+        found = {}
+        for k in range(0, len(ids), 500):  # límite de parámetros por consulta
+            chunk = ids[k:k + 500]
+            for b in self._query(f"SELECT {_BOOKING_COLUMNS} FROM bookings WHERE id IN ({','.join('?' * len(chunk))})", chunk):
+                found[b.id] = b
+        return found
+
+    def bookings_between(self, first: date, last: date) -> List[Booking]:
+        return self._query(
+            f"SELECT {_BOOKING_COLUMNS} FROM bookings "
+            "WHERE start_date BETWEEN ? AND ? AND end_date >= ? ORDER BY rowid",
+            ((first - timedelta(days=self._max_span)).isoformat(), last.isoformat(), first.isoformat()),
+        )
+
+    # -- consultas sin índice -------------------------------------------
+
+    def month_stats(self, year: int, month: int) -> MonthStats:
+        if self._aggregates is not None:
+            return super().month_stats(year, month)
+        # las estadísticas de un mes solo dependen de las reservas que lo tocan
+        return MonthlyAggregates(self.bookings_for_month(year, month)).month(year, month)
+
+    def method_totals(self, year: int, month: int) -> Dict[str, int]:
+        if self._aggregates is not None:
+            return super().method_totals(year, month)
+        return self.payment_totals(*month_bounds(year, month))
+
+    def _range_ledger(self, first: date, last: date) -> PaymentLedger:
+        """Libro con solo los pagos de ``[first, last]``, leído con SQL."""
+        conn, lock = self._reader()
+        bounds = (first.isoformat(), last.isoformat())
+        with lock:
+            rows = conn.execute(
+                "SELECT date, amount, method, booking_id FROM payments WHERE date BETWEEN ? AND ? "
+                # abonos legacy: ``deposit`` sin ``payments``, a la fecha de inicio (como ``payment_entries``)
+                "UNION ALL SELECT start_date, deposit, COALESCE(payment_method, 'No especificado'), id FROM bookings "
+                "WHERE start_date BETWEEN ? AND ? AND deposit > 0 "
+                "AND NOT EXISTS (SELECT 1 FROM payments WHERE payments.booking_id = bookings.id)",
+                bounds + bounds,
+            ).fetchall()
+        return PaymentLedger.from_rows((parse_date(day).toordinal(), amount, method, booking_id)
+                                       for day, amount, method, booking_id in rows)
+
+    def payment_totals(self, first: date, last: date) -> Dict[str, int]:
+        if self._ledger is not None:
+            return super().payment_totals(first, last)
+        return self._range_ledger(first, last).totals_by_method(first, last)
+
+    def payment_report(self, first: date, last: date, freq: str = "M"):
+        if self._ledger is not None:
+            return super().payment_report(first, last, freq)
+        return self._range_ledger(first, last).report(first, last, freq)
+
+    # [inicio, fin) ocupado, como ``occupied_range``; las estadías sin noches no ocupan días
+    _OCCUPIED = (
+        "FROM bookings WHERE start_date >= ? AND (type = ? OR end_date > start_date) AND id IS NOT ? "
+    )
+    _OCCUPIED_END = "CASE WHEN type = ? THEN date(start_date, '+1 day') ELSE end_date END"
+
+    def conflicts(self, start: date, end: date, exclude_id: Optional[str] = None) -> List[str]:
+        if self._availability is not None:
+            return super().conflicts(start, end, exclude_id)
+        conn, lock = self._reader()
+        with lock:
+            rows = conn.execute(
+                f"SELECT id {self._OCCUPIED}AND start_date < ? AND {self._OCCUPIED_END} > ? ORDER BY start_date, rowid",
+                ((start - timedelta(days=max(self._max_span, 1))).isoformat(), PASADIA, exclude_id,
+                 end.isoformat(), PASADIA, start.isoformat()),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def _occupied_from(self, after: date, exclude_id: Optional[str]) -> Iterator[Tuple[int, int]]:
+        """Intervalos ocupados (ordinales) ordenados por inicio, desde los que pueden cubrir ``after``."""
+        conn, lock = self._reader()
+        with lock:
+            cursor = conn.execute(
+                f"SELECT start_date, {self._OCCUPIED_END} {self._OCCUPIED}ORDER BY start_date, rowid",
+                (PASADIA, (after - timedelta(days=max(self._max_span, 1))).isoformat(), PASADIA, exclude_id),
+            )
+            while True:
+                rows = cursor.fetchmany(256)
+                if not rows:
+                    return
+                for start, end in rows:
+                    yield parse_date(start).toordinal(), parse_date(end).toordinal()
+
+    def next_free_ranges(self, after: date, nights: int, count: int = 3,
+                         exclude_id: Optional[str] = None) -> List[Tuple[date, date]]:
+        if self._availability is not None:
+            return super().next_free_ranges(after, nights, count, exclude_id)
+        with closing(self._occupied_from(after, exclude_id)) as intervals:
+            return free_ranges(intervals, after, nights, count)
+
+    # -- escritura -----------------------------------------------------
+
+    def _write(self, bookings: List[Booking]) -> None:
+        """Upsert transaccional de varias reservas."""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                max_span = self._max_span
+                for b in bookings:
+                    cur.execute(
+                        f"INSERT INTO bookings ({_BOOKING_COLUMNS}) VALUES ({','.join('?' * 19)}) "
+                        "ON CONFLICT(id) DO UPDATE SET "
+                        "start_date=excluded.start_date, end_date=excluded.end_date, type=excluded.type, "
+                        "num_people=excluded.num_people, num_children=excluded.num_children, "
+                        "total_price=excluded.total_price, discount=excluded.discount, "
+                        "deposit=excluded.deposit, balance=excluded.balance, "
+                        "cleaning_total=excluded.cleaning_total, cleaning_deposit=excluded.cleaning_deposit, "
+                        "cleaning_balance=excluded.cleaning_balance, payment_method=excluded.payment_method, "
+                        "schedule=excluded.schedule, is_holiday=excluded.is_holiday, "
+                        "expenses=excluded.expenses, extra=excluded.extra, absent=excluded.absent",
+                        (
+                            b.id, b.start_date.isoformat(), b.end_date.isoformat(), b.type,
+                            b.num_people, b.num_children, b.total_price, b.discount, b.deposit,
+                            b.balance, b.cleaning_total, b.cleaning_deposit, b.cleaning_balance,
+                            b.payment_method, b.schedule, None if b.is_holiday is None else int(b.is_holiday),
+                            json.dumps([e.to_dict() for e in b.expenses], ensure_ascii=False),
+                            json.dumps(b.extra, ensure_ascii=False), ",".join(sorted(b.absent)),
+                        ),
+                    )
+                    cur.execute("DELETE FROM guests WHERE booking_id = ?", (b.id,))
+                    cur.executemany(
+                        "INSERT INTO guests (booking_id, position, name, document) VALUES (?, ?, ?, ?)",
+                        [(b.id, i, g.name, g.document) for i, g in enumerate(b.guests)],
+                    )
+                    cur.execute("DELETE FROM payments WHERE booking_id = ?", (b.id,))
+                    cur.executemany(
+                        "INSERT INTO payments (booking_id, position, id, amount, method, date) VALUES (?, ?, ?, ?, ?, ?)",
+                        [(b.id, i, p.id, p.amount, p.method, p.date.isoformat()) for i, p in enumerate(b.payments)],
+                    )
+                    max_span = max(max_span, (b.end_date - b.start_date).days)
+                if max_span != self._max_span:
+                    cur.execute(
+                        "INSERT INTO meta (key, value) VALUES ('max_span', ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (max_span,),
+                    )
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+            self._max_span = max_span
+
+    def _remove(self, booking_id: str) -> None:
+        with self._lock:
+            # guests y payments se borran en cascada
+            self._conn.execute("DELETE FROM bookings WHERE id = ?", (booking_id,))
+
+
+def open_store(db_path: Optional[str] = None, journal_dir: Optional[str] = None) -> BookingStore:
+    """SQLite si hay ``db_path``, diario + snapshot si hay ``journal_dir``; si no, en memoria."""
+    if db_path:
+        return SQLiteStore(db_path)
+    if journal_dir:
+        from ohanna.journal import JournalStore  # journal importa este módulo
+
+        return JournalStore(journal_dir)
+    return MemoryStore()
@@ -0,0 +1,102 @@
+"""Generador reproducible de reservas sintéticas (para benchmarks y demos).
+
+Las reservas se reparten en una línea de tiempo sin cruces por propiedad,
+como en el calendario real: más Pasadías que Hospedajes los fines de semana, estadías
+de 1 a 5 noches, grupos de 2 a 12 personas, abonos antes de la llegada con
+los métodos de la app y descuentos ocasionales. Los precios se calculan con
+las tarifas reales (``importer.reprice``). La misma semilla produce
+siempre los mismos datos.
+
+Una sola propiedad avanza unos ``DAYS_PER_BOOKING`` días por reserva: 50.000
+reservas llegan al siglo XXV. Para historiales grandes y realistas se usan
+varias propiedades (``properties_for``), cada una con su línea de tiempo en
+el mismo rango de fechas: los meses quedan tan poblados como los de un
+consolidado de varios chalets.
+"""
+import math
+import random
+from datetime import date, timedelta
+from typing import List
+
+from ohanna.importer import reprice
+from ohanna.models import HOSPEDAJE, PASADIA, Booking, Guest, Payment
+
+PAYMENT_METHODS = ["Nequi Hernan", "Nequi Lady", "Davivienda", "DaviPlata", "Efectivo", "Otro"]
+_METHOD_WEIGHTS = [30, 25, 15, 10, 15, 5]
+_FIRST_NAMES = ["Ana", "José", "Lucía", "Andrés", "María", "Juan", "Camila", "Sebastián", "Valentina",
+                "Nicolás", "Daniela", "Santiago", "Mariana", "Alejandro", "Sofía", "Hernán"]
+_LAST_NAMES = ["Pérez", "Gómez", "Ñáñez", "López", "Rodríguez", "Martínez", "García", "Hernández",
+               "Díaz", "Muñoz", "Álvarez", "Restrepo", "Ospina", "Zuluaga", "Quintero", "Cárdenas"]
+
+
+# avance medio de una línea de tiempo por reserva (días libres + noches o pasadía)
+DAYS_PER_BOOKING = 3.5
+
+
+def properties_for(n: int, years: float) -> int:
+    """Propiedades necesarias para que ``n`` reservas quepan en unos ``years`` años."""
+    return max(1, math.ceil(n * DAYS_PER_BOOKING / (365.25 * years)))
+
+
+def _guest(rnd: random.Random) -> Guest:
+    name = f"{rnd.choice(_FIRST_NAMES)} {rnd.choice(_LAST_NAMES)} {rnd.choice(_LAST_NAMES)}"
+    return Guest(name=name, document=str(rnd.randrange(10_000_000, 1_200_000_000)))
+
+
+def generate_bookings(n: int, seed: int = 0, start: date = date(2015, 1, 1), properties: int = 1) -> List[Booking]:
+    """``n`` reservas a partir de ``start``, con precios y saldos consistentes, ordenadas por llegada.
+
+    Se reparten por turnos entre ``properties`` líneas de tiempo; dentro de
+    cada una no hay cruces (con una sola, ninguna reserva se cruza).
+    """
+    if properties < 1:
+        raise ValueError("se necesita al menos una propiedad")
+    rnd = random.Random(seed)
+    bookings: List[Booking] = []
+    cursors = [start] * properties
+    for i in range(n):
+        day = cursors[i % properties]
+        day += timedelta(days=rnd.choice((0, 0, 0, 1, 1, 2, 3, 5)))  # días libres entre reservas
+        weekend = day.weekday() >= 5
+        kind = PASADIA if rnd.random() < (0.5 if weekend else 0.3) else HOSPEDAJE
+        nights = rnd.choice((1, 1, 2, 2, 2, 3, 4, 5)) if kind == HOSPEDAJE else 0
+        end = day + timedelta(days=nights)
+        people = min(2 + int(rnd.expovariate(0.35)), 12)
+        children = rnd.choice((0, 0, 0, 1, 2, 3))
+        guests = [_guest(rnd) for _ in range(rnd.randint(1, min(people, 4)))]
+        payments = [
+            Payment(
+                id=f"pay-{i}-{k}", amount=rnd.randrange(50_000, 600_000, 10_000),
+                method=rnd.choices(PAYMENT_METHODS, _METHOD_WEIGHTS)[0],
+                date=day - timedelta(days=rnd.randint(0, 45)),
+            )
+            for k in range(rnd.choice((0, 1, 1, 2, 2, 3)))
+        ]
+        cleaning = rnd.choice((0, 80_000, 100_000, 120_000))
+        cleaning_deposit = rnd.choice((0, cleaning // 2, cleaning))
+        bookings.append(Booking(
+            id=f"syn-{seed}-{i}",
+            start_date=day,
+            end_date=end,
+            type=kind,
+            num_people=people,
+            num_children=children,
+            guests=guests,
+            total_price=0,
+            discount=rnd.choice((0, 0, 0, 0, 20_000, 50_000, 100_000)),
+            deposit=0,
+            balance=0,
+            expenses=[],
+            payments=payments,
+            cleaning_total=cleaning,
+            cleaning_deposit=cleaning_deposit,
+            cleaning_balance=0,
+            payment_method=payments[0].method if payments else None,
+            schedule="9:00 AM - 5:30 PM" if kind == PASADIA else None,
+            is_holiday=False,
+        ))
+        cursors[i % properties] = end if kind == HOSPEDAJE else day + timedelta(days=1)
+    if properties > 1:
+        bookings.sort(key=lambda b: b.start_date)
+    # precios, abonos y saldos como los calcularía la app
+    return [b for k in range(0, len(bookings), 5000) for b in reprice(bookings[k:k + 5000])]
@@ -0,0 +1,23 @@
+from datetime import date
+
+import pytest
+
+from ohanna.models import HOSPEDAJE, Booking, Guest, Payment
+
+
+def _booking(id: str, start: date, end: date, type: str = HOSPEDAJE, guest: str = "", total: int = 400000,
+             payments=(), **fields) -> Booking:
+    data = dict(
+        id=id, start_date=start, end_date=end, type=type, num_people=2, num_children=0,
+        guests=[Guest(guest)] if guest else [], total_price=total, discount=0, deposit=0, balance=total,
+        expenses=[], payments=[Payment(f"{id}-p{i}", amount, "Efectivo", day) for i, (amount, day) in enumerate(payments)],
+        cleaning_total=0, cleaning_deposit=0, cleaning_balance=0,
+    )
+    data.update(fields)
+    return Booking(**data)
+
+
+@pytest.fixture
+def make_booking():
+    """Reserva mínima: ``make_booking("a", date(2025, 6, 1), date(2025, 6, 3), guest="Ana")``."""
+    return _booking
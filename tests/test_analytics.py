@@ -0,0 +1,51 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from ohanna.analytics import Analytics
+from ohanna.models import PASADIA
+
+
+@pytest.fixture
+def analytics(make_booking):
+    return Analytics([
+        # viernes a lunes: noches de viernes (entre semana), sábado y domingo
+        make_booking("a", date(2025, 6, 6), date(2025, 6, 9), total=600000),
+        make_booking("b", date(2025, 6, 10), date(2025, 6, 10), type=PASADIA, total=300000),
+        # cruza el mes: domingo 29 y lunes 30 en junio, martes 1 en julio
+        make_booking("c", date(2025, 6, 29), date(2025, 7, 2), total=900000, discount=90000, balance=810000),
+    ])
+
+
+def test_monthly_occupancy_revenue_and_adr(analytics):
+    june, july = analytics.monthly.loc[pd.Period("2025-06")], analytics.monthly.loc[pd.Period("2025-07")]
+    assert list(analytics.monthly.index.astype(str)) == ["2025-06", "2025-07"]
+    assert (june["Días del mes"], june["Días ocupados"], june["Noches Hospedaje"], june["Pasadías"]) == (30, 6, 5, 1)
+    assert june["Ocupación"] == pytest.approx(6 / 30)
+    # "c" reparte 810.000 en 3 noches: 270.000 por noche
+    assert june["Ingresos Hospedaje"] == pytest.approx(600000 + 2 * 270000)
+    assert june["Ingresos Pasadía"] == pytest.approx(300000)
+    assert june["ADR"] == pytest.approx((600000 + 2 * 270000) / 5)
+    assert (july["Días ocupados"], july["Noches Hospedaje"], july["ADR"]) == (1, 1, pytest.approx(270000))
+    # descuentos y saldos van al mes de llegada
+    assert (june["Descuentos"], june["Saldo pendiente"], july["Descuentos"]) == (90000, 600000 + 300000 + 810000, 0)
+
+
+def test_weekend_weekday_split_counts_only_hospedaje(analytics):
+    june, july = analytics.monthly.loc[pd.Period("2025-06")], analytics.monthly.loc[pd.Period("2025-07")]
+    assert (june["Noches fin de semana"], june["Noches entre semana"]) == (3, 2)
+    assert (july["Noches fin de semana"], july["Noches entre semana"]) == (0, 1)
+
+
+def test_yearly_summary_recomputes_ratios(analytics):
+    year = analytics.yearly.loc[2025]
+    assert (year["Días del mes"], year["Días ocupados"], year["Noches Hospedaje"]) == (61, 7, 6)
+    assert year["Ocupación"] == pytest.approx(7 / 61)
+    assert year["ADR"] == pytest.approx((600000 + 810000) / 6)
+    assert year["Ingresos"] == pytest.approx(600000 + 810000 + 300000)
+
+
+def test_empty_store():
+    analytics = Analytics([])
+    assert analytics.monthly.empty and analytics.yearly.empty
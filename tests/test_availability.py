@@ -0,0 +1,40 @@
+from datetime import date
+
+from ohanna.availability import AvailabilityIndex
+from ohanna.models import PASADIA
+
+
+def test_conflicts_use_occupied_days(make_booking):
+    index = AvailabilityIndex([
+        make_booking("a", date(2025, 6, 10), date(2025, 6, 13)),
+        make_booking("p", date(2025, 6, 20), date(2025, 6, 20), type=PASADIA),
+    ])
+    assert index.conflicts(date(2025, 6, 12), date(2025, 6, 14)) == ["a"]
+    assert index.conflicts(date(2025, 6, 13), date(2025, 6, 15)) == []  # el día de salida queda libre
+    assert index.conflicts(date(2025, 6, 20), date(2025, 6, 21)) == ["p"]
+    assert index.conflicts(date(2025, 6, 10), date(2025, 6, 11), exclude_id="a") == []
+
+
+def test_next_free_ranges_one_per_gap(make_booking):
+    index = AvailabilityIndex([
+        make_booking("a", date(2025, 6, 1), date(2025, 6, 5)),
+        make_booking("b", date(2025, 6, 7), date(2025, 6, 10)),
+    ])
+    assert index.next_free_ranges(date(2025, 6, 1), 2, count=3) == [
+        (date(2025, 6, 5), date(2025, 6, 7)),
+        (date(2025, 6, 10), date(2025, 6, 12)),
+    ]
+
+
+def test_next_free_ranges_skips_gaps_too_short(make_booking):
+    index = AvailabilityIndex([
+        make_booking("a", date(2025, 6, 1), date(2025, 6, 5)),
+        make_booking("b", date(2025, 6, 6), date(2025, 6, 10)),
+    ])
+    assert index.next_free_ranges(date(2025, 6, 2), 2, count=1) == [(date(2025, 6, 10), date(2025, 6, 12))]
+
+
+def test_next_free_ranges_excludes_edited_booking(make_booking):
+    index = AvailabilityIndex([make_booking("a", date(2025, 6, 1), date(2025, 6, 5))])
+    assert index.next_free_ranges(date(2025, 6, 1), 3) == [(date(2025, 6, 5), date(2025, 6, 8))]
+    assert index.next_free_ranges(date(2025, 6, 1), 3, exclude_id="a") == [(date(2025, 6, 1), date(2025, 6, 4))]
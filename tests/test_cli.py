@@ -0,0 +1,43 @@
+from datetime import date
+
+import pytest
+
+from ohanna.cli import main
+from ohanna.storage import SQLiteStore
+
+
+@pytest.fixture
+def db(tmp_path, make_booking, monkeypatch):
+    for name in ("OHANNA_DB", "OHANNA_JOURNAL", "OHANNA_PROPERTIES", "OHANNA_RATES"):
+        monkeypatch.delenv(name, raising=False)
+    path = str(tmp_path / "reservas.db")
+    store = SQLiteStore(path)
+    store.save_many([
+        make_booking("a", date(2025, 6, 13), date(2025, 6, 16), guest="Ana Pérez", payments=[(200000, date(2025, 6, 1))]),
+        make_booking("b", date(2025, 6, 20), date(2025, 6, 22), guest="Luis"),
+    ])
+    store.close()
+    return path
+
+
+def test_quote_needs_no_store(capsys):
+    assert main(["quote", "hospedaje", "2025-06-13", "2025-06-16", "--people", "5", "--children", "1"]) == 0
+    assert capsys.readouterr().out.strip().splitlines()[-1].startswith("Total:")
+
+
+def test_check_docstring_example(db, capsys, monkeypatch):
+    # con SQLite, check y month no cargan todas las reservas
+    monkeypatch.setattr(SQLiteStore, "all", lambda self: pytest.fail("se cargaron todas las reservas"))
+    assert main(["--db", db, "check", "hospedaje", "2025-06-13", "2025-06-16"]) == 1
+    out = capsys.readouterr().out
+    assert "Ana Pérez" in out and "Próximas fechas libres: 2025-06-16 a 2025-06-19" in out
+    assert main(["--db", db, "check", "hospedaje", "2025-06-13", "2025-06-16", "--exclude", "a"]) == 0
+    assert main(["--db", db, "month", "2025", "6"]) == 0
+    assert "Reservas: 2" in capsys.readouterr().out
+
+
+def test_report_and_unknown_kind(db, capsys):
+    assert main(["--db", db, "report", "2025-06-01", "2025-06-30", "--json"]) == 0
+    assert '"Efectivo": 200000' in capsys.readouterr().out
+    with pytest.raises(SystemExit):
+        main(["--db", db, "check", "2025-06-13", "2025-06-16"])
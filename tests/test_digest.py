@@ -0,0 +1,70 @@
+from datetime import date
+
+import pytest
+
+from ohanna.digest import daily_digest, porter_list, render_digest, turnover_lines, turnovers
+from ohanna.models import PASADIA, Guest
+from ohanna.storage import MemoryStore
+
+HOLIDAY = date(2025, 6, 30)  # San Pedro y San Pablo / Sagrado Corazón
+
+
+@pytest.fixture
+def store(make_booking):
+    store = MemoryStore()
+    store.save_many([
+        make_booking("h1", date(2025, 6, 27), HOLIDAY, guest="Ana", cleaning_balance=80000),
+        # pasadía del festivo: llega y sale el mismo día, entre la salida de h1 y la llegada de h2
+        make_booking("p1", HOLIDAY, HOLIDAY, type=PASADIA, guest="Luis", is_holiday=True,
+                     schedule="8:00 AM - 4:00 PM", guests=[Guest("Luis", "123"), Guest("Eva", "456")]),
+        make_booking("h2", HOLIDAY, date(2025, 7, 2), guest="Marta", balance=150000),
+        make_booking("h3", date(2025, 7, 20), date(2025, 7, 21), guest="Olga"),
+    ])
+    return store
+
+
+def test_daily_digest_groups_by_arrival_and_departure(store):
+    digest = daily_digest(store, HOLIDAY, date(2025, 7, 2))
+    assert [d.day for d in digest] == [HOLIDAY, date(2025, 7, 2)]
+    holiday = digest[0]
+    assert [b.id for b in holiday.arrivals] == ["p1", "h2"]
+    assert [b.id for b in holiday.departures] == ["h1", "p1"]
+    assert [b.id for b in digest[1].departures] == ["h2"] and digest[1].arrivals == []
+
+
+def test_same_day_turnovers(store):
+    items = turnovers(store, HOLIDAY, date(2025, 7, 2))
+    assert [(t.departing.id, t.next_arrival and t.next_arrival.id, t.same_day) for t in items] == [
+        ("h1", "p1", True),  # sale a la 1 PM y el mismo festivo llega la pasadía
+        ("p1", "h2", True),  # la pasadía no es su propia llegada siguiente
+        ("h2", "h3", False),
+    ]
+    assert [t.cleaning_balance for t in items] == [80000, 0, 0]
+    lines = list(turnover_lines(items))
+    assert "1:00 PM" in lines[0] and "hoy Luis" in lines[0]
+    assert "4:00 PM" in lines[1] and "hoy Marta" in lines[1]
+    assert "2025-07-20 Olga" in lines[2]
+
+
+def test_departure_without_next_arrival(store):
+    [last] = turnovers(store, date(2025, 7, 21), date(2025, 7, 21))
+    assert last.departing.id == "h3" and last.next_arrival is None and not last.same_day
+    assert "sin llegada próxima" in next(turnover_lines([last]))
+
+
+def test_porter_list_and_rendered_document(store):
+    digest = daily_digest(store, HOLIDAY, HOLIDAY)
+    porter = porter_list(digest, HOLIDAY, HOLIDAY, chalet="La Cumbre")
+    assert "🏠 *La Cumbre*" in porter and "*Del 2025-06-30 al 2025-06-30*" in porter
+    assert "• Luis - 123\n• Eva - 456" in porter and "• Marta - " in porter
+
+    text = render_digest(store, HOLIDAY, HOLIDAY)
+    assert "📆 *2025-06-30* — 2 llegada(s), 2 salida(s)" in text
+    assert "📅 *Ingreso:* 2025-06-30 (8:00 AM)" in text and "📅 *Salida:* 2025-06-30 (4:00 PM)" in text
+    assert "🚪 *Salida:* Ana (Hospedaje) · 1:00 PM · 💰 Saldo: $400.000 · 🧹 Aseo pendiente: $80.000" in text
+    assert text.endswith("Aseo pendiente total: $80.000")
+
+
+def test_empty_range(store):
+    text = render_digest(store, date(2025, 8, 1), date(2025, 8, 31))
+    assert text.startswith("Sin llegadas ni salidas.") and "Sin salidas." in text
@@ -0,0 +1,76 @@
+import io
+from datetime import date
+
+import pytest
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from ohanna.export import IcsFeed, csv_chunks, iter_bookings, spool
+from ohanna.importer import import_bookings
+from ohanna.models import HOSPEDAJE, Booking
+from ohanna.storage import MemoryStore
+
+
+def download_bytes(data) -> bytes:
+    """Lo que haría ``st.download_button`` con ``data``."""
+    return convert_data_to_bytes_and_infer_mime(data, RuntimeError("tipo no soportado"))[0]
+
+
+def test_spool_small_stays_in_memory():
+    f = spool(["a,b\n", b"1,2\n"])
+    assert isinstance(f, io.BytesIO)
+    assert download_bytes(f) == b"a,b\n1,2\n"
+
+
+def test_spool_large_spills_to_disk_and_is_downloadable():
+    chunks = [b"x" * 1000 for _ in range(50)]
+    f = spool(iter(chunks), max_memory=4096)
+    try:
+        assert isinstance(f, io.BufferedReader)
+        assert download_bytes(f) == b"".join(chunks)
+    finally:
+        f.close()
+
+
+@pytest.mark.parametrize("max_memory", [8 * 1024 * 1024, 64])
+def test_csv_export_through_download_button(make_booking, max_memory):
+    store = MemoryStore([
+        make_booking("a", date(2025, 6, 1), date(2025, 6, 3), guest="Ana"),
+        make_booking("b", date(2025, 7, 10), date(2025, 7, 12), guest="Luis"),
+    ])
+    data = download_bytes(spool(csv_chunks(iter_bookings(store, date(2025, 6, 1), date(2025, 6, 30))), max_memory))
+    lines = data.decode("utf-8").splitlines()
+    assert lines[0].startswith("id,startDate,endDate")
+    assert [line.split(",")[0] for line in lines[1:]] == ["a"]
+
+
+def test_csv_round_trip_keeps_absent_fields(make_booking):
+    minimal = {"id": "m", "startDate": "2025-06-01", "endDate": "2025-06-03", "type": HOSPEDAJE}
+    text = "".join(csv_chunks([Booking.from_dict(minimal), make_booking("a", date(2025, 6, 5), date(2025, 6, 7))]))
+    store = MemoryStore()
+    report = import_bookings(store, io.StringIO(text), fmt="csv", check_conflicts=False)
+    assert report.failed == 0
+    data = store.get("m").to_dict()
+    assert "guests" not in data and "expenses" not in data and "numPeople" not in data
+    assert store.get("a").num_people == 2
+
+
+def _uids(ics: str):
+    return sorted(line[4:].split("@")[0] for line in ics.splitlines() if line.startswith("UID:"))
+
+
+def test_ics_feed_honours_day_bounds_like_csv(make_booking):
+    store = MemoryStore([
+        make_booking("antes", date(2025, 5, 28), date(2025, 6, 2)),  # cruza el inicio del rango
+        make_booking("fuera-inicio", date(2025, 6, 1), date(2025, 6, 3)),
+        make_booking("dentro", date(2025, 6, 10), date(2025, 6, 12)),
+        make_booking("julio", date(2025, 7, 5), date(2025, 7, 6)),
+        make_booking("fuera-fin", date(2025, 8, 20), date(2025, 8, 22)),
+    ])
+    first, last = date(2025, 6, 5), date(2025, 8, 15)
+    feed = IcsFeed(store)
+    ics = "".join(feed.chunks(first, last))
+    expected = sorted(b.id for b in iter_bookings(store, first, last))
+    assert _uids(ics) == expected == ["dentro", "julio"]
+    # la caché de meses completos no cambia el resultado
+    assert _uids("".join(feed.chunks(first, last))) == expected
+    assert _uids("".join(feed.chunks(date(2025, 6, 1), date(2025, 6, 30)))) == ["antes", "dentro", "fuera-inicio"]
@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+
+from ohanna.guests import GuestDirectory, normalize, normalize_document
+from ohanna.models import Guest
+from ohanna.storage import MemoryStore
+
+
+@pytest.fixture
+def store(make_booking):
+    store = MemoryStore()
+    store.save_many([
+        make_booking("a", date(2024, 6, 1), date(2024, 6, 3), total=400000,
+                     guests=[Guest("Ana Pérez Gómez", "1.020.304-5"), Guest("Luis Ángel", "")]),
+        make_booking("b", date(2025, 6, 1), date(2025, 6, 3), total=500000, balance=100000,
+                     guests=[Guest("ana perez", "10203045")]),  # misma persona, otro formato
+        make_booking("c", date(2025, 7, 1), date(2025, 7, 3), guests=[Guest("Andrés Núñez", "")]),
+        make_booking("d", date(2025, 8, 1), date(2025, 8, 3), guests=[Guest("Juan Antonio", "")]),
+    ])
+    return store
+
+
+def names(records):
+    return [r.name for r in records]
+
+
+def test_normalization():
+    assert normalize("  José   ÑÁÑEZ ") == "jose nanez"
+    assert normalize_document("1.020.304-5") == "10203045"
+
+
+def test_prefix_search_by_any_word_and_document(store):
+    assert names(store.search_guests("pér")) == ["ana perez"]
+    assert names(store.search_guests("gomez")) == ["ana perez"]
+    assert names(store.search_guests("1020")) == ["ana perez"]
+    assert names(store.search_guests("10.203")) == ["ana perez"]
+    assert store.search_guests("zzz") == [] and store.search_guests("  ") == []
+
+
+@pytest.mark.parametrize("query", ["ANA PEREZ", "ána pérez", "Ana  Pérez", "angel", "ÁNGEL"])
+def test_accent_and_case_folding(store, query):
+    assert len(store.search_guests(query)) == 1
+
+
+def test_results_follow_term_order_and_limit(store):
+    # "ana perez" < "andres nunez" < "angel" < "antonio"
+    assert names(store.search_guests("an")) == ["ana perez", "Andrés Núñez", "Luis Ángel", "Juan Antonio"]
+    assert names(store.search_guests("an", limit=2)) == ["ana perez", "Andrés Núñez"]
+
+
+def test_returning_guest_is_one_record(store):
+    record = store.search_guests("ana")[0]
+    assert record.visits == 2 and record.last_visit == date(2025, 6, 1)
+    assert record.total_spent == 900000 and record.balance == 400000 + 100000
+    assert [s.booking_id for s in record.history()] == ["b", "a"]
+    assert record.as_guest() == Guest("ana perez", "10203045")
+    # el acompañante no es huésped principal: no se le cuenta el total
+    assert store.search_guests("luis")[0].total_spent == 0
+
+
+def test_delete_and_edit_update_the_index(store, make_booking):
+    store.delete("b")
+    record = store.search_guests("ana")[0]
+    assert record.visits == 1 and record.name == "Ana Pérez Gómez"
+    assert store.search_guests("gomez") != []
+    store.delete("a")
+    assert store.search_guests("ana") == [] and store.search_guests("1020") == []
+    assert store.search_guests("luis") == []
+
+    store.save(make_booking("c", date(2025, 7, 1), date(2025, 7, 3), guests=[Guest("Andrea Ruiz", "")]))
+    assert names(store.search_guests("and")) == ["Andrea Ruiz"]
+    assert store.search_guests("nunez") == []
+
+
+def test_bulk_build_matches_incremental(store):
+    bulk = GuestDirectory(store.all())
+    for query in ("a", "an", "ju", "10", "l"):
+        assert names(bulk.search(query)) == names(store.search_guests(query))
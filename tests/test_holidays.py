@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from ohanna.holidays import easter_sunday, holiday_mask, holiday_name, holidays_for_year, is_holiday
+
+# los 18 festivos de 2025 (San Pedro y Sagrado Corazón comparten el lunes 30 de junio)
+HOLIDAYS_2025 = [
+    (date(2025, 1, 1), "Año Nuevo"),
+    (date(2025, 1, 6), "Reyes Magos"),
+    (date(2025, 3, 24), "San José"),  # miércoles 19 -> lunes
+    (date(2025, 4, 17), "Jueves Santo"),
+    (date(2025, 4, 18), "Viernes Santo"),
+    (date(2025, 5, 1), "Día del Trabajo"),
+    (date(2025, 6, 2), "Ascensión del Señor"),  # Pascua + 39 (jueves 29 de mayo) -> lunes
+    (date(2025, 6, 23), "Corpus Christi"),
+    (date(2025, 6, 30), "San Pedro y San Pablo"),  # domingo 29 -> lunes
+    (date(2025, 6, 30), "Sagrado Corazón"),  # Pascua + 68 (viernes 27) -> lunes
+    (date(2025, 7, 20), "Día de la Independencia"),
+    (date(2025, 8, 7), "Batalla de Boyacá"),
+    (date(2025, 8, 18), "Asunción de la Virgen"),
+    (date(2025, 10, 13), "Día de la Raza"),
+    (date(2025, 11, 3), "Todos los Santos"),
+    (date(2025, 11, 17), "Independencia de Cartagena"),
+    (date(2025, 12, 8), "Inmaculada Concepción"),
+    (date(2025, 12, 25), "Navidad"),
+]
+
+
+def test_2025_calendar():
+    assert easter_sunday(2025) == date(2025, 4, 20)
+    holidays = holidays_for_year(2025)
+    assert list(holidays) == sorted({d for d, _ in HOLIDAYS_2025})
+    for day, name in HOLIDAYS_2025:
+        assert is_holiday(day)
+        assert name in holiday_name(day)
+    assert holiday_name(date(2025, 6, 30)) == "San Pedro y San Pablo / Sagrado Corazón"
+    assert len(HOLIDAYS_2025) == 18 and len(holidays) == 17
+    assert not is_holiday(date(2025, 3, 19)) and not is_holiday(date(2025, 6, 29))
+    assert holiday_name(date(2025, 2, 3)) == ""
+
+
+def test_easter_known_years():
+    assert [easter_sunday(y) for y in (2000, 2019, 2024, 2026, 2038)] == [
+        date(2000, 4, 23), date(2019, 4, 21), date(2024, 3, 31), date(2026, 4, 5), date(2038, 4, 25)]
+
+
+def test_mask_matches_scalar_over_several_years():
+    first = date(2019, 12, 25)
+    days = [first + timedelta(days=i) for i in range(365 * 8 + 10)]  # incluye 2020 y 2024 bisiestos
+    mask = holiday_mask(np.array(days, dtype="datetime64[D]"))
+    assert mask.tolist() == [is_holiday(d) for d in days]
+    expected = {d for y in range(2019, 2029) for d in holidays_for_year(y) if first <= d <= days[-1]}
+    assert {d for d, m in zip(days, mask) if m} == expected
@@ -0,0 +1,81 @@
+import dataclasses
+import io
+import json
+from datetime import date
+
+from ohanna.importer import import_bookings, parse_row
+from ohanna.messages import booking_json
+from ohanna.models import HOSPEDAJE, Booking
+from ohanna.pricing import nightly_breakdown
+from ohanna.storage import MemoryStore
+
+
+def _row(id: str, start: str, end: str, **fields) -> dict:
+    row = {"id": id, "startDate": start, "endDate": end, "type": HOSPEDAJE, "numPeople": 2, "numChildren": 0}
+    row.update(fields)
+    return row
+
+
+def _jsonl(*rows) -> io.StringIO:
+    return io.StringIO("".join(json.dumps(r) + "\n" for r in rows))
+
+
+def test_bad_payment_is_a_row_error_and_other_rows_load():
+    store = MemoryStore()
+    report = import_bookings(store, _jsonl(
+        _row("a", "2025-06-01", "2025-06-03"),
+        _row("b", "2025-06-05", "2025-06-07",
+             payments=[{"id": "p", "amount": "mucho", "method": "Efectivo", "date": "2025-06-01"}]),
+        _row("c", "2025-06-09", "2025-06-11", payments=[{"id": "p", "amount": 1, "method": 5, "date": "2025-06-01"}]),
+        _row("d", "2025-06-13", "2025-06-15", payments="abc"),
+        _row("e", "2025-06-17", "2025-06-19", numPeople=10 ** 30),
+    ), fmt="jsonl")
+    assert report.loaded == 1
+    assert [e.line for e in report.errors] == [2, 3, 4, 5]
+    assert "amount" in report.errors[0].message
+    assert [b.id for b in store.all()] == ["a"]
+
+
+def test_payments_set_deposit_and_balance():
+    store = MemoryStore()
+    payment = {"id": "p", "amount": "100000", "method": "Efectivo", "date": "2025-06-01"}
+    import_bookings(store, _jsonl(_row("a", "2025-06-01", "2025-06-03", payments=[payment])), fmt="jsonl")
+    b = store.get("a")
+    assert b.payments[0].amount == 100000
+    assert b.total_price == sum(p for _, p in nightly_breakdown(HOSPEDAJE, 2, 0, date(2025, 6, 1), date(2025, 6, 3)))
+    assert b.balance == b.total_price - b.discount - 100000
+
+
+def test_conflicts_with_store_and_with_earlier_rows(make_booking):
+    store = MemoryStore([make_booking("x", date(2025, 6, 1), date(2025, 6, 4))])
+    report = import_bookings(store, _jsonl(
+        _row("a", "2025-06-02", "2025-06-03"),
+        _row("b", "2025-06-10", "2025-06-12"),
+        _row("c", "2025-06-11", "2025-06-13"),
+    ), fmt="jsonl")
+    assert report.loaded == 1
+    assert [(e.line, e.message) for e in report.errors] == [(1, "se cruza con: x"), (3, "se cruza con: b")]
+
+
+def test_export_round_trip_does_not_count_children_twice(make_booking):
+    original = make_booking("a", date(2025, 6, 1), date(2025, 6, 3), guest="Ana", num_people=3, num_children=2)
+    row = json.loads(booking_json(original))
+    assert row["huespedes"] == 5
+    b = parse_row(row)
+    assert (b.num_people, b.num_children) == (3, 2)
+    # exportaciones antiguas: solo el total y los niños
+    legacy = {k: v for k, v in row.items() if k != "adultos"}
+    assert (parse_row(legacy).num_people, parse_row(legacy).num_children) == (3, 2)
+
+
+def test_import_builds_each_booking_once(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("la importación no debe reconstruir reservas")
+
+    monkeypatch.setattr(dataclasses, "replace", fail)
+    monkeypatch.setattr(Booking, "from_dict", classmethod(fail))
+    store = MemoryStore()
+    report = import_bookings(store, _jsonl(_row("a", "2025-06-01", "2025-06-03", exportedTotal=700000)), fmt="jsonl")
+    assert report.loaded == 1
+    b = store.get("a")
+    assert b.discount == b.total_price - 700000 and "exportedTotal" not in b.extra
@@ -0,0 +1,61 @@
+import os
+from datetime import date
+
+from ohanna.journal import JOURNAL_FILE, SNAPSHOT_FILE, JournalStore, decode_record, encode_record, load_journal
+
+
+def test_record_round_trip_and_crc():
+    line = encode_record({"seq": 1, "op": "del", "id": "ñ"})
+    assert decode_record(line) == {"seq": 1, "op": "del", "id": "ñ"}
+    assert decode_record(line[:-1]) is None  # truncada
+    assert decode_record(line.replace(b"del", b"dal")) is None  # dañada
+    assert decode_record(b"zzzzzzzz {}\n") is None
+
+
+def test_replay_after_reopen(tmp_path, make_booking):
+    directory = str(tmp_path)
+    store = JournalStore(directory, fsync=False)
+    store.save(make_booking("a", date(2025, 6, 1), date(2025, 6, 3), guest="Ana"))
+    store.save(make_booking("b", date(2025, 6, 5), date(2025, 6, 7)))
+    store.save(make_booking("a", date(2025, 6, 1), date(2025, 6, 4), guest="Ana"))
+    store.delete("b")
+    store.close()
+
+    reopened = JournalStore(directory, fsync=False)
+    try:
+        assert [b.id for b in reopened.all()] == ["a"]
+        assert reopened.get("a").end_date == date(2025, 6, 4)
+        assert reopened.skipped == 0
+    finally:
+        reopened.close()
+
+
+def test_corrupt_tail_is_skipped_and_rewritten(tmp_path, make_booking):
+    directory = str(tmp_path)
+    store = JournalStore(directory, fsync=False)
+    store.save(make_booking("a", date(2025, 6, 1), date(2025, 6, 3)))
+    store.close()
+    with open(os.path.join(directory, JOURNAL_FILE), "ab") as f:
+        f.write(encode_record({"seq": 2, "op": "del", "id": "a"})[:-5])  # corte de luz a mitad de línea
+
+    bookings, seq, applied, skipped = load_journal(directory)
+    assert ([b.id for b in bookings], seq, applied, skipped) == (["a"], 1, 1, 1)
+    store = JournalStore(directory, fsync=False)
+    store.save(make_booking("b", date(2025, 6, 5), date(2025, 6, 7)))
+    store.close()
+    assert load_journal(directory)[3] == 0  # al abrir se compactó: lo nuevo no queda detrás de la línea dañada
+    assert [b.id for b in load_journal(directory)[0]] == ["a", "b"]
+
+
+def test_compaction_writes_snapshot_and_replays_only_newer_records(tmp_path, make_booking):
+    directory = str(tmp_path)
+    store = JournalStore(directory, compact_every=2, fsync=False)
+    for i in range(5):
+        store.save(make_booking(f"r{i}", date(2025, 6, 1 + 3 * i), date(2025, 6, 2 + 3 * i)))
+        store.flush()
+    store.close()
+    assert os.path.exists(os.path.join(directory, SNAPSHOT_FILE))
+
+    bookings, seq, applied, skipped = load_journal(directory)
+    assert [b.id for b in bookings] == [f"r{i}" for i in range(5)]
+    assert seq == 5 and applied < 5 and skipped == 0
@@ -0,0 +1,82 @@
+from dataclasses import replace
+from datetime import date
+
+import pytest
+
+from ohanna.ledger import PaymentLedger
+from ohanna.models import Payment
+from ohanna.storage import SQLiteStore
+
+METHODS = ["Efectivo", "Nequi", "Transferencia"]
+
+
+@pytest.fixture
+def bookings(make_booking):
+    def paid(booking, *payments):
+        return replace(booking, payments=[Payment(f"{booking.id}-p{i}", amount, method, day)
+                                          for i, (amount, method, day) in enumerate(payments)])
+
+    return [
+        paid(make_booking("a", date(2025, 6, 28), date(2025, 7, 2)),
+             (100000, "Efectivo", date(2025, 6, 30)), (200000, "Transferencia", date(2025, 7, 1))),
+        paid(make_booking("b", date(2025, 8, 1), date(2025, 8, 3)),
+             (50000, "Nequi", date(2025, 7, 31)), (30000, "Efectivo", date(2025, 8, 1))),
+        # abono legacy: sin ``payments``, cuenta el día de llegada con ``paymentMethod``
+        make_booking("c", date(2025, 12, 31), date(2026, 1, 2), deposit=70000, payment_method="Transferencia"),
+        paid(make_booking("d", date(2026, 1, 10), date(2026, 1, 12)), (40000, "Efectivo", date(2026, 1, 1))),
+    ]
+
+
+@pytest.fixture(params=["ledger", "sqlite"])
+def report(request, bookings, tmp_path):
+    if request.param == "ledger":
+        yield PaymentLedger(bookings).report
+        return
+    store = SQLiteStore(str(tmp_path / "reservas.db"))
+    store.save_many(bookings)
+    yield store.payment_report  # libro leído con SQL solo para el rango
+    store.close()
+
+
+def rows(table):
+    return {str(period): row.tolist() for period, row in table.iterrows()}
+
+
+def test_monthly_report_by_method(report):
+    table = report(date(2025, 6, 1), date(2026, 1, 31))
+    assert table.columns.tolist() == METHODS + ["Total"]
+    # calculado a mano; los meses sin pagos no aparecen
+    assert rows(table) == {
+        "2025-06": [100000, 0, 0, 100000],
+        "2025-07": [0, 50000, 200000, 250000],
+        "2025-08": [30000, 0, 0, 30000],
+        "2025-12": [0, 0, 70000, 70000],
+        "2026-01": [40000, 0, 0, 40000],
+    }
+
+
+def test_range_bounds_cut_at_the_period_edges(report):
+    # 30 de junio y 1 de agosto quedan fuera; los extremos del rango son inclusivos
+    table = report(date(2025, 7, 1), date(2025, 7, 31))
+    assert table.columns.tolist() == ["Nequi", "Transferencia", "Total"]
+    assert rows(table) == {"2025-07": [50000, 200000, 250000]}
+
+
+def test_yearly_report_splits_at_new_year(report):
+    table = report(date(2025, 1, 1), date(2026, 12, 31), freq="Y")
+    assert rows(table) == {
+        "2025": [130000, 50000, 270000, 450000],
+        "2026": [40000, 0, 0, 40000],
+    }
+
+
+def test_empty_range(report):
+    table = report(date(2025, 9, 1), date(2025, 11, 30))
+    assert table.empty and table.columns.tolist() == ["Total"]
+
+
+def test_totals_match_report(bookings):
+    ledger = PaymentLedger(bookings)
+    first, last = date(2025, 6, 1), date(2026, 1, 31)
+    assert ledger.totals_by_method(first, last) == {"Efectivo": 170000, "Nequi": 50000, "Transferencia": 270000}
+    assert ledger.total(first, last) == ledger.report(first, last)["Total"].sum() == 490000
@@ -0,0 +1,53 @@
+import dataclasses
+from datetime import date
+
+import pytest
+
+from ohanna.models import HOSPEDAJE, Booking, Payment, parse_amount
+
+MINIMAL = {"id": "a", "startDate": "2025-06-01", "endDate": "2025-06-03", "type": HOSPEDAJE}
+
+
+def test_minimal_dict_round_trip_adds_no_keys():
+    b = Booking.from_dict(MINIMAL)
+    assert (b.num_people, b.num_children, b.total_price, b.payments) == (2, 0, 0, [])
+    assert b.to_dict() == MINIMAL
+
+
+def test_full_dict_round_trip_is_lossless():
+    data = {
+        **MINIMAL, "numPeople": 2, "numChildren": 0, "guests": [{"name": "Ana", "document": "1"}],
+        "totalPrice": 0, "discount": 0, "deposit": 0, "balance": 0, "expenses": [],
+        "payments": [{"id": "p", "amount": 1000, "method": "Nequi", "date": "2025-05-30"}],
+        "paymentMethod": "Nequi", "schedule": "8am", "isHoliday": False,
+        "cleaningTotal": 0, "cleaningDeposit": 0, "cleaningBalance": 0, "notes": "otra app",
+    }
+    b = Booking.from_dict(data)
+    assert b.extra == {"notes": "otra app"}
+    assert b.to_dict() == data
+    assert Booking.from_dict(b.to_dict()) == b
+
+
+def test_changed_defaults_are_written():
+    b = dataclasses.replace(Booking.from_dict(MINIMAL), total_price=500000, balance=500000)
+    data = b.to_dict()
+    assert (data["totalPrice"], data["balance"]) == (500000, 500000)
+    assert "numPeople" not in data and "deposit" not in data
+
+
+@pytest.mark.parametrize("value, expected", [(5, 5), (5.0, 5), ("12", 12), (" -3 ", -3)])
+def test_parse_amount_accepts(value, expected):
+    assert parse_amount(value) == expected
+
+
+@pytest.mark.parametrize("value", [True, 1.5, "1.5", "abc", "", None, [1]])
+def test_parse_amount_rejects(value):
+    with pytest.raises(ValueError):
+        parse_amount(value, "amount")
+
+
+def test_payment_from_dict_validates_types():
+    assert Payment.from_dict({"id": "p", "amount": "100", "method": "Efectivo", "date": "2025-06-01"}) == \
+        Payment("p", 100, "Efectivo", date(2025, 6, 1))
+    with pytest.raises(ValueError):
+        Payment.from_dict({"id": "p", "amount": 100, "method": None, "date": "2025-06-01"})
@@ -0,0 +1,38 @@
+from datetime import date, timedelta
+
+from ohanna.models import PASADIA
+from ohanna.occupancy import build_occupancy_index
+
+
+def scan(bookings, day):
+    """El recorrido por celda que reemplazó el índice (la primera reserva que ocupa el día)."""
+    for b in bookings:
+        if b.type == PASADIA:
+            if b.start_date == day:
+                return b
+        elif b.start_date <= day < b.end_date:
+            return b
+    return None
+
+
+def test_index_matches_per_cell_scan(make_booking):
+    bookings = [
+        make_booking("h1", date(2025, 6, 3), date(2025, 6, 6)),
+        make_booking("p1", date(2025, 6, 6), date(2025, 6, 8), type=PASADIA),  # fin ignorado: solo su día
+        make_booking("h2", date(2025, 6, 6), date(2025, 6, 7)),  # mismo día de salida de h1
+        make_booking("h3", date(2025, 6, 20), date(2025, 6, 20)),  # sin noches: no ocupa nada
+        make_booking("h4", date(2025, 6, 28), date(2025, 7, 2)),
+        make_booking("h5", date(2025, 6, 29), date(2025, 6, 30)),  # se cruza: gana la primera
+    ]
+    index = build_occupancy_index(bookings)
+    for i in range(45):
+        day = date(2025, 6, 1) + timedelta(days=i)
+        assert index.get(day) is scan(bookings, day), day
+
+
+def test_hospedaje_and_pasadia_rules(make_booking):
+    index = build_occupancy_index([
+        make_booking("h", date(2025, 6, 3), date(2025, 6, 5)),
+        make_booking("p", date(2025, 6, 10), date(2025, 6, 12), type=PASADIA),
+    ])
+    assert {d.day: b.id for d, b in index.items()} == {3: "h", 4: "h", 10: "p"}
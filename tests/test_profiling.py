@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from ohanna import profiling
+from ohanna.profiling import NULL_PROFILER, RunProfiler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj falso en milisegundos: ``clock.now`` se avanza a mano."""
+    class Clock:
+        now = 0.0
+
+    fake = Clock()
+    monkeypatch.setattr(profiling.time, "perf_counter", lambda: fake.now / 1e3)
+    return fake
+
+
+def run(profiler, clock, **sections_ms):
+    profiler.start()
+    for name, ms in sections_ms.items():
+        profiler.section(name)
+        clock.now += ms
+    return profiler.finish()
+
+
+def test_p50_p95_export(clock):
+    widgets = iter(range(0, 1000, 4))  # cada sección emite 4 widgets
+    profiler = RunProfiler(history=10, widget_count=lambda: next(widgets))
+    for i in range(1, 13):  # las dos primeras salen del historial
+        run(profiler, clock, Calendario=10 * i, Resumen=5)
+    assert len(profiler.runs) == 10
+
+    data = json.loads(profiler.to_json())
+    assert len(data["runs"]) == 10 and data["runs"][-1]["sections"] == pytest.approx({"Calendario": 120, "Resumen": 5})
+    calendar, total = data["summary"]["Calendario"], data["summary"]["Total"]
+    # 30, 40, ..., 120 ms: percentiles con interpolación lineal
+    assert calendar["p50 ms"] == pytest.approx(75) and calendar["p95 ms"] == pytest.approx(115.5)
+    assert calendar["última ms"] == pytest.approx(120) and calendar["ejecuciones"] == 10
+    assert total["p50 ms"] == pytest.approx(80) and total["p95 ms"] == pytest.approx(120.5)
+    assert calendar["widgets"] == 4 and total["widgets"] == 8
+
+
+def test_start_discards_an_interrupted_run(clock):
+    profiler = RunProfiler()
+    profiler.start()
+    profiler.section("Calendario")
+    profiler.count("reservas", 50)
+    clock.now += 40  # ``st.rerun`` corta la ejecución antes de ``finish``
+
+    profiler.start()
+    clock.now += 1
+    profiler.section("Resumen")
+    profiler.count("reservas", 2)
+    clock.now += 7
+    result = profiler.finish()
+    assert result["sections"] == pytest.approx({"Resumen": 7})
+    assert result["counters"] == {"Resumen": {"reservas": 2}}
+    assert result["total_ms"] == pytest.approx(8)
+    assert list(profiler.runs) == [result]
+
+
+def test_repeated_section_accumulates(clock):
+    profiler = RunProfiler()
+    result = run(profiler, clock, Calendario=3, Resumen=2)
+    assert result["sections"] == pytest.approx({"Calendario": 3, "Resumen": 2})
+    profiler.start()
+    for name in ("Calendario", "Resumen", "Calendario"):
+        profiler.section(name)
+        clock.now += 4
+    assert profiler.finish()["sections"] == pytest.approx({"Calendario": 8, "Resumen": 4})
+
+
+def test_empty_summary_and_null_profiler():
+    assert RunProfiler().summary().empty
+    NULL_PROFILER.start()
+    NULL_PROFILER.section("Calendario")
+    NULL_PROFILER.count("reservas")
+    assert NULL_PROFILER.finish() is None and not NULL_PROFILER.enabled
@@ -0,0 +1,72 @@
+import os
+from datetime import date
+
+from ohanna.aggregates import combine
+from ohanna.properties import PartitionedStore, Property, open_partitions, partition_location
+from ohanna.storage import MemoryStore
+
+BAY, CUMBRE = Property("ohanna-bay", "Chalet Ohanna Bay"), Property("la-cumbre", "Cabaña La Cumbre")
+
+
+def memory_partitions():
+    return PartitionedStore([BAY, CUMBRE], lambda prop, primary: MemoryStore())
+
+
+def test_partition_location():
+    assert partition_location("data/reservas.db", "la-cumbre", primary=True) == "data/reservas.db"
+    assert partition_location("data/reservas.db", "la-cumbre", primary=False) == "data/reservas.la-cumbre.db"
+    assert partition_location("diario/", "la-cumbre", primary=False) == "diario.la-cumbre"
+    assert partition_location(None, "la-cumbre", primary=False) is None
+
+
+def test_partitions_open_lazily_and_writes_stay_in_their_partition(make_booking):
+    partitions = memory_partitions()
+    assert partitions.opened == []
+    cumbre = partitions.partition("la-cumbre")
+    assert partitions.opened == ["la-cumbre"]
+    cumbre.save(make_booking("c1", date(2025, 6, 10), date(2025, 6, 12)))
+
+    bay = partitions.partition("ohanna-bay")
+    before = (bay.version, bay.month_version(2025, 6))
+    cumbre.save(make_booking("c2", date(2025, 6, 20), date(2025, 6, 22)))
+    cumbre.delete("c1", cumbre.revision("c1"))
+    assert bay.all() == [] and (bay.version, bay.month_version(2025, 6)) == before
+    # el mismo id y las mismas fechas no chocan entre propiedades
+    bay.save(make_booking("c2", date(2025, 6, 20), date(2025, 6, 22)))
+    assert [b.id for b in cumbre.all()] == ["c2"] and [b.id for b in bay.all()] == ["c2"]
+
+
+def test_rollup_sums_each_partition(make_booking):
+    partitions = memory_partitions()
+    partitions.partition("ohanna-bay").save_many([
+        make_booking("b1", date(2025, 6, 1), date(2025, 6, 4), total=300000, payments=[(100000, date(2025, 5, 20))]),
+        make_booking("b2", date(2025, 6, 29), date(2025, 7, 2), total=600000),  # 2 noches en junio, 1 en julio
+    ])
+    partitions.partition("la-cumbre").save(
+        make_booking("c1", date(2025, 6, 10), date(2025, 6, 12), total=500000, payments=[(200000, date(2025, 6, 10))]))
+
+    june = partitions.rollup([(2025, 6)])
+    assert (june["ohanna-bay"].bookings, june["ohanna-bay"].occupied_days, june["ohanna-bay"].revenue) == (2, 5, 700000)
+    assert (june["la-cumbre"].bookings, june["la-cumbre"].occupied_days, june["la-cumbre"].revenue) == (1, 2, 500000)
+    total = combine(june.values())
+    assert (total.bookings, total.occupied_days, total.revenue) == (3, 7, 1200000)
+    assert total.balance == 300000 + 600000 + 500000
+
+    summer = partitions.rollup([(2025, 6), (2025, 7)])
+    assert summer["ohanna-bay"].occupied_days == 6 and summer["ohanna-bay"].revenue == 900000
+    assert summer["la-cumbre"] == june["la-cumbre"]
+
+    assert partitions.method_totals([(2025, 6)]) == {"Efectivo": 200000}
+    assert partitions.method_totals([(2025, 5), (2025, 6)]) == {"Efectivo": 300000}
+
+
+def test_open_partitions_uses_one_database_per_property(tmp_path, make_booking):
+    db = str(tmp_path / "reservas.db")
+    partitions = open_partitions([BAY, CUMBRE], db_path=db)
+    try:
+        partitions.partition("la-cumbre").save(make_booking("c1", date(2025, 6, 10), date(2025, 6, 12)))
+        assert partitions.opened == ["la-cumbre"]
+        assert os.path.exists(tmp_path / "reservas.la-cumbre.db") and not os.path.exists(db)
+        assert partitions.rollup([(2025, 6)])["ohanna-bay"].bookings == 0
+    finally:
+        partitions.close()
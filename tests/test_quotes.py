@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from ohanna.models import HOSPEDAJE, PASADIA
+from ohanna.pricing import calculate_hospedaje_price, calculate_pasadia_price, nightly_breakdown
+from ohanna.quotes import quote_all_stays, quote_ranges, quote_stay, quote_total
+from ohanna.rates import DEFAULT_CONFIG, compile_rates, merge_config
+
+SEASONAL = compile_rates(merge_config(DEFAULT_CONFIG, {"seasons": [
+    {"name": "Fin de año", "from": "12-15", "to": "01-15", "pasadia": {"base": 500000}},
+]}))
+GROUPS = [(1, 0), (2, 2), (6, 0), (8, 3), (23, 11)]
+
+
+def scalar_stay(people, children, start, end, holiday=False, rates=SEASONAL):
+    return sum(calculate_hospedaje_price(people, children, start + timedelta(days=i), holiday, rates)
+               for i in range((end - start).days))
+
+
+@pytest.mark.parametrize("people, children", GROUPS)
+@pytest.mark.parametrize("holiday", [False, True])
+def test_quote_stay_matches_scalar(people, children, holiday):
+    start, end = date(2025, 12, 26), date(2026, 1, 9)  # cruza temporada, año y festivos
+    total, breakdown = quote_stay(people, children, start, end, holiday, SEASONAL)
+    assert total == scalar_stay(people, children, start, end, holiday)
+    assert breakdown["price"].tolist() == [p for _, p in nightly_breakdown(HOSPEDAJE, people, children, start, end,
+                                                                           holiday, SEASONAL)]
+    assert quote_total(people, children, start, end, holiday, SEASONAL) == total
+
+
+def test_quote_total_without_nights():
+    assert quote_total(2, 0, date(2025, 6, 3), date(2025, 6, 3)) == 0
+    assert quote_total(2, 0, date(2025, 6, 3), date(2025, 6, 1)) == 0
+
+
+def test_quote_ranges_matches_scalar_for_many_groups_and_ranges():
+    starts = [date(2025, 6, 1), date(2025, 6, 27), date(2025, 12, 30), date(2026, 1, 14)]
+    ends = [date(2025, 6, 3), date(2025, 7, 2), date(2026, 1, 2), date(2026, 1, 20)]
+    people, children = np.array(GROUPS).T
+    grid = quote_ranges(people, children, starts, ends, rates=SEASONAL)
+    assert grid.shape == (len(GROUPS), len(starts))
+    for g, (p, c) in enumerate(GROUPS):
+        assert grid[g].tolist() == [scalar_stay(p, c, s, e) for s, e in zip(starts, ends)]
+
+
+def test_quote_ranges_pasadia_quotes_only_the_start_day():
+    starts = [date(2025, 6, 2), date(2025, 6, 7), date(2025, 12, 20)]
+    totals = quote_ranges(8, 1, starts, starts, kind=PASADIA, rates=SEASONAL)
+    assert totals.tolist() == [calculate_pasadia_price(8, 1, d, False, SEASONAL) for d in starts]
+
+
+def test_quote_all_stays_matches_scalar():
+    start = date(2025, 12, 20)
+    totals = quote_all_stays(4, 1, start, 20, 3, rates=SEASONAL)
+    expected = [scalar_stay(4, 1, start + timedelta(days=i), start + timedelta(days=i + 3)) for i in range(20)]
+    assert totals.tolist() == expected
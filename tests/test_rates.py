@@ -0,0 +1,90 @@
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from ohanna.holidays import is_holiday
+from ohanna.models import HOSPEDAJE, PASADIA
+from ohanna.rates import DEFAULT_CONFIG, DEFAULT_RATES, ROW_CACHE_SIZE, RateSource, compile_rates, merge_config
+
+WEEK = (380000, 380000, 380000, 430000, 500000, 570000, 640000)
+PEAK = (450000, 450000, 450000, 520000, 590000, 660000, 730000)
+
+
+def legacy_price(kind: str, people: int, children: int, day: date, holiday: bool = False) -> int:
+    """Las fórmulas de antes de las tarifas configurables."""
+    holiday = holiday or is_holiday(day)
+    weekday = day.weekday()
+    special = weekday in (5, 6) or holiday
+    extra = (70000 if special else 56000) * max(0, people - 6)
+    if kind == PASADIA:
+        return (400000 if special else 280000) + extra + children * 40000
+    base = (PEAK if weekday == 5 or holiday else WEEK)[max(0, min(people, 6))]
+    return base + extra + children * 40000
+
+
+def test_default_rates_match_legacy_formula():
+    days = [date(2025, 1, 1) + timedelta(days=i) for i in range(400)]
+    for kind in (HOSPEDAJE, PASADIA):
+        for people, children in ((1, 0), (2, 1), (6, 0), (9, 3), (25, 12)):
+            for day in days:
+                for holiday in (False, True):
+                    assert DEFAULT_RATES.night(kind, people, children, day, holiday) == \
+                        legacy_price(kind, people, children, day, holiday), (kind, people, children, day, holiday)
+
+
+def test_season_across_new_year_and_dated_season_wins():
+    table = compile_rates(merge_config(DEFAULT_CONFIG, {"seasons": [
+        {"name": "Puente", "from": "2025-12-20", "to": "2025-12-21", "hospedaje": {"maxBasePeople": 6, "base": 900000}},
+        {"name": "Fin de año", "from": "12-15", "to": "01-15",
+         "hospedaje": {"maxBasePeople": 6, "base": {"semana": 500000, "pico": 600000, "domingo": 500000}}},
+    ]}))
+    assert table.night(HOSPEDAJE, 2, 0, date(2025, 12, 16)) == 500000
+    assert table.night(HOSPEDAJE, 2, 0, date(2026, 1, 10)) == 600000  # sábado
+    assert table.night(HOSPEDAJE, 2, 0, date(2025, 12, 20)) == 900000
+    assert table.night(HOSPEDAJE, 2, 0, date(2026, 12, 20)) == 500000  # la fechada es solo de 2025 (domingo)
+    assert table.night(HOSPEDAJE, 2, 0, date(2026, 2, 3)) == WEEK[2]
+
+
+@pytest.mark.parametrize("override, message", [
+    ({"hospedaje": {"base": "abc"}}, "hospedaje.base: valor inválido 'abc'"),
+    ({"pasadia": {"base": {"semana": None, "pico": 1, "domingo": 1}}}, "pasadia.base: valor inválido None"),
+    ({"pasadia": {"base": {"feriado": 1}}}, "pasadia.base: tipos de día desconocidos: feriado"),
+    ({"hospedaje": {"child": True}}, "hospedaje.child: valor inválido True"),
+    ({"seasons": [{"from": "13-01", "to": "01-02"}]}, "seasons[0]: fecha inválida '13-01'"),
+])
+def test_invalid_config_messages(override, message):
+    config = merge_config(DEFAULT_CONFIG, override)
+    with pytest.raises(ValueError) as e:
+        compile_rates(config)
+    assert message in str(e.value)
+
+
+def test_row_cache_is_bounded():
+    table = compile_rates(DEFAULT_CONFIG)
+    start = date(2000, 1, 1)
+    for i in range(ROW_CACHE_SIZE + 50):
+        day = start + timedelta(days=i)
+        assert table.row(day) == DEFAULT_RATES.row(day)
+    assert len(table._rows) <= ROW_CACHE_SIZE
+
+
+def test_rate_source_hot_reload(tmp_path):
+    path = tmp_path / "tarifas.json"
+    path.write_text(json.dumps({"pasadia": {"base": 300000}}))
+    source = RateSource(str(path))
+    monday = date(2025, 6, 2)
+    assert source.table.night(PASADIA, 2, 0, monday) == 300000
+
+    path.write_text(json.dumps({"pasadia": {"base": "x"}}))
+    os.utime(path, ns=(1, 1))
+    assert not source.reload()
+    assert "pasadia.base" in source.error
+    assert source.table.night(PASADIA, 2, 0, monday) == 300000
+
+    path.write_text(json.dumps({"pasadia": {"base": 310000}}))
+    os.utime(path, ns=(2, 2))
+    assert source.reload()
+    assert source.error is None and source.revision == 2
+    assert source.table.night(PASADIA, 2, 0, monday) == 310000
@@ -0,0 +1,76 @@
+import re
+from datetime import date
+
+from ohanna.models import PASADIA
+from ohanna.occupancy import build_occupancy_index
+from ohanna.render import EMPTY_CELL_HTML, MonthViewCache, build_month_view
+from ohanna.storage import MemoryStore
+
+
+def cell_classes(html: str) -> str:
+    return re.match(r"<div class='calendar-cell ([^']*)'", html).group(1).strip()
+
+
+def test_june_2025_cells(make_booking):
+    bookings = [
+        make_booking("a", date(2025, 6, 1), date(2025, 6, 3), guest="<b>Ana</b> & 'Luis'"),
+        make_booking("b", date(2025, 6, 23), date(2025, 6, 23), type=PASADIA),
+    ]
+    view = build_month_view(2025, 6, build_occupancy_index(bookings))
+    # el 1 de junio de 2025 fue domingo: seis celdas de relleno
+    assert view.cells[:7] == [None] * 6 + [date(2025, 6, 1)]
+    assert len(view.cell_htmls) == 42 and view.cell_htmls[0] == EMPTY_CELL_HTML
+    by_day = {d.day: html for d, html in zip(view.cells, view.cell_htmls) if d}
+
+    assert cell_classes(by_day[1]) == cell_classes(by_day[2]) == "occupied"
+    assert "&lt;b&gt;Ana&lt;/b&gt; &amp; &#x27;Luis&#x27;" in by_day[1]
+    assert "<b>Ana</b>" not in view.html
+    assert cell_classes(by_day[3]) == ""  # día de salida: libre
+    assert cell_classes(by_day[30]) == "holiday"
+    assert "title='San Pedro y San Pablo / Sagrado Corazón'" in by_day[30]
+    # un festivo ocupado se pinta como ocupado
+    assert cell_classes(by_day[23]) == "occupied" and "pasadia-tag" in by_day[23] and "Ocupado" in by_day[23]
+    assert "$380.000" in by_day[4]  # precio base de un miércoles libre
+
+
+def test_single_payload_has_one_clickable_cell_per_day():
+    view = build_month_view(2025, 2, {})
+    assert view.html.startswith("<div class='calendar-grid'>")
+    assert view.html.count("class='calendar-head'") == 7
+    assert re.findall(r"data-date='([\d-]+)'", view.html) == [f"2025-02-{d:02d}" for d in range(1, 29)]
+
+
+def test_saving_invalidates_only_the_touched_month(make_booking):
+    store = MemoryStore()
+    cache = MonthViewCache()
+    built = []
+
+    def view(year, month):
+        def build():
+            built.append((year, month))
+            return build_month_view(year, month, build_occupancy_index(store.bookings_for_month(year, month)))
+        return cache.get(year, month, store.month_version(year, month), build)
+
+    june, july = view(2025, 6), view(2025, 7)
+    assert view(2025, 6) is june and view(2025, 7) is july
+    store.save(make_booking("a", date(2025, 6, 10), date(2025, 6, 12), guest="Ana"))
+    assert view(2025, 7) is july
+    new_june = view(2025, 6)
+    assert new_june is not june and "Ana" in new_june.html
+    assert built == [(2025, 6), (2025, 7), (2025, 6)]
+
+
+def test_oldest_view_is_evicted_over_capacity():
+    cache = MonthViewCache(maxsize=2)
+    built = []
+
+    def view(month):
+        return cache.get(2025, month, 0, lambda: built.append(month) or build_month_view(2025, month, {}))
+
+    view(1), view(2)
+    view(1)  # enero pasa a ser el más reciente
+    view(3)  # desaloja febrero
+    view(1), view(3)
+    assert built == [1, 2, 3]
+    view(2)
+    assert built == [1, 2, 3, 2]
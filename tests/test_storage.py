@@ -0,0 +1,145 @@
+import sqlite3
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from ohanna.availability import BookingConflictError
+from ohanna.journal import JournalStore
+from ohanna.models import HOSPEDAJE, PASADIA, Booking
+from ohanna.storage import MemoryStore, SQLiteStore
+from ohanna.synthetic import generate_bookings
+
+
+@pytest.fixture(params=["memory", "sqlite", "journal"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryStore()
+        return
+    if request.param == "sqlite":
+        store = SQLiteStore(str(tmp_path / "reservas.db"))
+    else:
+        store = JournalStore(str(tmp_path / "diario"), fsync=False)
+    yield store
+    store.close()
+
+
+def test_save_get_and_month_queries(store, make_booking):
+    store.save(make_booking("a", date(2025, 5, 30), date(2025, 6, 2), guest="Ana"))
+    store.save(make_booking("b", date(2025, 6, 10), date(2025, 6, 10), type=PASADIA))
+    assert store.get("a").guest_name == "Ana"
+    assert [b.id for b in store.bookings_for_month(2025, 6)] == ["a", "b"]
+    assert [b.id for b in store.bookings_for_month(2025, 5)] == ["a"]
+    june = store.month_stats(2025, 6)
+    assert (june.bookings, june.hospedajes, june.pasadias, june.occupied_days) == (2, 1, 1, 2)
+
+
+def test_save_rejects_overlaps(store, make_booking):
+    store.save(make_booking("a", date(2025, 6, 1), date(2025, 6, 4)))
+    with pytest.raises(BookingConflictError) as e:
+        store.save(make_booking("b", date(2025, 6, 3), date(2025, 6, 5)))
+    assert e.value.conflicts == ["a"]
+    store.save(make_booking("a", date(2025, 6, 2), date(2025, 6, 5)))  # moverse sobre sí misma está bien
+
+
+def test_delete_updates_queries(store, make_booking):
+    store.save(make_booking("a", date(2025, 6, 1), date(2025, 6, 4), payments=[(100000, date(2025, 6, 1))]))
+    store.delete("a")
+    assert store.get("a") is None
+    assert store.month_stats(2025, 6).bookings == 0
+    assert store.method_totals(2025, 6) == {}
+    assert store.conflicts(date(2025, 6, 1), date(2025, 6, 4)) == []
+
+
+def _queries(store, months):
+    """Respuestas de todas las consultas derivadas, para comparar SQL con los índices."""
+    result = []
+    for year, month in months:
+        first = date(year, month, 1)
+        result.append((store.month_stats(year, month), store.method_totals(year, month),
+                       store.payment_totals(first, first + timedelta(days=90))))
+        for day in (first, first + timedelta(days=14)):
+            result.append((store.conflicts(day, day + timedelta(days=3)),
+                           store.next_free_ranges(day, 3, count=3)))
+    return result
+
+
+def test_sqlite_queries_match_indexes(tmp_path):
+    bookings = generate_bookings(600, seed=7)
+    months = sorted({(b.start_date.year, b.start_date.month) for b in bookings})[::3]
+    path = str(tmp_path / "reservas.db")
+    SQLiteStore(path).save_many(bookings)
+    sql = SQLiteStore(path)
+    expected = _queries(MemoryStore(bookings), months)
+    assert _queries(sql, months) == expected  # respondido con SQL
+    assert sql._aggregates is None and sql._availability is None and sql._ledger is None
+    sql.aggregates, sql.availability, sql.ledger  # con los índices armados
+    assert _queries(sql, months) == expected
+    sql.close()
+
+
+def test_sqlite_open_does_not_load_bookings(tmp_path, monkeypatch):
+    path = str(tmp_path / "reservas.db")
+    SQLiteStore(path).save_many(generate_bookings(3000, seed=3))
+
+    def fail():
+        raise AssertionError("abrir o consultar no debe cargar todas las reservas")
+
+    monkeypatch.setattr(SQLiteStore, "all", lambda self: fail())
+    start = time.perf_counter()
+    store = SQLiteStore(path)
+    day = date(2024, 6, 1)
+    store.month_stats(2024, 6)
+    store.conflicts(day, day + timedelta(days=2))
+    store.next_free_ranges(day, 2)
+    store.payment_totals(day, day + timedelta(days=30))
+    assert time.perf_counter() - start < 0.5
+    store.close()
+
+
+def test_legacy_deposit_counts_on_start_date(store, make_booking):
+    store.save(make_booking("a", date(2025, 6, 10), date(2025, 6, 12), deposit=150000, payment_method="Nequi"))
+    store.save(make_booking("b", date(2025, 6, 20), date(2025, 6, 22), deposit=150000,
+                            payments=[(90000, date(2025, 5, 28))]))
+    assert store.method_totals(2025, 6) == {"Nequi": 150000}
+    assert store.payment_totals(date(2025, 5, 1), date(2025, 6, 30)) == {"Efectivo": 90000, "Nequi": 150000}
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite", "journal"])
+def test_absent_fields_survive_reopening(kind, tmp_path):
+    minimal = {"id": "a", "startDate": "2025-06-01", "endDate": "2025-06-03", "type": HOSPEDAJE, "totalPrice": 5}
+
+    def open_store():
+        if kind == "sqlite":
+            return SQLiteStore(str(tmp_path / "reservas.db"))
+        return JournalStore(str(tmp_path / "diario"), fsync=False)
+
+    if kind == "memory":
+        assert MemoryStore([Booking.from_dict(minimal)]).get("a").to_dict() == minimal
+        return
+    store = open_store()
+    store.save(Booking.from_dict(minimal))
+    store.close()
+    store = open_store()
+    try:
+        assert store.get("a").to_dict() == minimal
+    finally:
+        store.close()
+
+
+def test_sqlite_adds_absent_column_to_old_databases(tmp_path, make_booking):
+    path = str(tmp_path / "vieja.db")
+    store = SQLiteStore(path)
+    store.save(make_booking("a", date(2025, 6, 1), date(2025, 6, 3)))
+    store.close()
+    conn = sqlite3.connect(path)
+    conn.execute("ALTER TABLE bookings DROP COLUMN absent")
+    conn.commit()
+    conn.close()
+
+    store = SQLiteStore(path)
+    try:
+        assert store.get("a").absent == frozenset()
+        assert "numPeople" in store.get("a").to_dict()
+    finally:
+        store.close()
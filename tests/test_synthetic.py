@@ -0,0 +1,39 @@
+from datetime import date
+
+import pytest
+
+from ohanna.availability import occupied_range
+from ohanna.synthetic import generate_bookings, properties_for
+
+
+def timelines(bookings, properties):
+    """Reservas por propiedad (se reparten por turnos según el número en el id)."""
+    result = [[] for _ in range(properties)]
+    for b in bookings:
+        result[int(b.id.rsplit("-", 1)[1]) % properties].append(b)
+    return result
+
+
+@pytest.mark.parametrize("properties", [1, 4])
+def test_each_timeline_has_no_overlaps(properties):
+    bookings = generate_bookings(2000, seed=5, properties=properties)
+    assert len(bookings) == 2000 and len({b.id for b in bookings}) == 2000
+    assert [b.start_date for b in bookings] == sorted(b.start_date for b in bookings)
+    for timeline in timelines(bookings, properties):
+        ranges = sorted(occupied_range(b) for b in timeline)
+        assert all(end <= following for (_, end), (following, _) in zip(ranges, ranges[1:]))
+
+
+def test_properties_keep_the_span_capped():
+    assert properties_for(100, years=10) == 1
+    properties = properties_for(6000, years=5)
+    bookings = generate_bookings(6000, seed=1, properties=properties)
+    assert max(b.end_date for b in bookings) < date(2021, 1, 1)
+    # una sola línea de tiempo para las mismas reservas dura décadas
+    assert generate_bookings(6000, seed=1)[-1].end_date > date(2060, 1, 1)
+
+
+def test_same_seed_same_data():
+    assert generate_bookings(300, seed=9, properties=3) == generate_bookings(300, seed=9, properties=3)
+    with pytest.raises(ValueError):
+        generate_bookings(10, properties=0)